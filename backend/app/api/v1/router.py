@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.routers import upload, workflows, disposal, audit, auth, tickets, asset_requests, assets
+from app.routers import upload, workflows, disposal, audit, auth, tickets, asset_requests, assets, metrics, exports, search
 
 api_router = APIRouter()
 
@@ -12,3 +12,6 @@ api_router.include_router(auth.router)
 api_router.include_router(tickets.router)
 api_router.include_router(asset_requests.router)
 api_router.include_router(assets.router)
+api_router.include_router(metrics.router)
+api_router.include_router(exports.router)
+api_router.include_router(search.router)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = "ITSM Asset Management API"
@@ -9,8 +9,102 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     COLLECT_API_TOKEN: Optional[str] = None
-    
+
+    # Dashboard stats snapshot (seconds before a full recompute)
+    ASSET_STATS_MAX_STALENESS_SECONDS: int = 60
+
+    # Bulk telemetry ingestion (/api/v1/collect/batch)
+    COLLECT_BATCH_MAX_ITEMS: int = 5000
+    COLLECT_BATCH_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # API token cache and last_used_at write-behind
+    API_TOKEN_CACHE_TTL_SECONDS: int = 300
+    API_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    API_TOKEN_LAST_USED_FLUSH_SECONDS: int = 30
+
+    # JWT principal resolution
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Password hashing worker pool
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Background PDF extraction (PO / invoice uploads)
+    PDF_EXTRACTION_WORKERS: int = 2
+    PDF_EXTRACTION_CONCURRENCY: int = 4
+    PDF_EXTRACTION_MAX_ATTEMPTS: int = 3
+
+    # Background job leases: a RUNNING job is reclaimed only after its worker misses heartbeats this long
+    JOB_LEASE_SECONDS: int = 90
+    JOB_HEARTBEAT_SECONDS: int = 15
+
+    # Unreferenced uploads are kept this long before GC removes them
+    UPLOAD_GC_GRACE_SECONDS: int = 86400
+
+    # Bulk import (/upload/smart)
+    IMPORT_CHUNK_SIZE: int = 5000
+
+    # Orphaned DATA_COLLECT reconciliation (/audit/sync)
+    RECONCILE_BATCH_SIZE: int = 1000
+    RECONCILE_OVERLAP_SECONDS: int = 300  # Re-scan window before the high-water mark for late commits
+
+    # Monthly audit log partitions
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3
+    AUDIT_PARTITION_MAINTENANCE_SECONDS: int = 3600
+    AUDIT_RETENTION_MONTHS: int = 0  # 0 keeps every partition
+    AUDIT_RETENTION_MODE: str = "archive"  # archive (move to audit_archive schema) | drop
+
+    # Batched audit writer; actions listed here are written asynchronously, all others in the caller's transaction
+    AUDIT_SINK_MAX_QUEUE: int = 50000
+    AUDIT_SINK_BATCH_SIZE: int = 500
+    AUDIT_SINK_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_SINK_MAX_ATTEMPTS: int = 3  # rejected rows are dead-lettered after this many failed writes
+    AUDIT_ASYNC_ACTIONS: List[str] = ["DATA_COLLECT"]
+
+    # Async engine connection pool (per worker process; size * workers must fit max_connections)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection; 0 behind pgbouncer
+    DB_COMMAND_TIMEOUT_SECONDS: Optional[float] = None
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 leaves the server default
+
+    # Read replicas for read-only endpoints (JSON list of asyncpg URLs); empty sends all reads to the primary
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    READ_YOUR_WRITES_COOKIE: str = "itsm_lsn"
+    READ_YOUR_WRITES_MAX_AGE_SECONDS: int = 300
+
+    # ETag / body cache for polled list endpoints (/assets, /assets/stats, /tickets, /asset-requests)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None  # Optional shared body cache across workers (needs 'redis')
+    RESPONSE_CACHE_SHARED_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_LISTENER_PING_SECONDS: float = 30.0
+
+    # Streaming exports (/exports): rows fetched per server-side cursor round trip
+    EXPORT_BATCH_SIZE: int = 2000
+
+    # Warranty / contract / license expiry scanner feeding the renewal queue
+    RENEWAL_WINDOWS_DAYS: List[int] = [30, 60, 90]  # Urgency High / Medium / Low
+    RENEWAL_SCAN_INTERVAL_SECONDS: int = 3600
+    RENEWAL_SCAN_BATCH_SIZE: int = 500
+    RENEWAL_FULL_SCAN_SECONDS: int = 86400  # Full rescan picks up dates moved earlier
+
+    # Offboarding (exit_service): rows per VALUES list / multi-row INSERT, and
+    # per-transaction limits so a large exit fails fast instead of piling up locks
+    EXIT_BULK_BATCH_SIZE: int = 1000
+    EXIT_LOCK_TIMEOUT_MS: int = 5000
+    EXIT_STATEMENT_TIMEOUT_MS: int = 60000
+
     class Config:
         env_file = ".env"
+        extra = "ignore"
 
 settings = Settings()
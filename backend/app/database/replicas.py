@@ -0,0 +1,213 @@
+"""
+Read-replica routing for read-only endpoints (Asynchronous)
+"""
+import asyncio
+import contextvars
+import itertools
+import time
+from typing import AsyncGenerator, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from .database import AsyncSessionLocal, async_engine, create_pooled_engine, get_engine_pool_metrics
+from ..config.settings import settings
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# On a standby: last replayed LSN and seconds behind the primary (0 when fully caught up).
+# On a non-standby (same database behind a separate pool, for local testing): current LSN, no lag.
+LAG_SQL = text(
+    """
+    SELECT
+        CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END::text AS lsn,
+        CASE
+            WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END AS lag_seconds
+    """
+)
+PRIMARY_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+
+
+def parse_lsn(value: Optional[str]) -> Optional[int]:
+    """'16/B374D848' -> comparable integer; None for missing or malformed values"""
+    if not value:
+        return None
+    try:
+        high, low = value.split("/")
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        return None
+
+
+class _WriteMarker:
+    __slots__ = ("committed",)
+
+    def __init__(self):
+        self.committed = False
+
+
+# Set per request by track_writes(); flipped by any session commit made while handling it
+_write_marker: contextvars.ContextVar[Optional[_WriteMarker]] = contextvars.ContextVar("write_marker", default=None)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_request_wrote(session):
+    marker = _write_marker.get()
+    if marker is not None:
+        marker.committed = True
+
+
+class Replica:
+    def __init__(self, url: str):
+        parsed = make_url(url)
+        self.name = f"{parsed.host}:{parsed.port or 5432}/{parsed.database}"
+        self.engine = create_pooled_engine(url)
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False
+        )
+        self.lsn: Optional[int] = None
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.error: Optional[str] = None
+        self.routed = 0
+
+    def is_available(self, now: float) -> bool:
+        """In rotation: last check succeeded recently and lag is within bounds"""
+        if self.error or self.lag_seconds is None:
+            return False
+        if now - self.checked_at > settings.REPLICA_LAG_CHECK_SECONDS * 3:
+            return False
+        return self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+
+    async def check(self):
+        try:
+            async with self.engine.connect() as conn:
+                row = (await conn.execute(LAG_SQL)).one()
+            self.lsn = parse_lsn(row.lsn)
+            self.lag_seconds = float(row.lag_seconds)
+            self.error = None
+        except Exception as e:
+            self.error = str(e) or e.__class__.__name__
+        self.checked_at = time.monotonic()
+
+
+class ReplicaRouter:
+    """
+    Sends read-only requests to a replica that is in rotation and has replayed
+    at least up to the client's last write (read-your-writes cookie), falling
+    back to the primary otherwise.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._next = itertools.count()
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self, request: Request) -> Optional[Replica]:
+        if not self.replicas or request.method not in SAFE_METHODS:
+            return None
+        min_lsn = parse_lsn(request.cookies.get(settings.READ_YOUR_WRITES_COOKIE))
+        now = time.monotonic()
+        candidates = [
+            replica for replica in self.replicas
+            if replica.is_available(now) and (min_lsn is None or (replica.lsn or 0) >= min_lsn)
+        ]
+        if not candidates:
+            self.fallbacks += 1
+            return None
+        replica = candidates[next(self._next) % len(candidates)]
+        replica.routed += 1
+        return replica
+
+    async def get_session(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
+        replica = self.choose(request)
+        if replica is None:
+            self.primary_reads += 1
+        sessionmaker = replica.sessionmaker if replica else AsyncSessionLocal
+        async with sessionmaker() as session:
+            try:
+                yield session
+            finally:
+                await session.close()
+
+    async def track_writes(self, request: Request, call_next):
+        """
+        HTTP middleware body: after a request that committed on the primary,
+        set the read-your-writes cookie to the primary's current WAL position.
+        """
+        if not self.replicas:
+            return await call_next(request)
+        marker = _WriteMarker()
+        token = _write_marker.set(marker)
+        try:
+            response = await call_next(request)
+        finally:
+            _write_marker.reset(token)
+        if marker.committed:
+            try:
+                async with async_engine.connect() as conn:
+                    lsn = (await conn.execute(PRIMARY_LSN_SQL)).scalar()
+                response.set_cookie(
+                    settings.READ_YOUR_WRITES_COOKIE,
+                    lsn,
+                    max_age=settings.READ_YOUR_WRITES_MAX_AGE_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                )
+            except Exception as e:
+                print(f"[REPLICAS] Could not read primary LSN: {e}")
+        return response
+
+    async def run_lag_monitor(self):
+        """Background loop: refresh every replica's replay position and lag"""
+        while True:
+            await asyncio.gather(*(replica.check() for replica in self.replicas))
+            await asyncio.sleep(settings.REPLICA_LAG_CHECK_SECONDS)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def metrics(self) -> Dict:
+        now = time.monotonic()
+        return {
+            "max_lag_seconds": settings.REPLICA_MAX_LAG_SECONDS,
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "in_rotation": replica.is_available(now),
+                    "lag_seconds": replica.lag_seconds,
+                    "checked_seconds_ago": round(now - replica.checked_at, 1) if replica.checked_at else None,
+                    "error": replica.error,
+                    "routed": replica.routed,
+                    "pool": get_engine_pool_metrics(replica.engine),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function for read-only endpoints: a replica session when one is
+    caught up with this client's writes, otherwise a primary session.
+    """
+    async for session in replica_router.get_session(request):
+        yield session
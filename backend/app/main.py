@@ -5,11 +5,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import text
 from .database.database import get_db, test_connection, get_connection_info
-from .models.models import AuditLog, Asset
+from .models.models import Asset
+import asyncio
 import traceback
 from datetime import datetime
 import os
-from .routers import upload, workflows, disposal, audit, assets, auth, tickets, asset_requests
+from .routers import upload, workflows, disposal, audit, assets, auth, tickets, asset_requests, metrics, exports, search
+from .services import collect_service, user_service
+from .utils.password_hasher import PasswordHasherBusy, password_hasher
+from .utils.audit_sink import audit_sink
+from .database.replicas import replica_router
+from .utils.response_cache import response_cache
 
 # Create FastAPI app instance
 app = FastAPI(
@@ -27,6 +33,17 @@ app.include_router(api_router, prefix="/api/v1")
 async def favicon():
     return JSONResponse(content={})
 
+# Read-your-writes: remember the primary WAL position after a request that wrote
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    return await replica_router.track_writes(request, call_next)
+
+# Conditional GET / cached bodies for polled list endpoints.
+# Registered before CORSMiddleware so CORS wraps cached 200s and 304s too
+@app.middleware("http")
+async def cached_responses(request: Request, call_next):
+    return await response_cache.handle(request, call_next)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -43,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Debug Exception Handler
@@ -66,6 +84,15 @@ async def debug_exception_handler(request: Request, exc: Exception):
         headers={"Access-Control-Allow-Origin": "http://localhost:3000"}
     )
 
+# Password hashing pool saturated: ask the client to retry instead of queueing forever
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
 # Register routers
 app.include_router(upload.router)
 app.include_router(workflows.router)
@@ -75,6 +102,53 @@ app.include_router(assets.router)
 app.include_router(auth.router)
 app.include_router(tickets.router)
 app.include_router(asset_requests.router)
+app.include_router(metrics.router)
+app.include_router(exports.router)
+app.include_router(search.router)
+
+# Background tasks that live as long as the application
+_background_tasks = []
+
+@app.on_event("startup")
+async def start_background_tasks():
+    from .utils.api_token_utils import run_last_used_flusher
+    _background_tasks.append(asyncio.create_task(run_last_used_flusher()))
+    _background_tasks.append(asyncio.create_task(audit_sink.run()))
+    from .services.audit_partition_service import run_partition_maintainer
+    _background_tasks.append(asyncio.create_task(run_partition_maintainer()))
+    from .services.renewal_service import run_renewal_scanner
+    _background_tasks.append(asyncio.create_task(run_renewal_scanner()))
+    if replica_router.enabled:
+        _background_tasks.append(asyncio.create_task(replica_router.run_lag_monitor()))
+    _background_tasks.append(asyncio.create_task(response_cache.run_listener()))
+    # Pick up PDF extraction jobs interrupted by a restart
+    from .services import extraction_job_service, import_service
+    from .utils import job_lease
+    _background_tasks.append(asyncio.create_task(job_lease.run_reaper(
+        extraction_job_service.reclaim_expired_jobs,
+        import_service.reclaim_expired_jobs,
+    )))
+    try:
+        await extraction_job_service.resume_pending_jobs()
+    except Exception as e:
+        print(f"[EXTRACTION] Could not resume pending jobs: {e}")
+    try:
+        await import_service.resume_pending_jobs()
+    except Exception as e:
+        print(f"[IMPORT] Could not resume pending jobs: {e}")
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    # Cancelled tasks flush their pending work before exiting
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    password_hasher.shutdown()
+    await replica_router.dispose()
+    from .services import extraction_job_service, import_service
+    await extraction_job_service.shutdown()
+    await import_service.shutdown()
 
 # Root endpoint
 @app.get("/")
@@ -111,51 +185,38 @@ async def collect_data(
     from .utils.api_token_utils import validate_api_token
     is_valid = await validate_api_token(x_api_token) if x_api_token else False
     
-    # Audit log
-    try:
-        audit_log = AuditLog(
-            entity_type="API",
-            entity_id="collect_endpoint",
-            action="DATA_COLLECT",
-            performed_by=f"SRC:{request.client.host} (Token:{'Valid' if is_valid else 'Invalid/Missing'})",
-            details={
-                "method": request.method,
-                "headers": {k: v for k, v in request.headers.items() if k.lower() != "x-api-token"},
-                "payload_summary": list(data.keys()) if isinstance(data, dict) else str(data)[:100],
-                "auth_success": is_valid,
-                "remote_ip": request.client.host
-            }
-        )
-        db.add(audit_log)
-        await db.commit()
-    except Exception as e:
-        print(f"Error saving audit log: {e}")
-        await db.rollback()
+    # Audit log (telemetry: queued and written in batches off the request path)
+    audit_sink.record(
+        db,
+        entity_type="API",
+        entity_id="collect_endpoint",
+        action="DATA_COLLECT",
+        performed_by=f"SRC:{request.client.host} (Token:{'Valid' if is_valid else 'Invalid/Missing'})",
+        details={
+            "method": request.method,
+            "headers": {k: v for k, v in request.headers.items() if k.lower() != "x-api-token"},
+            "payload_summary": list(data.keys()) if isinstance(data, dict) else str(data)[:100],
+            "auth_success": is_valid,
+            "remote_ip": request.client.host
+        }
+    )
 
     if not is_valid:
         raise HTTPException(status_code=401, detail="Invalid API token")
     
     if "serial_number" in data and isinstance(data, dict):
         try:
-            serial_number = str(data.get("serial_number")).strip()
-            hostname = data.get("hostname") or data.get("name", "Unknown")
-            
-            # Map fields
-            asset_metadata = data.get("asset_metadata", {})
-            hardware = data.get("hardware", {})
-            asset_type = data.get("type") or asset_metadata.get("type", "Unknown")
-            asset_model = data.get("model") or hardware.get("model") or "Unknown"
-            asset_vendor = data.get("vendor") or data.get("manufacturer") or hardware.get("manufacturer") or "Unknown"
-            asset_segment = data.get("segment") or asset_metadata.get("segment", "IT")
-            asset_location = data.get("location") or asset_metadata.get("location")
-            asset_status = data.get("status", "Active")
-            asset_assigned_to = data.get("assigned_to")
-            
-            specifications = {
-                "hardware": hardware,
-                "os": data.get("os", {}),
-                "network": data.get("network", {})
-            }
+            mapped = collect_service.map_collect_payload(data)
+            serial_number = mapped["serial_number"]
+            hostname = mapped["name"]
+            asset_type = mapped["type"]
+            asset_model = mapped["model"]
+            asset_vendor = mapped["vendor"]
+            asset_segment = mapped["segment"]
+            asset_location = mapped["location"]
+            asset_status = mapped["status"]
+            asset_assigned_to = mapped["assigned_to"]
+            specifications = mapped["specifications"]
             
             res_asset = await db.execute(select(Asset).filter(Asset.serial_number == serial_number))
             existing_asset = res_asset.scalars().first()
@@ -170,6 +231,7 @@ async def collect_data(
                 existing_asset.status = asset_status
                 if asset_assigned_to:
                     existing_asset.assigned_to = asset_assigned_to
+                    existing_asset.assigned_user_id = await user_service.resolve_user_id(db, asset_assigned_to)
                 existing_asset.specifications = specifications
                 existing_asset.updated_at = datetime.now()
                 await db.commit()
@@ -185,8 +247,9 @@ async def collect_data(
                     status=asset_status,
                     location=asset_location,
                     assigned_to=asset_assigned_to,
+                    assigned_user_id=await user_service.resolve_user_id(db, asset_assigned_to),
                     specifications=specifications,
-                    cost=data.get("cost", 0.0)
+                    cost=mapped["cost"]
                 )
                 db.add(new_asset)
                 await db.commit()
@@ -198,6 +261,47 @@ async def collect_data(
     
     return {"status": "success", "logged": True}
 
+@app.post("/api/v1/collect/batch")
+async def collect_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    x_api_token: str = Header(None, alias="X-API-Token")
+):
+    """
+    Bulk ingestion of agent telemetry (Asynchronous).
+    Accepts a JSON array, JSON lines (application/x-ndjson) or either gzip-compressed,
+    validates the token once and upserts all devices in batched statements.
+    """
+    from .utils.api_token_utils import validate_api_token
+    is_valid = await validate_api_token(x_api_token) if x_api_token else False
+    source = f"SRC:{request.client.host} (Token:{'Valid' if is_valid else 'Invalid/Missing'})"
+
+    if not is_valid:
+        audit_sink.record(
+            db,
+            entity_type="API",
+            entity_id="collect_batch",
+            action="DATA_COLLECT",
+            performed_by=source,
+            details={"auth_success": False, "remote_ip": request.client.host}
+        )
+        raise HTTPException(status_code=401, detail="Invalid API token")
+
+    try:
+        items = collect_service.parse_batch_body(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return await collect_service.ingest_batch(db, items, source, request.client.host)
+    except Exception as e:
+        await db.rollback()
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+
 @app.get("/health/db")
 async def db_health_check(db: AsyncSession = Depends(get_db)):
     """
@@ -1,10 +1,52 @@
-from sqlalchemy import Column, String, Date, Float, DateTime, JSON, Text, ForeignKey, Boolean, Index
+from sqlalchemy import Column, String, Date, Float, DateTime, JSON, Text, ForeignKey, Boolean, Index, Integer, DDL, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 import uuid
 from datetime import datetime
 from ..database.database import Base
 
+
+def search_document(*columns):
+    """
+    Columns joined into one immutable text expression (coalesce + ||) for the
+    search indexes. Constants are inlined rather than bound so the indexed
+    expression can be matched by queries (see search_service).
+    """
+    document = func.coalesce(columns[0], literal_column("''"))
+    for column in columns[1:]:
+        document = document.op("||")(literal_column("' '")).op("||")(func.coalesce(column, literal_column("''")))
+    return document
+
+
+def json_path_text(column, *keys):
+    """column -> 'k1' -> ... ->> 'kn' with the keys inlined, for JSONB expression indexes"""
+    expression = column
+    for i, key in enumerate(keys):
+        operator = "->>" if i == len(keys) - 1 else "->"
+        expression = expression.op(operator)(literal_column("'" + key.replace("'", "''") + "'"))
+    return expression
+
+
+def indexed_expression(model, index_name: str):
+    """
+    The (first) expression of one of the model's indexes. Queries that reuse
+    it render the same SQL, so the planner can match them against the index.
+    """
+    index = next(i for i in model.__table__.indexes if i.name == index_name)
+    expression = index.expressions[0]
+    # Labels are only there to attach operator classes (see search_indexes)
+    return getattr(expression, "element", expression)
+
+
+def search_indexes(prefix: str, config: str, *columns):
+    """pg_trgm (substring / fuzzy) and tsvector (ranked, prefix) GIN indexes over columns"""
+    document = search_document(*columns)
+    return (
+        Index(f"{prefix}_trgm", document.label("document"), postgresql_using="gin", postgresql_ops={"document": "gin_trgm_ops"}),
+        Index(f"{prefix}_tsv", func.to_tsvector(literal_column(f"'{config}'::regconfig"), document), postgresql_using="gin"),
+    )
+
+
 class Asset(Base):
     """
     Asset model matching the AssetBase schema
@@ -42,6 +84,9 @@ class Asset(Base):
     # Assignment
     assigned_to = Column(String(255), nullable=True)
     assigned_by = Column(String(255), nullable=True)
+    # User resolved from assigned_to (id, email or name) by the service layer; NULL if unknown.
+    # No FK to auth.users: cross-schema FKs need care (as on Ticket)
+    assigned_user_id = Column(UUID(as_uuid=True), nullable=True, index=True)
 
     # Specifications
     specifications = Column(JSONB, nullable=True, default={})
@@ -64,8 +109,28 @@ class Asset(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # GIN Index for JSONB specifications
+    # Partial (expiry, id) indexes walked in order by the renewal expiry scanner,
+    # and the renewal queue ordered by earliest expiry
     __table_args__ = (
         Index('ix_asset_specifications_gin', specifications, postgresql_using='gin'),
+        # Fallback for assignees that do not resolve to a user (see assigned_user_id)
+        Index('ix_assets_assigned_to_lower', func.lower(assigned_to)),
+        Index('ix_assets_warranty_expiry_unqueued', warranty_expiry, id, postgresql_where=renewal_status.is_(None)),
+        Index('ix_assets_contract_expiry_unqueued', contract_expiry, id, postgresql_where=renewal_status.is_(None)),
+        Index('ix_assets_license_expiry_unqueued', license_expiry, id, postgresql_where=renewal_status.is_(None)),
+        Index(
+            'ix_assets_renewal_queue',
+            renewal_status,
+            func.least(warranty_expiry, contract_expiry, license_expiry),
+            id,
+            postgresql_where=renewal_status.isnot(None),
+        ),
+        # Hot specification paths compared by value (see spec_query_service.HOT_PATHS)
+        Index('ix_assets_spec_os_name', json_path_text(specifications, 'os', 'name')),
+        Index('ix_assets_spec_os_version', json_path_text(specifications, 'os', 'version')),
+        Index('ix_assets_spec_hardware_ram', json_path_text(specifications, 'hardware', 'ram')),
+        # /search
+        *search_indexes('ix_assets_search', 'simple', name, serial_number, model, vendor, location),
         {"schema": "asset"}
     )
 
@@ -108,7 +173,6 @@ class User(Base):
     User model for authentication and role management
     """
     __tablename__ = "users"
-    __table_args__ = {"schema": "auth"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -125,6 +189,13 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Case-insensitive lookups when resolving asset assignees (user_service.resolve_user_ids)
+    __table_args__ = (
+        Index('ix_users_email_lower', func.lower(email)),
+        Index('ix_users_full_name_lower', func.lower(full_name)),
+        {"schema": "auth"},
+    )
+
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, role={self.role}, status={self.status})>"
 
@@ -133,7 +204,6 @@ class Ticket(Base):
     Ticket model for Help Desk/Incidents
     """
     __tablename__ = "tickets"
-    __table_args__ = {"schema": "support"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     # Using a readable ID like TCK-101 is common, but basic UUID is safer for MVP.
@@ -161,6 +231,12 @@ class Ticket(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # /search
+    __table_args__ = (
+        *search_indexes('ix_tickets_search', 'english', subject, description),
+        {"schema": "support"},
+    )
+
     def __repr__(self):
         return f"<Ticket(id={self.id}, subject={self.subject}, status={self.status})>"
 
@@ -169,7 +245,6 @@ class AssetRequest(Base):
     Asset Request model for managing asset requests and approvals
     """
     __tablename__ = "asset_requests"
-    __table_args__ = {"schema": "asset"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -224,6 +299,12 @@ class AssetRequest(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), default=datetime.now, nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), default=datetime.now, onupdate=func.now(), nullable=False)
 
+    # /search
+    __table_args__ = (
+        *search_indexes('ix_asset_requests_search', 'english', asset_name, justification, business_justification),
+        {"schema": "asset"},
+    )
+
     def __repr__(self):
         return f"<AssetRequest(id={self.id}, requester_id={self.requester_id}, status={self.status})>"
 
@@ -308,6 +389,47 @@ class PurchaseInvoice(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
+class ExtractionJob(Base):
+    """
+    Background PDF extraction job for PO / invoice uploads
+    """
+    __tablename__ = "extraction_jobs"
+    __table_args__ = {"schema": "procurement"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    kind = Column(String(20), nullable=False)  # PO | INVOICE
+    target_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # PurchaseOrder / PurchaseInvoice ID
+    file_path = Column(String(500), nullable=False)
+    status = Column(String(20), nullable=False, default="QUEUED", index=True)  # QUEUED | RUNNING | SUCCEEDED | FAILED
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    error = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+    lease_owner = Column(String(255), nullable=True)  # host:pid of the worker running the job
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Refreshed while RUNNING; stale leases are reclaimed
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class StoredFile(Base):
+    """
+    Content-addressed procurement upload (one row per distinct file content)
+    """
+    __tablename__ = "stored_files"
+    __table_args__ = {"schema": "procurement"}
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(500), nullable=False, unique=True)
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # PO / invoice rows pointing at this file
+    extracted_data = Column(JSONB, nullable=True)  # Cached extraction result
+    extracted_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class ExitRequest(Base):
     """
     User exit / resignation workflow
@@ -328,7 +450,9 @@ class ExitRequest(Base):
 
 class AuditLog(Base):
     """
-    Audit Log for system events
+    Audit Log for system events.
+    Range-partitioned by month on timestamp (see audit_partition_service), so the
+    partition key is part of the primary key.
     """
     __tablename__ = "audit_logs"
     __table_args__ = {"schema": "system"}
@@ -339,13 +463,28 @@ class AuditLog(Base):
     action = Column(String(50), nullable=False, index=True) # Created, Updated, Deleted, Login
     performed_by = Column(String(255), nullable=True, index=True) # User ID 
     details = Column(JSONB, nullable=True)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True, nullable=False)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True, index=True, nullable=False)
 
     __table_args__ = (
         Index('ix_audit_logs_details_gin', details, postgresql_using='gin'),
-        {"schema": "system"}
+        # Orphan reconciliation: latest collect payload per serial number
+        Index(
+            'ix_audit_logs_collect_serial',
+            func.btrim(details['serial_number'].astext),
+            timestamp.desc(),
+            postgresql_where=(action == 'DATA_COLLECT'),
+        ),
+        {"schema": "system", "postgresql_partition_by": "RANGE (timestamp)"}
     )
 
+# create_all makes only the parent; without a partition every audit insert fails until
+# audit_partition_service.ensure_partitions runs, so give it the DEFAULT partition up front
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS system.audit_logs_default PARTITION OF system.audit_logs DEFAULT").execute_if(dialect="postgresql"),
+)
+
 class ApiToken(Base):
     """
     API Token model for external system authentication
@@ -363,6 +502,59 @@ class ApiToken(Base):
     last_used_at = Column(DateTime(timezone=True), nullable=True)
 
 
+class SyncCheckpoint(Base):
+    """
+    High-water marks for incremental background scans (reconciliation, renewals, ...)
+    """
+    __tablename__ = "sync_checkpoints"
+    __table_args__ = {"schema": "system"}
+
+    name = Column(String(100), primary_key=True)
+    last_timestamp = Column(DateTime(timezone=True), nullable=True)
+    cursor = Column(JSONB, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ImportJob(Base):
+    """
+    Background bulk import of asset / procurement requests from CSV or Excel
+    """
+    __tablename__ = "import_jobs"
+    __table_args__ = {"schema": "system"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    file_path = Column(String(500), nullable=False)
+    original_filename = Column(String(255), nullable=True)
+    file_format = Column(String(10), nullable=False)  # csv | xlsx | xls
+    status = Column(String(20), nullable=False, default="QUEUED", index=True)  # QUEUED | RUNNING | SUCCEEDED | FAILED
+    total_rows = Column(Integer, nullable=True)  # Estimated from the file before processing
+    rows_processed = Column(Integer, nullable=False, default=0)  # Checkpoint: data rows committed so far
+    asset_requests_created = Column(Integer, nullable=False, default=0)
+    procurement_requests_created = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)  # Fatal error that stopped the job
+    created_by = Column(String(36), nullable=True)
+    lease_owner = Column(String(255), nullable=True)  # host:pid of the worker running the job
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Refreshed while RUNNING; stale leases are reclaimed
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ImportJobError(Base):
+    """
+    Per-row validation error reported by an import job
+    """
+    __tablename__ = "import_job_errors"
+    __table_args__ = {"schema": "system"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("system.import_jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    row_number = Column(Integer, nullable=False)
+    message = Column(Text, nullable=False)
+
+
 class ProcurementLog(Base):
     """
     Audit logs for procurement and finance actions
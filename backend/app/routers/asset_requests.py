@@ -21,6 +21,7 @@ from ..schemas.asset_request_schema import (
     ITRejectionRequest,
 )
 from ..services import asset_request_service
+from ..utils.json_response import models_response
 from ..schemas.user_schema import UserResponse
 from ..models.models import ByodDevice, Asset, AssetAssignment, PurchaseRequest, User, PurchaseOrder, AssetInventory
 from ..services import asset_service
@@ -45,10 +46,12 @@ async def get_asset_requests(
 ):
     """
     Get all asset requests (Asynchronous).
+    The service returns validated models, so they are dumped directly instead of re-validated.
     """
-    return await asset_request_service.get_all_asset_requests(
+    items = await asset_request_service.get_all_asset_requests(
         db, skip=skip, limit=limit, status=status, requester_id=requester_id, domain=domain
     )
+    return models_response(items, AssetRequestResponse)
 
 
 async def verify_active_end_user(
@@ -368,6 +371,7 @@ async def inventory_allocate_asset(request_id: UUID, asset_id: UUID, inventory_m
     if asset:
         user = await asset_request_service.get_user_by_id_db(db, db_request.requester_id)
         asset.assigned_to = user.full_name
+        asset.assigned_user_id = user.id
         asset.status = "Active"
         db_request.status = "FULFILLED"
         db_request.asset_id = asset_id
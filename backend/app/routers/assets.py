@@ -7,10 +7,13 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from ..schemas.asset_schema import AssetCreate, AssetUpdate, AssetResponse, AssetAssignmentRequest
-from ..services import asset_service
+from ..schemas.spec_query_schema import SpecQuery
+from ..services import asset_service, spec_query_service
 from ..services import asset_request_service
 from ..database.database import get_db
+from ..database.replicas import get_read_db
 from ..models.models import AssetRequest
+from ..utils.json_response import models_response, rows_response
 from datetime import date
 
 router = APIRouter(
@@ -20,12 +23,38 @@ router = APIRouter(
 
 
 @router.get("", response_model=List[AssetResponse])
-async def get_all_assets(db: AsyncSession = Depends(get_db)):
+async def get_all_assets(
+    limit: int = Query(asset_service.DEFAULT_PAGE_SIZE, ge=1, le=asset_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    segment: Optional[str] = None,
+    location: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_dir: str = "desc",
+    db: AsyncSession = Depends(get_read_db)
+):
     """
-    Get all assets (Asynchronous).
+    Get a page of assets (Asynchronous).
+    Keyset-paginated: pass the X-Next-Cursor response header back as 'cursor' to get the next page.
+    Rows are serialized straight to JSON (response_model is for the schema only).
     """
     try:
-        return await asset_service.get_all_assets(db)
+        rows, next_cursor = await asset_service.get_assets_page_rows(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            asset_type=type,
+            segment=segment,
+            location=location,
+            assigned_to=assigned_to,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -36,6 +65,9 @@ async def get_all_assets(db: AsyncSession = Depends(get_db)):
             headers={"Access-Control-Allow-Origin": "http://localhost:3000"}
         )
 
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return rows_response(rows, AssetResponse, headers=headers)
+
 
 @router.get("/my-assets", response_model=List[AssetResponse])
 async def get_my_assets(user: str, db: AsyncSession = Depends(get_db)):
@@ -46,13 +78,31 @@ async def get_my_assets(user: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/stats")
-async def get_asset_stats(db: AsyncSession = Depends(get_db)):
+async def get_asset_stats(db: AsyncSession = Depends(get_read_db)):
     """
     Get asset statistics for dashboard (Asynchronous).
     """
     return await asset_service.get_asset_stats(db)
 
 
+@router.post("/spec-query", response_model=List[AssetResponse])
+async def query_assets_by_specifications(query: SpecQuery, db: AsyncSession = Depends(get_read_db)):
+    """
+    Find assets by specification predicates, e.g. hardware.ram eq "8GB" and
+    os.version eq "22.04" (Asynchronous). Predicates are translated into
+    @> / ? / jsonpath queries served by the specifications indexes.
+    Keyset-paginated on id: pass the X-Next-Cursor response header back as 'cursor'.
+    """
+    try:
+        items, next_cursor = await spec_query_service.query_assets(
+            db, query.where, match=query.match, limit=query.limit, cursor=query.cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return models_response(items, AssetResponse, headers=headers)
+
+
 @router.get("/{asset_id}", response_model=AssetResponse)
 async def get_asset(asset_id: UUID, db: AsyncSession = Depends(get_db)):
     """
@@ -124,7 +174,8 @@ async def assign_asset(
         asset_id, 
         assignment.assigned_to, 
         assignment.location or "Office", 
-        assign_date
+        assign_date,
+        assigned_user_id=assignment.assigned_to_id,
     )
     if not assigned_asset:
         raise HTTPException(status_code=404, detail="Asset not found")
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, and_
+from sqlalchemy import func
 from typing import List, Optional
 from ..database.database import get_db
+from ..database.replicas import get_read_db
 from ..models.models import AuditLog, Asset
+from ..services import reconciliation_service
+from ..services import audit_service, spec_query_service
+from ..schemas.spec_query_schema import AuditDetailsQuery
 from pydantic import BaseModel
 from datetime import datetime
 from uuid import UUID
@@ -28,36 +32,67 @@ class AuditLogResponse(BaseModel):
 
 @router.get("/logs", response_model=List[AuditLogResponse])
 async def get_audit_logs(
-    limit: int = 100,
-    offset: int = 0,
-    after_id: Optional[UUID] = None,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
     entity_type: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    action: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only logs before this time"),
+    after_id: Optional[str] = Query(None, description="Deprecated: use cursor"),
+    offset: int = Query(0, ge=0, description="Deprecated: ignored when cursor or after_id is given"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get system audit logs (Asynchronous).
-    Supports Keyset pagination via 'after_id'.
+    Get system audit logs, newest first (Asynchronous).
+    Keyset-paginated on (timestamp, id): pass the X-Next-Cursor response header back as 'cursor'.
     """
-    query = select(AuditLog)
-    
-    if entity_type:
-        query = query.filter(AuditLog.entity_type == entity_type)
-        
-    if after_id:
-        res_anchor = await db.execute(select(AuditLog).filter(AuditLog.id == after_id))
-        anchor = res_anchor.scalars().first()
-        if anchor:
-            # Anchor point for keyset pagination
-            query = query.filter(
-                and_(
-                    AuditLog.timestamp <= anchor.timestamp,
-                    AuditLog.id < anchor.id
-                )
-            )
+    try:
+        logs, next_cursor = await audit_service.get_audit_logs_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            entity_type=entity_type,
+            action=action,
+            since=since,
+            until=until,
+            after_id=after_id,
+            offset=offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
 
-    query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).offset(offset).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+@router.post("/logs/query", response_model=List[AuditLogResponse])
+async def query_audit_logs(
+    query: AuditDetailsQuery,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Audit logs whose details match structured predicates, newest first (Asynchronous).
+    Predicates are translated into @> / ? / jsonpath queries served by ix_audit_logs_details_gin;
+    since/until still prune partitions. Paginated like GET /audit/logs.
+    """
+    try:
+        details = spec_query_service.build_conditions(AuditLog.details, query.where, query.match)
+        logs, next_cursor = await audit_service.get_audit_logs_page(
+            db,
+            limit=query.limit,
+            cursor=query.cursor,
+            entity_type=query.entity_type,
+            action=query.action,
+            since=query.since,
+            until=query.until,
+            filters=[details],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
 
 @router.get("/stats")
 async def get_audit_stats(db: AsyncSession = Depends(get_db)):
@@ -76,69 +111,13 @@ async def get_audit_stats(db: AsyncSession = Depends(get_db)):
     }
 
 @router.post("/sync")
-async def sync_orphaned_logs(db: AsyncSession = Depends(get_db)):
+async def sync_orphaned_logs(full: bool = False, db: AsyncSession = Depends(get_db)):
     """
-    Search for DATA_COLLECT logs that don't have corresponding assets and create them (Asynchronous).
+    Create assets for DATA_COLLECT logs that don't have corresponding assets (Asynchronous).
+    Only logs newer than the previous run are scanned unless full=true.
     """
-    res_logs = await db.execute(select(AuditLog).filter(AuditLog.action == "DATA_COLLECT"))
-    logs = res_logs.scalars().all()
-    repaired_count = 0
-    
-    for log in logs:
-        data = log.details
-        if not data or not isinstance(data, dict):
-            continue
-        
-        serial_number = data.get("serial_number")
-        if not serial_number:
-            continue
-            
-        # Check if asset exists
-        res_asset = await db.execute(select(Asset).filter(Asset.serial_number == serial_number))
-        existing_asset = res_asset.scalars().first()
-        if existing_asset:
-            continue
-            
-        # Create asset from log data
-        try:
-            hostname = data.get("hostname") or data.get("name") or "Unknown"
-            asset_metadata = data.get("asset_metadata", {})
-            hardware = data.get("hardware", {})
-            
-            asset_type = data.get("type") or asset_metadata.get("type", "Unknown")
-            asset_model = data.get("model") or hardware.get("model") or "Unknown"
-            asset_vendor = data.get("vendor") or data.get("manufacturer") or hardware.get("manufacturer") or "Unknown"
-            asset_segment = data.get("segment") or asset_metadata.get("segment", "IT")
-            asset_location = data.get("location") or asset_metadata.get("location")
-            asset_status = data.get("status", "Active")
-            
-            specifications = {
-                "hardware": hardware if hardware else {k: v for k, v in data.items() if k in ["model", "manufacturer", "cpu", "ram", "storage"]},
-                "os": data.get("os", {}),
-                "network": data.get("network", {})
-            }
-
-            new_asset = Asset(
-                name=hostname,
-                type=asset_type,
-                model=asset_model,
-                vendor=asset_vendor,
-                serial_number=serial_number,
-                segment=asset_segment,
-                status=asset_status,
-                location=asset_location,
-                specifications=specifications,
-                cost=data.get("cost", 0.0)
-            )
-            
-            db.add(new_asset)
-            await db.commit() # Individual commit for safety in loop, or could bulk for perf
-            repaired_count += 1
-        except Exception as e:
-            print(f"Failed to sync log {log.id}: {e}")
-            await db.rollback()
-            
+    result = await reconciliation_service.reconcile_orphaned_collect_logs(db, full=full)
     return {
         "status": "success",
-        "synced_count": repaired_count
+        **result
     }
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from uuid import UUID
-import uuid
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import cast, String
+from sqlalchemy import cast, update, String
 from ..database.database import get_db
 from ..schemas.user_schema import UserCreate, UserResponse, LoginRequest, LoginResponse
-from ..schemas.exit_schema import ExitRequestResponse
+from ..schemas.exit_schema import ExitRequestResponse, BulkExitRequest
 from ..services import user_service, exit_service
 from ..utils import auth_utils
-from ..models.models import AssetAssignment, ByodDevice, ExitRequest, Asset
+from ..utils.principal_cache import invalidate_principal
+from ..models.models import ByodDevice, ExitRequest, Asset, User
 from datetime import datetime
 
 router = APIRouter(
@@ -73,7 +73,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
         )
     # Real JWT token
     access_token = auth_utils.create_access_token(
-        data={"sub": user.email, "user_id": str(user.id), "role": user.role}
+        data={"sub": user.email, "user_id": str(user.id), "role": user.role, "status": user.status, "name": user.full_name}
     )
     return {
         "access_token": access_token, 
@@ -113,70 +113,11 @@ async def initiate_exit(
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        # Update user status to EXITING
-        user.status = "EXITING"
-
-        # 1. Get assignments from history table
-        result_asn = await db.execute(select(AssetAssignment).filter(AssetAssignment.user_id == user_id))
-        assignments = result_asn.scalars().all()
-        
-        # 2. Get direct current assignments from Asset table
-        result_assets = await db.execute(select(Asset).filter(
-            (Asset.assigned_to == str(user_id)) | (Asset.assigned_to == user.full_name) | (Asset.assigned_to == user.email)
-        ))
-        direct_assets = result_assets.scalars().all()
-        
-        assets_snapshot = []
-        seen_asset_ids = set()
-        
-        for a in direct_assets:
-            if str(a.id) not in seen_asset_ids:
-                assets_snapshot.append({
-                    "asset_id": str(a.id),
-                    "asset_name": a.name,
-                    "asset_type": a.type,
-                    "location": a.location,
-                    "assigned_at": a.assignment_date.isoformat() if a.assignment_date else None,
-                })
-                seen_asset_ids.add(str(a.id))
-        
-        for a in assignments:
-            if str(a.asset_id) not in seen_asset_ids:
-                asset_obj_res = await db.execute(select(Asset).filter(Asset.id == a.asset_id))
-                asset_obj = asset_obj_res.scalars().first()
-                assets_snapshot.append({
-                    "asset_id": str(a.asset_id),
-                    "asset_name": asset_obj.name if asset_obj else "Unknown Asset",
-                    "asset_type": asset_obj.type if asset_obj else "Unknown",
-                    "location": a.location,
-                    "assigned_at": a.assigned_at.isoformat() if a.assigned_at else None,
-                })
-                seen_asset_ids.add(str(a.asset_id))
-
-        result_byod = await db.execute(select(ByodDevice).filter(ByodDevice.owner_id == user_id))
-        byod_devices = result_byod.scalars().all()
-
-        byod_snapshot = [
-            {
-                "device_id": str(d.id),
-                "device_model": d.device_model,
-                "os_version": d.os_version,
-                "serial_number": d.serial_number,
-                "compliance_status": d.compliance_status,
-            }
-            for d in byod_devices
-        ]
-
-        exit_request = ExitRequest(
-            id=uuid.uuid4(),
-            user_id=user_id,
-            status="OPEN",
-            assets_snapshot=assets_snapshot,
-            byod_snapshot=byod_snapshot,
-        )
-        db.add(exit_request)
+        # Snapshot assets / BYOD and open the exit request (set-based, shared with bulk exit)
+        await exit_service.initiate_exits(db, [user])
         await db.commit()
         await db.refresh(user)
+        invalidate_principal(user_id)
 
         return user
     except Exception as e:
@@ -184,6 +125,36 @@ async def initiate_exit(
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
+@router.post("/users/bulk-exit")
+async def bulk_initiate_exit(
+    payload: BulkExitRequest,
+    db: AsyncSession = Depends(get_db),
+    admin_user = Depends(check_system_admin)
+):
+    """
+    Initiate the exit workflow for many users in one transaction (Asynchronous).
+    Users already EXITING or DISABLED are skipped; unknown ids are reported.
+    """
+    user_ids = list(dict.fromkeys(payload.user_ids))
+    result = await db.execute(select(User).filter(User.id.in_(user_ids)))
+    users = {u.id: u for u in result.scalars().all()}
+
+    not_found = [str(uid) for uid in user_ids if uid not in users]
+    skipped = [str(uid) for uid, u in users.items() if u.status in ("EXITING", "DISABLED")]
+    to_exit = [u for u in users.values() if u.status not in ("EXITING", "DISABLED")]
+
+    try:
+        created = await exit_service.initiate_exits(db, to_exit)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    for u in to_exit:
+        invalidate_principal(u.id)
+
+    return {"created": created, "skipped": skipped, "not_found": not_found}
+
+
 @router.post("/users/{user_id}/disable", response_model=UserResponse)
 async def disable_user(
     user_id: UUID,
@@ -199,9 +170,7 @@ async def disable_user(
 
     # PRE-CHECK: Ensure no assets are assigned
     from sqlalchemy import func
-    due_assets_res = await db.execute(select(func.count(Asset.id)).filter(
-        (Asset.assigned_to == str(user.id)) | (Asset.assigned_to == user.full_name) | (Asset.assigned_to == user.email)
-    ))
+    due_assets_res = await db.execute(select(func.count(Asset.id)).filter(exit_service.assigned_to_user(user)))
     due_assets = due_assets_res.scalar()
     
     due_byod_res = await db.execute(select(func.count(ByodDevice.id)).filter(ByodDevice.owner_id == user.id))
@@ -216,6 +185,7 @@ async def disable_user(
     user.status = "DISABLED"
     await db.commit()
     await db.refresh(user)
+    invalidate_principal(user.id)
 
     return user
 
@@ -262,21 +232,22 @@ async def process_exit_assets(
     if not exit_request:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exit request not found")
     
-    # Process assets from snapshot
+    # Return the snapshot's assets to stock in one statement. The snapshot also lists past
+    # assignments, so only assets still assigned to the leaving user are touched; QC and
+    # the wipe pipeline are left to exit_service.handle_user_exit.
+    asset_ids = exit_service.snapshot_ids(exit_request.assets_snapshot, "asset_id")
     assets_processed = []
-    if exit_request.assets_snapshot:
-        for asset_snapshot in exit_request.assets_snapshot:
-            asset_id = asset_snapshot.get("asset_id")
-            if asset_id:
-                ares = await db.execute(select(Asset).filter(Asset.id == asset_id))
-                asset = ares.scalars().first()
-                if asset:
-                    asset.status = "In Stock"
-                    asset.assigned_to = None
-                    asset.assigned_by = None
-                    asset.assignment_date = None
-                    assets_processed.append(asset_id)
-        
+    if asset_ids:
+        await exit_service.bound_transaction(db)
+        result = await db.execute(
+            update(Asset)
+            .where(Asset.id == exit_service.any_id(asset_ids), Asset.assigned_user_id == UUID(str(exit_request.user_id)))
+            .values(status="In Stock", assigned_to=None, assigned_user_id=None, assigned_by=None, assignment_date=None)
+            .returning(Asset.id)
+            .execution_options(synchronize_session=False)
+        )
+        assets_processed = [str(asset_id) for asset_id in result.scalars().all()]
+
     if exit_request.status == "BYOD_PROCESSED":
         exit_request.status = "READY_FOR_COMPLETION"
     elif exit_request.status == "OPEN":
@@ -300,17 +271,19 @@ async def process_exit_byod(
     if not exit_request:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exit request not found")
     
+    device_ids = exit_service.snapshot_ids(exit_request.byod_snapshot, "device_id")
     byod_processed = []
-    if exit_request.byod_snapshot:
-        for byod_snapshot in exit_request.byod_snapshot:
-            device_id = byod_snapshot.get("device_id")
-            if device_id:
-                bres = await db.execute(select(ByodDevice).filter(ByodDevice.id == device_id))
-                byod = bres.scalars().first()
-                if byod:
-                    byod.compliance_status = "DE_REGISTERED"
-                    byod_processed.append(device_id)
-        
+    if device_ids:
+        processed = await exit_service.retire_byod_devices(
+            db,
+            ByodDevice.id == exit_service.any_id(device_ids),
+            new_status="DE_REGISTERED",
+            action="BYOD_DEREGISTERED_ON_EXIT",
+            actor_id=it_manager.id,
+            user_id=exit_request.user_id,
+        )
+        byod_processed = [str(device_id) for device_id in processed]
+
     if exit_request.status == "ASSETS_PROCESSED":
         exit_request.status = "READY_FOR_COMPLETION"
     elif exit_request.status == "OPEN":
@@ -336,28 +309,20 @@ async def complete_exit_request(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     # Verify Assets reclamation
-    if exit_request.assets_snapshot:
-        for asset_info in exit_request.assets_snapshot:
-            asset_id = asset_info.get("asset_id")
-            if asset_id:
-                ares = await db.execute(select(Asset).filter(Asset.id == asset_id))
-                asset = ares.scalars().first()
-                if asset and (asset.assigned_to in [str(user.id), user.full_name, user.email]):
-                     raise HTTPException(status_code=403, detail=f"Asset {asset.name} still assigned")
+    asset_ids = exit_service.snapshot_ids(exit_request.assets_snapshot, "asset_id")
+    still_assigned = await exit_service.first_unreturned_asset(db, user, asset_ids)
+    if still_assigned:
+        raise HTTPException(status_code=403, detail=f"Asset {still_assigned} still assigned")
 
     # Verify BYOD
-    if exit_request.byod_snapshot:
-        for byod_info in exit_request.byod_snapshot:
-            device_id = byod_info.get("device_id")
-            if device_id:
-                bres = await db.execute(select(ByodDevice).filter(ByodDevice.id == device_id))
-                byod = bres.scalars().first()
-                if byod and byod.compliance_status not in ["DE_REGISTERED", "DECOMMISSIONED"]:
-                    raise HTTPException(status_code=403, detail="BYOD still active")
+    device_ids = exit_service.snapshot_ids(exit_request.byod_snapshot, "device_id")
+    if await exit_service.has_active_byod(db, device_ids):
+        raise HTTPException(status_code=403, detail="BYOD still active")
     
     exit_request.status = "COMPLETED"
     user.status = "DISABLED"
     await db.commit()
+    invalidate_principal(user.id)
     return {"status": "success"}
 
 @router.post("/users/{user_id}/finalize-exit")
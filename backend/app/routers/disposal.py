@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from ..database.database import get_db
-from ..models.models import Asset, AuditLog
+from ..models.models import Asset
 from ..utils import auth_utils
+from ..utils.audit_sink import audit_sink
 import uuid
 from uuid import UUID
 from datetime import datetime
@@ -58,15 +59,14 @@ async def initiate_disposal(
     asset.disposal_status = "SCRAP_CANDIDATE"
     asset.status = "Scrap"
     
-    audit = AuditLog(
-        id=uuid.uuid4(),
+    audit_sink.record(
+        db,
         entity_type="Asset",
         entity_id=asset.id,
         action="DISPOSAL_INITIATED",
         performed_by=user.id,
         details={"status": "SCRAP_CANDIDATE"}
     )
-    db.add(audit)
     await db.commit()
     return {"status": "success", "disposal_status": "SCRAP_CANDIDATE"}
 
@@ -105,15 +105,14 @@ async def record_wipe(
     
     asset.disposal_status = "WIPED"
     
-    audit = AuditLog(
-        id=uuid.uuid4(),
+    audit_sink.record(
+        db,
         entity_type="Asset",
         entity_id=asset.id,
         action="DATA_WIPE_COMPLETED",
         performed_by=user.id,
         details={"method": "DoD 5220.22-M"}
     )
-    db.add(audit)
     await db.commit()
     return {"status": "success", "disposal_status": "WIPED"}
 
@@ -134,16 +133,16 @@ async def finalize_disposal(
     asset.disposal_status = "RETIRED"
     asset.status = "Retired"
     asset.assigned_to = None
+    asset.assigned_user_id = None
     asset.location = "Disposal Archive"
     
-    audit = AuditLog(
-        id=uuid.uuid4(),
+    audit_sink.record(
+        db,
         entity_type="Asset",
         entity_id=asset.id,
         action="ASSET_RETIRED",
         performed_by=user.id,
         details={"final_status": "RETIRED"}
     )
-    db.add(audit)
     await db.commit()
     return {"status": "success", "disposal_status": "RETIRED"}
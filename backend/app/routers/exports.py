@@ -0,0 +1,116 @@
+"""
+Streaming export endpoints for full data dumps (Asynchronous)
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from ..database.replicas import replica_router
+from ..services import export_service
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["exports"]
+)
+
+
+def _stream_export(
+    request: Request,
+    entity: str,
+    fmt: str,
+    columns: Optional[str],
+    gzip: Optional[bool],
+    filters: dict,
+) -> StreamingResponse:
+    if fmt not in export_service.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{fmt}'. Allowed: {', '.join(export_service.FORMATS)}")
+    selected = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+    try:
+        query, selected = export_service.build_query(entity, selected, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type, extension = export_service.FORMATS[fmt]
+    # XLSX is already a zip archive; default to gzip when the client accepts it
+    if gzip is None:
+        gzip = "gzip" in request.headers.get("accept-encoding", "")
+    compress = gzip and fmt != "xlsx"
+
+    async def body():
+        # The stream owns its session: it outlives the request handler.
+        # The next batch is only fetched once the previous chunk was sent, so a
+        # slow client throttles the cursor instead of growing a buffer.
+        async for db in replica_router.get_session(request):
+            batches = export_service.iter_batches(db, query)
+            chunks = export_service.encode(batches, selected, fmt, sheet_title=entity)
+            if compress:
+                chunks = export_service.gzip_stream(chunks)
+            async for chunk in chunks:
+                yield chunk
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    headers = {"Content-Disposition": f'attachment; filename="{entity}-{stamp}.{extension}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
+
+
+@router.get("/assets")
+async def export_assets(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson | csv | xlsx"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    gzip: Optional[bool] = Query(None, description="Compress the stream (default: when Accept-Encoding allows gzip)"),
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    segment: Optional[str] = None,
+):
+    """
+    Stream every asset (standard + BYOD), oldest first (Asynchronous).
+    Rows are read from a server-side cursor, so memory use does not grow with the table.
+    """
+    return _stream_export(request, "assets", format, columns, gzip, {"status": status, "type": type, "segment": segment})
+
+
+@router.get("/tickets")
+async def export_tickets(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson | csv | xlsx"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    gzip: Optional[bool] = Query(None, description="Compress the stream (default: when Accept-Encoding allows gzip)"),
+    status: Optional[str] = None,
+):
+    """
+    Stream every ticket, oldest first (Asynchronous).
+    """
+    return _stream_export(request, "tickets", format, columns, gzip, {"status": status})
+
+
+@router.get("/audit-logs")
+async def export_audit_logs(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson | csv | xlsx"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    gzip: Optional[bool] = Query(None, description="Compress the stream (default: when Accept-Encoding allows gzip)"),
+    entity_type: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only logs before this time"),
+):
+    """
+    Stream audit logs, oldest first (Asynchronous).
+    since/until limit the scan to the matching monthly partitions.
+    """
+    filters = {"entity_type": entity_type, "action": action, "since": since, "until": until}
+    return _stream_export(request, "audit-logs", format, columns, gzip, filters)
+
+
+@router.get("/{entity}/columns")
+async def get_export_columns(entity: str):
+    """
+    List the columns that can be selected for an export.
+    """
+    try:
+        return {"entity": entity, "columns": export_service.available_columns(entity)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
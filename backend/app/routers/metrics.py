@@ -0,0 +1,54 @@
+"""
+Operational metrics endpoints (in-process counters, per worker)
+"""
+from fastapi import APIRouter
+from ..utils.password_hasher import password_hasher
+from ..utils.audit_sink import audit_sink
+from ..database.database import get_pool_metrics
+from ..database.replicas import replica_router
+from ..utils.response_cache import response_cache
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"]
+)
+
+
+@router.get("/password-hasher")
+async def get_password_hasher_metrics():
+    """
+    Password hashing pool: queue depth, rejections and wait/run latency.
+    """
+    return password_hasher.metrics()
+
+
+@router.get("/audit-sink")
+async def get_audit_sink_metrics():
+    """
+    Audit writer: queue depth, dropped events, write batches and emit-to-write delay.
+    """
+    return audit_sink.metrics()
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics():
+    """
+    Async engine connection pool: checked-out and overflow connections, checkout wait times and timeouts.
+    """
+    return get_pool_metrics()
+
+
+@router.get("/db-replicas")
+async def get_db_replica_metrics():
+    """
+    Read replicas: rotation status, replication lag, routed reads and primary fallbacks.
+    """
+    return replica_router.metrics()
+
+
+@router.get("/response-cache")
+async def get_response_cache_metrics():
+    """
+    Response cache: hits, 304s, bypasses and in-process cache size.
+    """
+    return response_cache.metrics()
@@ -0,0 +1,43 @@
+"""
+Search endpoint - ranked typeahead / full-text search (Asynchronous)
+"""
+import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database.replicas import get_read_db
+from ..services import search_service
+from ..utils.json_response import FastJSONResponse
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+
+@router.get("")
+async def search(
+    q: Optional[str] = Query(None, max_length=search_service.MAX_QUERY_LENGTH, description="Search text"),
+    types: Optional[str] = Query(None, description="Comma-separated: assets, tickets, requests (default: all)"),
+    limit: int = Query(search_service.DEFAULT_LIMIT, ge=1, le=search_service.MAX_LIMIT, description="Results per type"),
+    typeahead: bool = Query(True, description="Treat the last word as a prefix; false for web-search syntax"),
+    status: Optional[str] = None,
+    spec: Optional[List[str]] = Query(None, description="Asset specification filters: key, key=value or a.b=value"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Ranked search over assets, tickets and asset requests (Asynchronous).
+    Served by pg_trgm / tsvector indexes, so it stays fast for typeahead on large tables.
+    """
+    started = time.perf_counter()
+    try:
+        results = await search_service.search(
+            db, q, types=types, limit=limit, typeahead=typeahead, status=status, specs=spec
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
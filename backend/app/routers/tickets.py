@@ -4,6 +4,7 @@ from sqlalchemy.future import select
 from typing import List, Optional
 from uuid import UUID
 from ..database.database import get_db
+from ..database.replicas import get_read_db
 from ..schemas.ticket_schema import TicketCreate, TicketUpdate, TicketResponse, ITDiagnosisRequest, ResolutionUpdate
 from ..services import ticket_service
 from ..services import asset_request_service
@@ -54,7 +55,7 @@ async def create_ticket(ticket: TicketCreate, db: AsyncSession = Depends(get_db)
     return await ticket_service.create_ticket(db=db, ticket=ticket)
 
 @router.get("/", response_model=List[TicketResponse])
-async def read_tickets(requestor_id: Optional[UUID] = None, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
+async def read_tickets(requestor_id: Optional[UUID] = None, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_read_db)):
     """Read all tickets (Asynchronous)."""
     return await ticket_service.get_tickets(db, requestor_id=requestor_id, skip=skip, limit=limit)
 
@@ -1,14 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-import pandas as pd
-import io
 import os
 import uuid
-import shutil
 from ..services import asset_service
 from ..services import asset_request_service
 from ..services import procurement_service
+from ..services import extraction_job_service
+from ..services import file_store_service
+from ..services import import_service
 from ..schemas.asset_schema import AssetCreate
 from ..schemas.asset_request_schema import AssetRequestCreate
 from ..database.database import get_db
@@ -20,80 +20,52 @@ router = APIRouter(
     tags=["upload"]
 )
 
-@router.post("/smart")
+@router.post("/smart", status_code=status.HTTP_202_ACCEPTED)
 async def smart_upload(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
-    if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Invalid file format. Please upload CSV or Excel.")
-
-    contents = await file.read()
-    
+    """
+    Bulk import of asset / procurement requests from CSV or Excel.
+    The file is processed in chunks by a background job; poll /upload/imports/{job_id}.
+    """
     try:
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(contents))
-        else:
-            df = pd.read_excel(io.BytesIO(contents))
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+        job = await import_service.create_import_job(db, file.file, file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return import_service.job_to_dict(job)
 
-    # Normalize headers to lowercase
-    df.columns = df.columns.str.lower().str.replace(' ', '_')
-    
-    results = {
-        "asset_requests_created": 0,
-        "procurement_requests_created": 0,
-        "errors": []
-    }
-
-    for index, row in df.iterrows():
-        try:
-            is_procurement = False
-            if 'record_type' in df.columns and str(row['record_type']).lower() in ['procurement', 'request']:
-                is_procurement = True
-            elif pd.isna(row.get('serial_number')) and (not pd.isna(row.get('estimated_cost')) or not pd.isna(row.get('reason'))):
-                is_procurement = True
-            
-            requester_id = row.get('requester_id') or row.get('requester')
-            if not requester_id:
-                results['errors'].append(f"Row {index+1}: Missing requester_id/requester")
-                continue
-            
-            request_data = {
-                "requester_id": str(requester_id),
-                "asset_name": row.get('name') or row.get('asset_name') or "Unknown Asset",
-                "asset_type": row.get('type', 'Laptop'),
-                "asset_ownership_type": row.get('asset_ownership_type', 'COMPANY_OWNED'),
-                "asset_model": row.get('model', ''),
-                "asset_vendor": row.get('vendor', ''),
-                "cost_estimate": float(row.get('cost_estimate', 0)) if not pd.isna(row.get('cost_estimate')) else None,
-                "justification": row.get('justification', ''),
-                "business_justification": row.get('business_justification') or row.get('reason') or row.get('justification') or "Uploaded via bulk import"
-            }
-            
-            if not request_data['business_justification']:
-                results['errors'].append(f"Row {index+1}: Missing business_justification")
-                continue
-            
-            if is_procurement:
-                created_request = await asset_request_service.create_asset_request(
-                    db,
-                    AssetRequestCreate(**request_data),
-                    initial_status="PROCUREMENT_REQUESTED"
-                )
-                if created_request:
-                    results["procurement_requests_created"] += 1
-            else:
-                created_request = await asset_request_service.create_asset_request(
-                    db,
-                    AssetRequestCreate(**request_data),
-                    initial_status="SUBMITTED"
-                )
-                if created_request:
-                    results["asset_requests_created"] += 1
+@router.get("/imports/{job_id}")
+async def get_import_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Import job progress (Asynchronous)."""
+    job = await import_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return import_service.job_to_dict(job)
 
-        except Exception as e:
-            results["errors"].append(f"Row {index+1}: {str(e)}")
+@router.get("/imports/{job_id}/errors")
+async def get_import_job_errors(
+    job_id: uuid.UUID,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Per-row validation errors for an import job (Asynchronous)."""
+    job = await import_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return {
+        "job_id": str(job.id),
+        "error_count": job.error_count,
+        "errors": await import_service.get_job_errors(db, job_id, skip, limit)
+    }
 
-    return results
+@router.post("/imports/{job_id}/resume")
+async def resume_import_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Resume a failed import job from its last checkpoint (Asynchronous)."""
+    try:
+        job = await import_service.resume_job(db, job_id)
+    except ValueError as e:
+        detail = str(e)
+        raise HTTPException(status_code=404 if "not found" in detail else 409, detail=detail)
+    return import_service.job_to_dict(job)
 
 @router.post("/po/{request_id}")
 async def upload_po(
@@ -108,17 +80,10 @@ async def upload_po(
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are allowed for POs")
 
-    procurement_service.ensure_upload_dir()
-    
-    file_id = str(uuid.uuid4())
-    file_ext = os.path.splitext(file.filename)[1]
-    file_path = os.path.join(procurement_service.UPLOAD_DIR, f"PO_{request_id}_{file_id}{file_ext}")
+    # Stored once per content hash; a re-sent PO reuses the file and its cached extraction
+    stored = await file_store_service.store_upload(db, file.file)
     
-    # Simple synchronous file write is typically acceptable for local disk IO in smaller apps
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-    
-    return await procurement_service.handle_po_upload(db, request_id, uploader_id, file_path)
+    return await procurement_service.handle_po_upload(db, request_id, uploader_id, stored.file_path, stored.extracted_data)
 
 @router.post("/invoice/{po_id}")
 async def upload_invoice(
@@ -133,15 +98,9 @@ async def upload_invoice(
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed for Invoices")
 
-    procurement_service.ensure_upload_dir()
-    
-    file_id = str(uuid.uuid4())
-    file_path = os.path.join(procurement_service.UPLOAD_DIR, f"INV_{po_id}_{file_id}.pdf")
+    stored = await file_store_service.store_upload(db, file.file)
     
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-    
-    return await procurement_service.handle_invoice_upload(db, po_id, uploader_id, file_path)
+    return await procurement_service.handle_invoice_upload(db, po_id, uploader_id, stored.file_path, stored.extracted_data)
 
 @router.get("/po/{request_id}")
 async def get_po_details(request_id: str, db: AsyncSession = Depends(get_db)):
@@ -151,3 +110,21 @@ async def get_po_details(request_id: str, db: AsyncSession = Depends(get_db)):
     if not po:
         raise HTTPException(status_code=404, detail="PO not found for this request")
     return po
+
+@router.get("/jobs/{job_id}")
+async def get_extraction_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Poll the status of a PO / invoice extraction job (Asynchronous)."""
+    job = await extraction_job_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    return extraction_job_service.job_to_dict(job)
+
+@router.post("/jobs/{job_id}/retry")
+async def retry_extraction_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Requeue a failed extraction job (Asynchronous)."""
+    try:
+        job = await extraction_job_service.retry_job(db, job_id)
+    except ValueError as e:
+        detail = str(e)
+        raise HTTPException(status_code=404 if "not found" in detail else 409, detail=detail)
+    return extraction_job_service.job_to_dict(job)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,6 +8,8 @@ from ..schemas.asset_schema import AssetUpdate
 from ..database.database import get_db
 from ..models.models import AssetRequest, PurchaseRequest, Asset
 from ..services import asset_request_service
+from ..services import renewal_service
+from ..schemas.asset_schema import AssetResponse
 from datetime import date
 
 router = APIRouter(
@@ -15,6 +17,39 @@ router = APIRouter(
     tags=["workflows"]
 )
 
+@router.get("/renewals", response_model=List[AssetResponse])
+async def get_renewal_queue(
+    response: Response,
+    status: str = Query("Requested", description="Renewal stage: Requested, IT_Approved, Finance_Approved, Commercial_Approved"),
+    urgency: Optional[str] = None,
+    limit: int = Query(renewal_service.DEFAULT_PAGE_SIZE, ge=1, le=renewal_service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Renewal queue, soonest expiry first (Asynchronous).
+    Each item is advanced through POST /workflows/review/{asset_id}.
+    """
+    try:
+        items, next_cursor = await renewal_service.get_renewal_queue_page(
+            db, limit=limit, cursor=cursor, renewal_status=status, urgency=urgency
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+@router.post("/renewals/scan")
+async def scan_renewals(full: bool = Query(False, description="Rescan every asset instead of continuing from the checkpoint")):
+    """
+    Run the expiry scanner now (Asynchronous).
+    """
+    result = await renewal_service.run_scan_once(full=full)
+    if result is None:
+        raise HTTPException(status_code=409, detail="An expiry scan is already running")
+    return result
+
 @router.post("/review/{asset_id}")
 async def review_renewal(
     asset_id: UUID, 
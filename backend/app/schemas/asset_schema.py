@@ -56,6 +56,7 @@ from typing import Union
 
 class AssetResponse(AssetBase):
     id: UUID
+    assigned_user_id: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
     assignment_date: Optional[date] = None
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Any
 from datetime import datetime
+from uuid import UUID
 
 class ExitRequestResponse(BaseModel):
     id: str
@@ -11,4 +12,8 @@ class ExitRequestResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkExitRequest(BaseModel):
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=5000)
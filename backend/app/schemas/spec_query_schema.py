@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Literal
+from datetime import datetime
+
+
+class SpecPredicate(BaseModel):
+    path: str = Field(..., min_length=1, max_length=255, description="Dotted JSON path, e.g. os.name or hardware.ram")
+    op: Literal["eq", "in", "exists", "gt", "gte", "lt", "lte"] = "eq"
+    value: Any = None
+
+
+class SpecQuery(BaseModel):
+    where: List[SpecPredicate] = Field(..., min_length=1, max_length=20)
+    match: Literal["all", "any"] = "all"
+    limit: int = Field(100, ge=1, le=1000)
+    cursor: Optional[str] = None
+
+
+class AuditDetailsQuery(SpecQuery):
+    entity_type: Optional[str] = None
+    action: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
@@ -2,6 +2,7 @@
 Asset Request service layer - Database operations for asset requests (Asynchronous)
 """
 import uuid
+from collections import defaultdict
 from uuid import UUID
 from datetime import datetime
 from typing import List, Optional
@@ -14,69 +15,114 @@ from ..services import procurement_service
 from ..utils.state_machine import validate_state_transition
 
 
+# Roles that see the full procurement trail (PO, invoice, logs)
+PROCUREMENT_VIEW_ROLES = ["PROCUREMENT_FINANCE", "FINANCE", "ADMIN"]
+
+
 async def _populate_requester_info(db: AsyncSession, db_request: AssetRequest, user_role: str = None) -> AssetRequestResponse:
     """Helper to add requester name/email and procurement info (role-sensitive)"""
     # Ensure attributes are loaded after a commit and not expired
     await db.refresh(db_request)
-    
-    result = await db.execute(select(User).filter(User.id == db_request.requester_id))
-    user = result.scalars().first()
-    
-    res = AssetRequestResponse.model_validate(db_request)
-    if user:
-        res.requester_name = user.full_name
-        res.requester_email = user.email
-    
+    responses = await _populate_requester_info_batch(db, [db_request], user_role=user_role)
+    return responses[0]
+
+
+async def _populate_requester_info_batch(db: AsyncSession, db_requests: List[AssetRequest], user_role: str = None) -> List[AssetRequestResponse]:
+    """
+    Batched version of _populate_requester_info for a whole page of requests.
+    Issues at most one query per table (users, latest POs, invoices, logs)
+    regardless of page size, then assembles the responses in memory.
+    """
+    if not db_requests:
+        return []
+
+    request_ids = [r.id for r in db_requests]
+    requester_ids = {r.requester_id for r in db_requests}
+
+    users_result = await db.execute(select(User).filter(User.id.in_(requester_ids)))
+    users = {u.id: u for u in users_result.scalars().all()}
+
     # Step 6: Role-Based Visibility (Backend Enforced)
-    if user_role in ["PROCUREMENT_FINANCE", "FINANCE", "ADMIN"]:
-        # Fetch current PO
-        po_query = select(PurchaseOrder).filter(PurchaseOrder.asset_request_id == db_request.id).order_by(desc(PurchaseOrder.created_at))
+    full_view = user_role in PROCUREMENT_VIEW_ROLES
+    po_view = full_view or user_role == "IT_MANAGEMENT"
+
+    latest_pos = {}
+    if po_view:
+        # Latest PO per request (DISTINCT ON keeps the first row of each group)
+        po_query = (
+            select(PurchaseOrder)
+            .filter(PurchaseOrder.asset_request_id.in_(request_ids))
+            .distinct(PurchaseOrder.asset_request_id)
+            .order_by(PurchaseOrder.asset_request_id, desc(PurchaseOrder.created_at))
+        )
         po_result = await db.execute(po_query)
-        po = po_result.scalars().first()
-        
-        if po:
-            res.purchase_order = {
-                "id": po.id,
-                "vendor_name": po.vendor_name,
-                "total_cost": po.total_cost,
-                "status": po.status,
-                "po_pdf_path": po.po_pdf_path,
-                "extracted_data": po.extracted_data
-            }
-            
-            # Fetch Invoice linked to this PO
-            inv_query = select(PurchaseInvoice).filter(PurchaseInvoice.purchase_order_id == po.id)
+        latest_pos = {po.asset_request_id: po for po in po_result.scalars().all()}
+
+    invoices = {}
+    logs_by_request = defaultdict(list)
+    if full_view:
+        if latest_pos:
+            po_ids = [po.id for po in latest_pos.values()]
+            inv_query = (
+                select(PurchaseInvoice)
+                .filter(PurchaseInvoice.purchase_order_id.in_(po_ids))
+                .distinct(PurchaseInvoice.purchase_order_id)
+                .order_by(PurchaseInvoice.purchase_order_id, desc(PurchaseInvoice.created_at))
+            )
             inv_result = await db.execute(inv_query)
-            invoice = inv_result.scalars().first()
-            
-            if invoice:
-                res.purchase_invoice = {
-                    "purchase_date": invoice.purchase_date.isoformat() if invoice.purchase_date else None,
-                    "total_amount": invoice.total_amount,
-                    "invoice_pdf_path": invoice.invoice_pdf_path
-                }
-        
+            invoices = {inv.purchase_order_id: inv for inv in inv_result.scalars().all()}
+
         # Fetch detailed procurement logs
-        logs_query = select(ProcurementLog).filter(ProcurementLog.reference_id == db_request.id).order_by(desc(ProcurementLog.created_at))
+        logs_query = (
+            select(ProcurementLog)
+            .filter(ProcurementLog.reference_id.in_(request_ids))
+            .order_by(desc(ProcurementLog.created_at))
+        )
         logs_result = await db.execute(logs_query)
-        logs = logs_result.scalars().all()
-        
-        res.procurement_logs = [
-            {"action": l.action, "performed_by": l.performed_by, "timestamp": l.created_at.isoformat(), "metadata": l.metadata_} 
-            for l in logs
-        ]
-        
-    elif user_role == "IT_MANAGEMENT":
-        po_query = select(PurchaseOrder).filter(PurchaseOrder.asset_request_id == db_request.id)
-        po_result = await db.execute(po_query)
-        po = po_result.scalars().first()
-        if po:
+        for log in logs_result.scalars().all():
+            logs_by_request[log.reference_id].append(log)
+
+    responses = []
+    for db_request in db_requests:
+        res = AssetRequestResponse.model_validate(db_request)
+        user = users.get(db_request.requester_id)
+        if user:
+            res.requester_name = user.full_name
+            res.requester_email = user.email
+
+        po = latest_pos.get(db_request.id)
+        if full_view:
+            if po:
+                res.purchase_order = {
+                    "id": po.id,
+                    "vendor_name": po.vendor_name,
+                    "total_cost": po.total_cost,
+                    "status": po.status,
+                    "po_pdf_path": po.po_pdf_path,
+                    "extracted_data": po.extracted_data
+                }
+
+                invoice = invoices.get(po.id)
+                if invoice:
+                    res.purchase_invoice = {
+                        "purchase_date": invoice.purchase_date.isoformat() if invoice.purchase_date else None,
+                        "total_amount": invoice.total_amount,
+                        "invoice_pdf_path": invoice.invoice_pdf_path
+                    }
+
+            res.procurement_logs = [
+                {"action": l.action, "performed_by": l.performed_by, "timestamp": l.created_at.isoformat(), "metadata": l.metadata_}
+                for l in logs_by_request.get(db_request.id, [])
+            ]
+        elif po_view and po:
             res.purchase_order = {
                 "status": po.status,
                 "vendor_name": po.vendor_name
             }
-            
-    return res
+
+        responses.append(res)
+
+    return responses
 
 
 async def get_asset_request_by_id(db: AsyncSession, request_id: UUID, user_role: str = None) -> Optional[AssetRequestResponse]:
@@ -488,9 +534,4 @@ async def get_all_asset_requests(
     result = await db.execute(query)
     results = result.scalars().all()
     
-    response_list = []
-    for req in results:
-        res = await _populate_requester_info(db, req, user_role=user_role)
-        response_list.append(res)
-        
-    return response_list
+    return await _populate_requester_info_batch(db, results, user_role=user_role)
@@ -1,50 +1,184 @@
 """
 Asset service layer - Database operations using SQLAlchemy (Asynchronous)
 """
+import asyncio
+import time
 import uuid
+from collections import Counter
 from uuid import UUID
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Mapping, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, and_, select, delete, update
+from sqlalchemy import func, and_, select, delete, update, union_all, literal, null, cast, tuple_, String, Date, Float, Text
 from sqlalchemy.orm import selectinload
-from ..models.models import Asset, ByodDevice, User, AssetAssignment, AssetInventory
+from ..models.models import Asset, ByodDevice, User, AssetAssignment, AssetInventory, AuditLog
+from ..config.settings import settings
 from ..schemas.asset_schema import AssetCreate, AssetUpdate, AssetResponse
+from . import user_service
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.audit_sink import audit_sink
 
 
-async def get_all_assets(db: AsyncSession) -> List[AssetResponse]:
+# Columns that may be used to order the asset listing (all non-null in both union branches)
+ASSET_SORT_COLUMNS = {
+    "created_at": "datetime",
+    "updated_at": "datetime",
+    "name": "str",
+    "serial_number": "str",
+    "status": "str",
+    "type": "str",
+}
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _inventory_union():
     """
-    Get all assets from the database
+    Standard assets and BYOD devices projected onto the AssetResponse columns
+    and merged with UNION ALL, so listings can filter, sort and paginate both
+    sources in a single query.
     """
-    # 1. Fetch standard assets
-    result = await db.execute(select(Asset))
-    standard_assets = result.scalars().all()
-    results = [AssetResponse.model_validate(asset) for asset in standard_assets]
-    
-    # 2. Fetch BYOD devices and map them to AssetResponse
-    byod_query = select(ByodDevice, User).join(User, ByodDevice.owner_id == User.id)
-    byod_result = await db.execute(byod_query)
-    byods = byod_result.all()
-    
-    for byod, owner in byods:
-        results.append(AssetResponse(
-            id=byod.id,
-            name=f"BYOD: {byod.device_model}",
-            type="BYOD",
-            model=byod.device_model,
-            vendor="Personal",
-            serial_number=byod.serial_number,
-            status="Active",
-            assigned_to=owner.full_name,
-            location=owner.location or "Remote",
-            segment="IT",
-            specifications={"os_version": byod.os_version},
-            created_at=byod.created_at or datetime.now(),
-            updated_at=byod.created_at or datetime.now(),
-            assignment_date=(byod.created_at or datetime.now()).date()
-        ))
-        
-    return results
+    standard = select(
+        Asset.id.label("id"),
+        Asset.name.label("name"),
+        Asset.type.label("type"),
+        Asset.model.label("model"),
+        Asset.vendor.label("vendor"),
+        Asset.serial_number.label("serial_number"),
+        Asset.purchase_date.label("purchase_date"),
+        Asset.warranty_expiry.label("warranty_expiry"),
+        Asset.contract_expiry.label("contract_expiry"),
+        Asset.license_expiry.label("license_expiry"),
+        Asset.status.label("status"),
+        Asset.location.label("location"),
+        Asset.segment.label("segment"),
+        Asset.assigned_to.label("assigned_to"),
+        Asset.assigned_user_id.label("assigned_user_id"),
+        Asset.assigned_by.label("assigned_by"),
+        Asset.specifications.label("specifications"),
+        Asset.cost.label("cost"),
+        Asset.renewal_status.label("renewal_status"),
+        Asset.renewal_cost.label("renewal_cost"),
+        Asset.renewal_reason.label("renewal_reason"),
+        Asset.renewal_urgency.label("renewal_urgency"),
+        Asset.procurement_status.label("procurement_status"),
+        Asset.disposal_status.label("disposal_status"),
+        Asset.created_at.label("created_at"),
+        Asset.updated_at.label("updated_at"),
+        Asset.assignment_date.label("assignment_date"),
+    )
+
+    byod_created = func.coalesce(ByodDevice.created_at, func.now())
+    byod = select(
+        ByodDevice.id.label("id"),
+        literal("BYOD: ", String).concat(ByodDevice.device_model).label("name"),
+        literal("BYOD", String).label("type"),
+        ByodDevice.device_model.label("model"),
+        literal("Personal", String).label("vendor"),
+        ByodDevice.serial_number.label("serial_number"),
+        cast(null(), Date).label("purchase_date"),
+        cast(null(), Date).label("warranty_expiry"),
+        cast(null(), Date).label("contract_expiry"),
+        cast(null(), Date).label("license_expiry"),
+        literal("Active", String).label("status"),
+        func.coalesce(User.location, "Remote").label("location"),
+        literal("IT", String).label("segment"),
+        User.full_name.label("assigned_to"),
+        ByodDevice.owner_id.label("assigned_user_id"),
+        cast(null(), String).label("assigned_by"),
+        func.jsonb_build_object("os_version", ByodDevice.os_version).label("specifications"),
+        literal(0.0, Float).label("cost"),
+        cast(null(), String).label("renewal_status"),
+        cast(null(), Float).label("renewal_cost"),
+        cast(null(), Text).label("renewal_reason"),
+        cast(null(), String).label("renewal_urgency"),
+        cast(null(), String).label("procurement_status"),
+        cast(null(), String).label("disposal_status"),
+        byod_created.label("created_at"),
+        byod_created.label("updated_at"),
+        cast(byod_created, Date).label("assignment_date"),
+    ).join(User, ByodDevice.owner_id == User.id)
+
+    return union_all(standard, byod).subquery("inventory")
+
+
+async def get_assets_page_rows(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    asset_type: Optional[str] = None,
+    segment: Optional[str] = None,
+    location: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_dir: str = "desc",
+) -> Tuple[List[Mapping[str, Any]], Optional[str]]:
+    """
+    Get one keyset-paginated page of assets (standard + BYOD) as row mappings
+    with the AssetResponse columns, for serializing straight to JSON.
+    Returns the rows and an opaque cursor for the next page (None on the last page).
+    Raises ValueError for an unknown sort column/direction or a malformed cursor.
+    """
+    if sort_by not in ASSET_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by '{sort_by}'. Allowed: {', '.join(ASSET_SORT_COLUMNS)}")
+    if sort_dir not in ("asc", "desc"):
+        raise ValueError("sort_dir must be 'asc' or 'desc'")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    inventory = _inventory_union()
+    sort_col = inventory.c[sort_by]
+    query = select(inventory)
+
+    if status:
+        query = query.where(inventory.c.status == status)
+    if asset_type:
+        query = query.where(inventory.c.type == asset_type)
+    if segment:
+        query = query.where(inventory.c.segment == segment)
+    if location:
+        query = query.where(inventory.c.location == location)
+    if assigned_to:
+        query = query.where(await _assignee_filter(db, inventory, assigned_to))
+
+    anchor = decode_cursor(cursor, 2)
+    if anchor:
+        try:
+            sort_value = anchor[0]
+            if ASSET_SORT_COLUMNS[sort_by] == "datetime":
+                sort_value = datetime.fromisoformat(sort_value)
+            anchor_id = UUID(anchor[1])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        keyset = tuple_(sort_col, inventory.c.id)
+        if sort_dir == "asc":
+            query = query.where(keyset > tuple_(sort_value, anchor_id))
+        else:
+            query = query.where(keyset < tuple_(sort_value, anchor_id))
+
+    if sort_dir == "asc":
+        query = query.order_by(sort_col.asc(), inventory.c.id.asc())
+    else:
+        query = query.order_by(sort_col.desc(), inventory.c.id.desc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor([last[sort_by], last["id"]])
+    return rows, next_cursor
+
+
+async def get_assets_page(db: AsyncSession, **filters) -> Tuple[List[AssetResponse], Optional[str]]:
+    """
+    Same as get_assets_page_rows, with each row validated into an AssetResponse.
+    """
+    rows, next_cursor = await get_assets_page_rows(db, **filters)
+    return [AssetResponse.model_validate(dict(row)) for row in rows], next_cursor
 
 
 async def get_asset_by_id(db: AsyncSession, asset_id: UUID) -> Optional[AssetResponse]:
@@ -58,40 +192,26 @@ async def get_asset_by_id(db: AsyncSession, asset_id: UUID) -> Optional[AssetRes
     return None
 
 
+async def _assignee_filter(db: AsyncSession, inventory, assignee: str):
+    """
+    Filter on the indexed assigned_user_id (assets) / owner_id (BYOD) when
+    assignee (id, email or name) resolves to a user; otherwise fall back to
+    the lowercased assigned_to string.
+    """
+    user_id = await user_service.resolve_user_id(db, assignee)
+    if user_id:
+        return inventory.c.assigned_user_id == user_id
+    return func.lower(inventory.c.assigned_to) == assignee.strip().lower()
+
+
 async def get_assets_by_assigned_to(db: AsyncSession, user_name: str) -> List[AssetResponse]:
     """
-    Get all assets assigned to a specific user
+    Get all assets (standard + BYOD) assigned to a specific user
     """
-    # 1. Standard assets
-    standard_query = select(Asset).filter(func.lower(Asset.assigned_to) == user_name.lower())
-    standard_result = await db.execute(standard_query)
-    standard_assets = standard_result.scalars().all()
-    results = [AssetResponse.model_validate(asset) for asset in standard_assets]
-    
-    # 2. BYOD devices for this user
-    byod_query = select(ByodDevice, User).join(User, ByodDevice.owner_id == User.id).filter(func.lower(User.full_name) == user_name.lower())
-    byod_result = await db.execute(byod_query)
-    byods = byod_result.all()
-    
-    for byod, owner in byods:
-        results.append(AssetResponse(
-            id=byod.id,
-            name=f"BYOD: {byod.device_model}",
-            type="BYOD",
-            model=byod.device_model,
-            vendor="Personal",
-            serial_number=byod.serial_number,
-            status="Active",
-            assigned_to=owner.full_name,
-            location=owner.location or "Remote",
-            segment="IT",
-            specifications={"os_version": byod.os_version},
-            created_at=byod.created_at or datetime.now(),
-            updated_at=byod.created_at or datetime.now(),
-            assignment_date=(byod.created_at or datetime.now()).date()
-        ))
-        
-    return results
+    inventory = _inventory_union()
+    query = select(inventory).where(await _assignee_filter(db, inventory, user_name))
+    rows = (await db.execute(query)).mappings().all()
+    return [AssetResponse.model_validate(dict(row)) for row in rows]
 
 
 async def create_asset(db: AsyncSession, asset: AssetCreate) -> AssetResponse:
@@ -106,6 +226,7 @@ async def create_asset(db: AsyncSession, asset: AssetCreate) -> AssetResponse:
         id=uuid.uuid4(),
         **asset_dict
     )
+    db_asset.assigned_user_id = await user_service.resolve_user_id(db, db_asset.assigned_to)
     
     db.add(db_asset)
     
@@ -122,13 +243,20 @@ async def create_asset(db: AsyncSession, asset: AssetCreate) -> AssetResponse:
         
     await db.commit()
     await db.refresh(db_asset)
+    _stats_snapshot.apply_change(None, _stats_fields(db_asset))
     
     return AssetResponse.model_validate(db_asset)
 
 
-async def update_asset(db: AsyncSession, asset_id: UUID, asset_update: AssetUpdate) -> Optional[AssetResponse]:
+async def update_asset(
+    db: AsyncSession,
+    asset_id: UUID,
+    asset_update: AssetUpdate,
+    assigned_user_id: Optional[UUID] = None,
+) -> Optional[AssetResponse]:
     """
-    Update an existing asset in the database
+    Update an existing asset in the database.
+    assigned_user_id skips resolving a changed assigned_to when the caller already knows the user.
     """
     # Find the asset
     result = await db.execute(select(Asset).filter(Asset.id == asset_id))
@@ -139,12 +267,17 @@ async def update_asset(db: AsyncSession, asset_id: UUID, asset_update: AssetUpda
     # Update only provided fields
     update_data = asset_update.model_dump(exclude_unset=True)
     
+    stats_before = _stats_fields(db_asset)
+    
     # Track status change for Inventory management
     previous_status = db_asset.status
     new_status = update_data.get('status')
+    previous_renewal_status = db_asset.renewal_status
     
     for field, value in update_data.items():
         setattr(db_asset, field, value)
+    if "assigned_to" in update_data:
+        db_asset.assigned_user_id = assigned_user_id or await user_service.resolve_user_id(db, db_asset.assigned_to)
         
     # Inventory Management Logic
     if new_status and new_status != previous_status:
@@ -165,18 +298,46 @@ async def update_asset(db: AsyncSession, asset_id: UUID, asset_update: AssetUpda
         # 2. Leaving Stock (assigned, retired, repair, etc.)
         elif previous_status == "In Stock":
             await db.execute(delete(AssetInventory).where(AssetInventory.asset_id == asset_id))
+
+        # Status history (feeds the "repaired" trend)
+        audit_sink.record(
+            db,
+            entity_type="Asset",
+            entity_id=asset_id,
+            action="ASSET_STATUS_CHANGED",
+            details={"old_status": previous_status, "new_status": new_status},
+        )
+
+    # Renewal stage history (feeds the "renewed" trend)
+    if "renewal_status" in update_data and update_data["renewal_status"] != previous_renewal_status:
+        audit_sink.record(
+            db,
+            entity_type="Asset",
+            entity_id=asset_id,
+            action="RENEWAL_STATUS_CHANGED",
+            details={"old_renewal_status": previous_renewal_status, "new_renewal_status": update_data["renewal_status"]},
+        )
     
     await db.commit()
     await db.refresh(db_asset)
+    _stats_snapshot.apply_change(stats_before, _stats_fields(db_asset))
     
     return AssetResponse.model_validate(db_asset)
 
 
-async def assign_asset(db: AsyncSession, asset_id: UUID, user: str, location: str, assign_date: date) -> Optional[AssetResponse]:
+async def assign_asset(
+    db: AsyncSession,
+    asset_id: UUID,
+    user: str,
+    location: str,
+    assign_date: date,
+    assigned_user_id: Optional[UUID] = None,
+) -> Optional[AssetResponse]:
     """
     Assign an asset to a user and record in assignment history
     """
-    # 1. Update the Asset record
+    # 1. Resolve 'user' (ID, email or name) and update the Asset record
+    user_id = assigned_user_id or await user_service.resolve_user_id(db, user)
     updated_asset = await update_asset(
         db,
         asset_id,
@@ -185,34 +346,19 @@ async def assign_asset(db: AsyncSession, asset_id: UUID, user: str, location: st
             location=location,
             assignment_date=assign_date,
             status="Active"
-        )
+        ),
+        assigned_user_id=user_id,
     )
     
     # 2. Create Assignment History Record
     if updated_asset:
         try:
-            # Resolve 'user' string (Name or ID) to a User object
-            user_obj = None
-            
-            # Try as ID
-            try:
-                if isinstance(user, UUID) or (isinstance(user, str) and len(user) in [32, 36]):
-                    user_result = await db.execute(select(User).filter(User.id == user))
-                    user_obj = user_result.scalars().first()
-            except:
-                pass
-                
-            # Try as Name
-            if not user_obj:
-                user_name_result = await db.execute(select(User).filter(func.lower(User.full_name) == func.lower(user)))
-                user_obj = user_name_result.scalars().first()
-            
             # If User found, create assignment record
-            if user_obj:
+            if user_id:
                 # Check if active assignment already exists to avoid duplicates
                 exists_result = await db.execute(select(AssetAssignment).filter(
                     AssetAssignment.asset_id == asset_id,
-                    AssetAssignment.user_id == user_obj.id
+                    AssetAssignment.user_id == user_id
                 ))
                 exists = exists_result.scalars().first()
                 
@@ -220,7 +366,7 @@ async def assign_asset(db: AsyncSession, asset_id: UUID, user: str, location: st
                     assignment = AssetAssignment(
                         id=uuid.uuid4(),
                         asset_id=asset_id,
-                        user_id=user_obj.id,
+                        user_id=user_id,
                         assigned_by="System", 
                         location=location,
                         assigned_at=assign_date or datetime.now()
@@ -235,112 +381,185 @@ async def assign_asset(db: AsyncSession, asset_id: UUID, user: str, location: st
     return updated_asset
 
 
-async def get_asset_stats(db: AsyncSession):
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+QUARTERS = ["Q1", "Q2", "Q3", "Q4"]
+STATS_DIMENSIONS = ("location", "type", "segment", "status")
+
+
+def _warranty_at_risk(warranty_expiry: Optional[date]) -> bool:
+    """Warranty expired or expiring in the next 30 days"""
+    return warranty_expiry is not None and warranty_expiry <= date.today() + timedelta(days=30)
+
+
+def _stats_fields(asset: Asset) -> dict:
+    """The asset attributes the stats snapshot depends on"""
+    return {
+        "location": asset.location,
+        "type": asset.type,
+        "segment": asset.segment,
+        "status": asset.status,
+        "cost": asset.cost,
+        "warranty_expiry": asset.warranty_expiry,
+    }
+
+
+class AssetStatsSnapshot:
     """
-    Get aggregated statistics from the database
+    In-memory materialization of the dashboard stats.
+    Rebuilt with one aggregate query when older than the staleness bound, and
+    patched incrementally by the asset service when it creates/updates assets.
+    Writes that bypass the service are picked up at the next rebuild.
     """
-    # Total count
-    total = (await db.execute(select(func.count(Asset.id)))).scalar()
-    
-    # Status counts
-    active = (await db.execute(select(func.count(Asset.id)).filter(Asset.status == "Active"))).scalar()
-    in_stock = (await db.execute(select(func.count(Asset.id)).filter(Asset.status == "In Stock"))).scalar()
-    repair = (await db.execute(select(func.count(Asset.id)).filter(Asset.status == "Repair"))).scalar()
-    retired = (await db.execute(select(func.count(Asset.id)).filter(Asset.status == "Retired"))).scalar()
-    
-    # Warranty expiring soon (next 30 days) or expired
-    today = date.today()
-    warranty_cutoff = today + timedelta(days=30)
-    warranty_risk = (await db.execute(select(func.count(Asset.id)).filter(
-        and_(
-            Asset.warranty_expiry.isnot(None),
-            Asset.warranty_expiry <= warranty_cutoff
-        )
-    ))).scalar()
-    
-    # Total value
-    total_value_result = (await db.execute(select(func.sum(Asset.cost)))).scalar()
-    total_value = float(total_value_result) if total_value_result else 0.0
-    
-    # Location breakdown
-    location_results = (await db.execute(select(
-        Asset.location,
-        func.count(Asset.id).label('count')
-    ).group_by(Asset.location))).all()
-    by_location = [
-        {"name": loc or "Unknown", "value": count}
-        for loc, count in location_results
-    ]
-    
-    # Type breakdown
-    type_results = (await db.execute(select(
-        Asset.type,
-        func.count(Asset.id).label('count')
-    ).group_by(Asset.type))).all()
-    by_type = [
-        {"name": asset_type or "Unknown", "value": count}
-        for asset_type, count in type_results
-    ]
-    
-    # Segment breakdown
-    segment_results = (await db.execute(select(
-        Asset.segment,
-        func.count(Asset.id).label('count')
-    ).group_by(Asset.segment))).all()
-    by_segment = [
-        {"name": seg or "Unknown", "value": count}
-        for seg, count in segment_results
-    ]
-    
-    # Status breakdown
-    status_results = (await db.execute(select(
-        Asset.status,
-        func.count(Asset.id).label('count')
-    ).group_by(Asset.status))).all()
-    by_status = [
-        {"name": stat or "Unknown", "value": count}
-        for stat, count in status_results
-    ]
-    
-    # Trend Data Generation (Mock)
-    import random
-    import math
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    quarters = ["Q1", "Q2", "Q3", "Q4"]
-    
-    monthly_trends = []
-    for i, month in enumerate(months):
-        monthly_trends.append({
-            "name": month,
-            "repaired": int(5 + 3 * math.sin(i * 0.5) + random.randint(0, 3)),
-            "renewed": int(8 + 4 * math.cos(i * 0.5) + random.randint(0, 5))
-        })
-    
-    quarterly_trends = []
-    for i, q in enumerate(quarters):
-        quarterly_trends.append({
-            "name": q,
-            "repaired": int(15 + 5 * math.sin(i * 1.5) + random.randint(2, 5)),
-            "renewed": int(25 + 8 * math.cos(i * 1.5) + random.randint(3, 8))
-        })
-    
-    return {
-        "total": total,
-        "total_value": total_value,
-        "active": active,
-        "in_stock": in_stock,
-        "repair": repair,
-        "retired": retired,
-        "warranty_risk": warranty_risk,
-        "by_location": by_location,
-        "by_type": by_type,
-        "by_segment": by_segment,
-        "by_status": by_status,
-        "trends": {
-            "monthly": monthly_trends,
-            "quarterly": quarterly_trends
+
+    def __init__(self, max_staleness_seconds: int):
+        self.max_staleness_seconds = max_staleness_seconds
+        self.refreshed_at = 0.0
+        self.total = 0
+        self.total_value = 0.0
+        self.warranty_risk = 0
+        self.breakdowns = {dim: Counter() for dim in STATS_DIMENSIONS}
+        self.trends = {"monthly": [], "quarterly": []}
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return self.refreshed_at > 0 and time.monotonic() - self.refreshed_at < self.max_staleness_seconds
+
+    def invalidate(self):
+        self.refreshed_at = 0.0
+
+    async def get(self, db: AsyncSession) -> dict:
+        if not self.is_fresh():
+            async with self._lock:
+                if not self.is_fresh():
+                    await self.refresh(db)
+        return self.as_dict()
+
+    async def refresh(self, db: AsyncSession):
+        """Recompute the whole snapshot: one GROUPING SETS query plus one trends query"""
+        cutoff = date.today() + timedelta(days=30)
+        dims = [getattr(Asset, dim) for dim in STATS_DIMENSIONS]
+        query = select(
+            *dims,
+            *[func.grouping(col).label(f"g_{col.key}") for col in dims],
+            func.count(Asset.id).label("count"),
+            func.count(Asset.id).filter(Asset.warranty_expiry <= cutoff).label("warranty_risk"),
+            func.coalesce(func.sum(Asset.cost), 0.0).label("total_value"),
+        ).group_by(func.grouping_sets(*[tuple_(col) for col in dims]))
+        rows = (await db.execute(query)).mappings().all()
+
+        breakdowns = {dim: Counter() for dim in STATS_DIMENSIONS}
+        total = 0
+        total_value = 0.0
+        warranty_risk = 0
+        for row in rows:
+            for dim in STATS_DIMENSIONS:
+                if row[f"g_{dim}"] == 0:
+                    breakdowns[dim][row[dim]] += row["count"]
+                    # Every asset falls in exactly one status group, so the status
+                    # grouping set doubles as the grand total.
+                    if dim == "status":
+                        total += row["count"]
+                        total_value += float(row["total_value"] or 0.0)
+                        warranty_risk += row["warranty_risk"]
+                    break
+
+        self.trends = await _compute_trends(db)
+        self.breakdowns = breakdowns
+        self.total = total
+        self.total_value = total_value
+        self.warranty_risk = warranty_risk
+        self.refreshed_at = time.monotonic()
+
+    def apply_change(self, before: Optional[dict], after: Optional[dict]):
+        """Patch the snapshot for one asset moving from `before` to `after` (None = absent)"""
+        if not self.refreshed_at:
+            return
+        for fields, sign in ((before, -1), (after, 1)):
+            if not fields:
+                continue
+            self.total += sign
+            self.total_value += sign * float(fields.get("cost") or 0.0)
+            if _warranty_at_risk(fields.get("warranty_expiry")):
+                self.warranty_risk += sign
+            for dim in STATS_DIMENSIONS:
+                self.breakdowns[dim][fields.get(dim)] += sign
+
+    def as_dict(self) -> dict:
+        def breakdown(dim):
+            return [
+                {"name": key or "Unknown", "value": count}
+                for key, count in self.breakdowns[dim].items()
+                if count > 0
+            ]
+
+        by_status = self.breakdowns["status"]
+        return {
+            "total": self.total,
+            "total_value": self.total_value,
+            "active": by_status.get("Active", 0),
+            "in_stock": by_status.get("In Stock", 0),
+            "repair": by_status.get("Repair", 0),
+            "retired": by_status.get("Retired", 0),
+            "warranty_risk": self.warranty_risk,
+            "by_location": breakdown("location"),
+            "by_type": breakdown("type"),
+            "by_segment": breakdown("segment"),
+            "by_status": breakdown("status"),
+            "trends": self.trends,
         }
-    }
+
+
+# Last stage of the /workflows/review renewal flow
+RENEWAL_COMPLETED_STATUS = "Commercial_Approved"
+
+
+async def _compute_trends(db: AsyncSession) -> dict:
+    """
+    Monthly/quarterly trends for the current year from the asset audit history:
+    - repaired: status changes that moved an asset into Repair
+    - renewed: renewals that reached the final approval stage
+    """
+    year_start = datetime(date.today().year, 1, 1)
+    month = func.extract("month", AuditLog.timestamp)
+    repaired = select(
+        literal("repaired", String).label("kind"),
+        month.label("month"),
+        func.count(AuditLog.id).label("count"),
+    ).where(
+        AuditLog.timestamp >= year_start,
+        AuditLog.entity_type == "Asset",
+        AuditLog.details["new_status"].astext == "Repair",
+    ).group_by(month)
+    renewed = select(
+        literal("renewed", String).label("kind"),
+        month.label("month"),
+        func.count(AuditLog.id).label("count"),
+    ).where(
+        AuditLog.timestamp >= year_start,
+        AuditLog.action == "RENEWAL_STATUS_CHANGED",
+        AuditLog.details["new_renewal_status"].astext == RENEWAL_COMPLETED_STATUS,
+    ).group_by(month)
+
+    monthly = [{"name": month, "repaired": 0, "renewed": 0} for month in MONTHS]
+    for kind, month, count in (await db.execute(union_all(repaired, renewed))).all():
+        monthly[int(month) - 1][kind] = count
+
+    quarterly = [{"name": q, "repaired": 0, "renewed": 0} for q in QUARTERS]
+    for i, entry in enumerate(monthly):
+        quarterly[i // 3]["repaired"] += entry["repaired"]
+        quarterly[i // 3]["renewed"] += entry["renewed"]
+
+    return {"monthly": monthly, "quarterly": quarterly}
+
+
+_stats_snapshot = AssetStatsSnapshot(settings.ASSET_STATS_MAX_STALENESS_SECONDS)
+
+
+async def get_asset_stats(db: AsyncSession):
+    """
+    Get aggregated dashboard statistics, served from the in-memory snapshot
+    """
+    return await _stats_snapshot.get(db)
 
 
 async def get_asset_events(db: AsyncSession, asset_id: UUID) -> List[dict]:
@@ -0,0 +1,184 @@
+"""
+Audit partition service - Monthly range partitions and retention for system.audit_logs (Asynchronous)
+"""
+import asyncio
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from ..database.database import AsyncSessionLocal
+from ..config.settings import settings
+
+PARENT_TABLE = "system.audit_logs"
+# Catches rows outside every monthly range; ensure_partitions drains it into monthly partitions
+DEFAULT_PARTITION = "audit_logs_default"
+COLUMNS = "id, entity_type, entity_id, action, performed_by, details, timestamp"
+ARCHIVE_SCHEMA = "audit_archive"
+PARTITION_NAME_RE = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+
+# Arbitrary constant so only one worker runs maintenance at a time
+MAINTENANCE_LOCK_ID = 7_140_001
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_{month.year:04d}_{month.month:02d}"
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    result = await db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {"table": PARENT_TABLE})
+    return bool(result.scalar())
+
+
+async def list_partitions(db: AsyncSession) -> List[str]:
+    result = await db.execute(text(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+        ORDER BY child.relname
+        """
+    ), {"table": PARENT_TABLE})
+    return list(result.scalars().all())
+
+
+async def default_partition_months(db: AsyncSession) -> List[date]:
+    """Months that have rows waiting in the DEFAULT partition"""
+    result = await db.execute(text(
+        f"SELECT DISTINCT date_trunc('month', timestamp)::date FROM system.{DEFAULT_PARTITION}"
+    ))
+    return list(result.scalars().all())
+
+
+async def create_partition(db: AsyncSession, month: date) -> str:
+    """
+    Create one monthly partition. Rows for that month sitting in the DEFAULT
+    partition would make CREATE ... PARTITION OF fail, so the partition is built
+    as a plain table, those rows are moved into it, and then it is attached.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    # Identifiers and bounds come from partition_name() / dates, never from user input
+    await db.execute(text(f"CREATE TABLE system.{name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    await db.execute(text(
+        f"WITH moved AS (DELETE FROM system.{DEFAULT_PARTITION} "
+        f"WHERE timestamp >= '{start}' AND timestamp < '{end}' RETURNING {COLUMNS}) "
+        f"INSERT INTO system.{name} ({COLUMNS}) SELECT {COLUMNS} FROM moved"
+    ))
+    await db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION system.{name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+    return name
+
+
+async def ensure_partitions(db: AsyncSession, months_ahead: Optional[int] = None, from_month: Optional[date] = None) -> List[str]:
+    """
+    Make sure the DEFAULT partition exists, then create monthly partitions from
+    from_month (default: current month) through months_ahead future months, plus
+    one for every month that has rows in the DEFAULT partition (moving them over).
+    Returns the names of partitions created. The caller commits.
+    """
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_PARTITION_MONTHS_AHEAD
+    if not await is_partitioned(db):
+        return []
+
+    existing = set(await list_partitions(db))
+    created = []
+    if DEFAULT_PARTITION not in existing:
+        await db.execute(text(f"CREATE TABLE IF NOT EXISTS system.{DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+
+    months = set(await default_partition_months(db))
+    month = month_start(from_month or datetime.now(timezone.utc).date())
+    last = add_months(month_start(datetime.now(timezone.utc).date()), months_ahead)
+    while month <= last:
+        months.add(month)
+        month = add_months(month, 1)
+
+    for month in sorted(months):
+        if partition_name(month) not in existing:
+            created.append(await create_partition(db, month))
+    return created
+
+
+async def apply_retention(db: AsyncSession, retention_months: Optional[int] = None, mode: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Detach partitions that lie entirely before the retention cutoff, then drop
+    them or move them to the audit_archive schema. No row-level DELETEs.
+    The caller commits.
+    """
+    if retention_months is None:
+        retention_months = settings.AUDIT_RETENTION_MONTHS
+    if mode is None:
+        mode = settings.AUDIT_RETENTION_MODE
+    if mode not in ("archive", "drop"):
+        raise ValueError("Retention mode must be 'archive' or 'drop'")
+    if retention_months <= 0 or not await is_partitioned(db):
+        return {"archived": [], "dropped": []}
+
+    cutoff = add_months(month_start(datetime.now(timezone.utc).date()), -retention_months)
+    expired = []
+    for name in await list_partitions(db):
+        match = PARTITION_NAME_RE.match(name)
+        if match and date(int(match.group(1)), int(match.group(2)), 1) < cutoff:
+            expired.append(name)
+
+    archived, dropped = [], []
+    if mode == "archive" and expired:
+        await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    for name in expired:
+        await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION system.{name}"))
+        if mode == "archive":
+            await db.execute(text(f"ALTER TABLE system.{name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            archived.append(name)
+        else:
+            await db.execute(text(f"DROP TABLE system.{name}"))
+            dropped.append(name)
+    return {"archived": archived, "dropped": dropped}
+
+
+async def run_maintenance(db: AsyncSession) -> Dict[str, List[str]]:
+    """
+    Create upcoming partitions and apply retention in one transaction,
+    guarded by an advisory lock so only one worker does it at a time.
+    """
+    locked = (await db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": MAINTENANCE_LOCK_ID})).scalar()
+    if not locked:
+        await db.rollback()
+        return {"created": [], "archived": [], "dropped": []}
+    try:
+        created = await ensure_partitions(db)
+        retention = await apply_retention(db)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return {"created": created, **retention}
+
+
+async def run_partition_maintainer():
+    """
+    Background loop: keep future audit partitions created and expire old ones.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await run_maintenance(db)
+            if any(result.values()):
+                print(f"[AUDIT PARTITIONS] {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[AUDIT PARTITIONS] Maintenance failed: {e}")
+        await asyncio.sleep(settings.AUDIT_PARTITION_MAINTENANCE_SECONDS)
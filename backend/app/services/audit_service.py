@@ -0,0 +1,71 @@
+"""
+Audit service - Keyset-paginated access to system audit logs (Asynchronous)
+"""
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import tuple_
+from ..models.models import AuditLog
+from ..utils.pagination import encode_cursor, decode_cursor
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+async def get_audit_logs_page(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+    offset: int = 0,
+    filters: Sequence[Any] = (),
+) -> Tuple[List[AuditLog], Optional[str]]:
+    """
+    Newest-first page of audit logs, keyed on (timestamp, id).
+    since/until bound the timestamp so only the matching monthly partitions are scanned.
+    filters are extra conditions, e.g. details predicates from spec_query_service.
+    Returns the rows and an opaque cursor for the next page (None on the last page).
+    Raises ValueError for a malformed cursor.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = select(AuditLog).filter(*filters)
+
+    if entity_type:
+        query = query.filter(AuditLog.entity_type == entity_type)
+    if action:
+        query = query.filter(AuditLog.action == action)
+    if since:
+        query = query.filter(AuditLog.timestamp >= since)
+    if until:
+        query = query.filter(AuditLog.timestamp < until)
+
+    keyset = tuple_(AuditLog.timestamp, AuditLog.id)
+    anchor = decode_cursor(cursor, 2)
+    if anchor:
+        try:
+            anchor_timestamp = datetime.fromisoformat(anchor[0])
+            anchor_id = str(anchor[1])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        query = query.filter(keyset < tuple_(anchor_timestamp, anchor_id))
+    elif after_id:
+        # Legacy anchor by id: resolved inside the same statement
+        anchor_row = select(AuditLog.timestamp, AuditLog.id).filter(AuditLog.id == after_id).subquery()
+        query = query.filter(keyset < select(anchor_row.c.timestamp, anchor_row.c.id).scalar_subquery())
+    elif offset:
+        query = query.offset(offset)
+
+    query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor([rows[-1].timestamp, rows[-1].id])
+    return rows, next_cursor
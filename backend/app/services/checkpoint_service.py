@@ -0,0 +1,40 @@
+"""
+Checkpoint service - Named high-water marks for incremental background scans (Asynchronous)
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..models.models import SyncCheckpoint
+
+
+async def get_checkpoint(db: AsyncSession, name: str) -> Optional[SyncCheckpoint]:
+    result = await db.execute(select(SyncCheckpoint).filter(SyncCheckpoint.name == name))
+    return result.scalars().first()
+
+
+async def save_checkpoint(
+    db: AsyncSession,
+    name: str,
+    last_timestamp: Optional[datetime] = None,
+    cursor: Optional[Dict[str, Any]] = None
+):
+    """
+    Upsert a checkpoint. The caller commits, normally together with the work it covers.
+    """
+    stmt = pg_insert(SyncCheckpoint).values(name=name, last_timestamp=last_timestamp, cursor=cursor)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncCheckpoint.name],
+        set_={
+            "last_timestamp": stmt.excluded.last_timestamp,
+            "cursor": stmt.excluded.cursor,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def reset_checkpoint(db: AsyncSession, name: str):
+    await save_checkpoint(db, name, None, None)
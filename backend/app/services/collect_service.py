@@ -0,0 +1,218 @@
+"""
+Collect service layer - Maps agent telemetry payloads onto assets and ingests them in bulk (Asynchronous)
+"""
+import json
+import math
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, case, func, insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..models.models import Asset, AuditLog
+from ..config.settings import settings
+from . import user_service
+
+# Rows per INSERT statement (keeps bind parameters well under the Postgres limit)
+UPSERT_CHUNK_SIZE = 1000
+
+
+def map_collect_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map an agent payload onto Asset column values.
+    """
+    asset_metadata = data.get("asset_metadata") or {}
+    hardware = data.get("hardware") or {}
+    return {
+        "serial_number": str(data.get("serial_number")).strip(),
+        "name": data.get("hostname") or data.get("name", "Unknown"),
+        "type": data.get("type") or asset_metadata.get("type", "Unknown"),
+        "model": data.get("model") or hardware.get("model") or "Unknown",
+        "vendor": data.get("vendor") or data.get("manufacturer") or hardware.get("manufacturer") or "Unknown",
+        "segment": data.get("segment") or asset_metadata.get("segment", "IT"),
+        "location": data.get("location") or asset_metadata.get("location"),
+        "status": data.get("status", "Active"),
+        "assigned_to": data.get("assigned_to"),
+        "specifications": {
+            "hardware": hardware,
+            "os": data.get("os", {}),
+            "network": data.get("network", {})
+        },
+        "cost": data.get("cost", 0.0),
+    }
+
+
+def collect_row_error(row: Dict[str, Any]) -> Optional[str]:
+    """
+    Check a mapped row against the Asset columns (type, NOT NULL, length) so one bad
+    payload is reported on its own instead of failing the whole batch statement.
+    Normalises cost to a float. Returns an error message, or None if the row is valid.
+    """
+    for name, value in row.items():
+        column = Asset.__table__.c.get(name)
+        if column is None or not isinstance(column.type, String):
+            continue
+        if value is None:
+            if not column.nullable:
+                return f"{name} is required"
+        elif not isinstance(value, str):
+            return f"{name} must be a string"
+        elif column.type.length and len(value) > column.type.length:
+            return f"{name} is longer than {column.type.length} characters"
+
+    cost = row.get("cost")
+    if cost is not None:
+        if isinstance(cost, bool):
+            return "cost must be a number"
+        try:
+            cost = float(cost)
+        except (TypeError, ValueError):
+            return "cost must be a number"
+        if not math.isfinite(cost):
+            return "cost must be a finite number"
+        row["cost"] = cost
+    return None
+
+
+def parse_batch_body(body: bytes, content_type: Optional[str], content_encoding: Optional[str]) -> List[Any]:
+    """
+    Decode a batch collect body into a list of payloads.
+    Accepts a JSON array, {"items": [...]}, or JSON lines, optionally gzip-compressed.
+    Raises ValueError on malformed or oversized input.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    content_encoding = (content_encoding or "").strip().lower()
+    max_bytes = settings.COLLECT_BATCH_MAX_BYTES
+
+    if content_encoding == "gzip" or content_type in ("application/gzip", "application/x-gzip"):
+        # Bounded decompression so a small gzip bomb cannot exhaust memory
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(body, max_bytes + 1)
+        except zlib.error as e:
+            raise ValueError(f"Invalid gzip body: {e}")
+        if len(body) > max_bytes or decompressor.unconsumed_tail:
+            raise ValueError(f"Decompressed body exceeds {max_bytes} bytes")
+    elif len(body) > max_bytes:
+        raise ValueError(f"Body exceeds {max_bytes} bytes")
+
+    text = body.decode("utf-8")
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/json-lines"):
+        items = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_no}: {e}")
+    else:
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON body: {e}")
+        items = parsed.get("items") if isinstance(parsed, dict) else parsed
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array or an object with an 'items' array")
+
+    if len(items) > settings.COLLECT_BATCH_MAX_ITEMS:
+        raise ValueError(f"Batch exceeds {settings.COLLECT_BATCH_MAX_ITEMS} items")
+    return items
+
+
+async def ingest_batch(db: AsyncSession, items: List[Any], source: str, remote_ip: str) -> Dict[str, Any]:
+    """
+    Upsert a batch of agent payloads with INSERT ... ON CONFLICT (serial_number) DO UPDATE
+    and record one DATA_COLLECT audit row per accepted item in a multi-row INSERT.
+    Returns per-item results in input order.
+    """
+    batch_id = str(uuid.uuid4())
+    results: List[Dict[str, Any]] = [None] * len(items)
+    rows_by_serial: Dict[str, Dict[str, Any]] = {}
+    indexes_by_serial: Dict[str, List[int]] = {}
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {"index": index, "status": "error", "message": "Item must be a JSON object"}
+            continue
+        if not item.get("serial_number") or not str(item.get("serial_number")).strip():
+            results[index] = {"index": index, "status": "error", "message": "Missing serial_number"}
+            continue
+        nested = next((key for key in ("asset_metadata", "hardware") if item.get(key) and not isinstance(item[key], dict)), None)
+        if nested:
+            results[index] = {"index": index, "status": "error", "message": f"{nested} must be a JSON object"}
+            continue
+        row = map_collect_payload(item)
+        error = collect_row_error(row)
+        if error:
+            results[index] = {"index": index, "serial_number": row["serial_number"], "status": "error", "message": error}
+            continue
+        # A statement cannot update the same row twice: the last payload per serial wins
+        rows_by_serial[row["serial_number"]] = {**row, "id": uuid.uuid4(), "_payload": item}
+        indexes_by_serial.setdefault(row["serial_number"], []).append(index)
+
+    rows = list(rows_by_serial.values())
+    # One lookup resolves every assignee in the batch to a user id
+    resolved = await user_service.resolve_user_ids(db, [row["assigned_to"] for row in rows])
+    for row in rows:
+        row["assigned_user_id"] = resolved.get(str(row["assigned_to"] or "").strip().lower())
+
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+        stmt = pg_insert(Asset).values([{k: v for k, v in row.items() if k != "_payload"} for row in chunk])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Asset.serial_number],
+            set_={
+                "name": stmt.excluded.name,
+                "type": stmt.excluded.type,
+                "model": stmt.excluded.model,
+                "vendor": stmt.excluded.vendor,
+                "segment": stmt.excluded.segment,
+                "status": stmt.excluded.status,
+                "specifications": stmt.excluded.specifications,
+                "location": func.coalesce(stmt.excluded.location, Asset.location),
+                "assigned_to": func.coalesce(stmt.excluded.assigned_to, Asset.assigned_to),
+                "assigned_user_id": case(
+                    (stmt.excluded.assigned_to.isnot(None), stmt.excluded.assigned_user_id),
+                    else_=Asset.assigned_user_id,
+                ),
+                "updated_at": func.now(),
+            },
+        ).returning(Asset.id, Asset.serial_number, literal_column("(xmax = 0)").label("inserted"))
+        upserted = (await db.execute(stmt)).all()
+
+        for asset_id, serial_number, inserted in upserted:
+            indexes = indexes_by_serial[serial_number]
+            for position, index in enumerate(indexes):
+                results[index] = {
+                    "index": index,
+                    "serial_number": serial_number,
+                    "asset_id": str(asset_id),
+                    # Earlier payloads for the same serial were superseded within the batch
+                    "status": ("created" if inserted else "updated") if position == len(indexes) - 1 else "duplicate",
+                }
+
+        await db.execute(insert(AuditLog).values([
+            {
+                "id": str(uuid.uuid4()),
+                "entity_type": "API",
+                "entity_id": "collect_batch",
+                "action": "DATA_COLLECT",
+                "performed_by": source,
+                "details": {**row["_payload"], "batch_id": batch_id, "remote_ip": remote_ip, "auth_success": True},
+            }
+            for row in chunk
+        ]))
+
+    await db.commit()
+
+    summary = {"created": 0, "updated": 0, "duplicate": 0, "error": 0}
+    for result in results:
+        summary[result["status"]] += 1
+    return {
+        "status": "success",
+        "batch_id": batch_id,
+        "received": len(items),
+        **summary,
+        "results": results,
+    }
@@ -1,130 +1,382 @@
 """
 Exit service layer - Handles user offboarding, asset return, and inventory reintegration (Asynchronous).
 """
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import uuid
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from ..models.models import User, Asset, AssetAssignment, AssetInventory, ByodDevice, AuditLog
+from sqlalchemy import Boolean, Date, DateTime, String, any_, cast, column, func, insert, literal, null, text, union_all, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from ..models.models import User, Asset, AssetAssignment, AssetInventory, ByodDevice, ExitRequest
+from ..utils.principal_cache import invalidate_principal
+from ..utils.audit_sink import audit_sink
+from ..config.settings import settings
+
+# Rows per multi-row INSERT into exit.exit_requests
+EXIT_INSERT_BATCH_SIZE = 500
+
+
+def assigned_to_user(user: User):
+    """Indexed filter for assets directly assigned to user (see Asset.assigned_user_id)"""
+    return Asset.assigned_user_id == user.id
+
+
+async def build_exit_snapshots(db: AsyncSession, users: Sequence[User]) -> Dict[UUID, Tuple[List[Dict], List[Dict]]]:
+    """
+    Asset and BYOD snapshots for many users with two queries in total:
+    direct assignments (assigned_user_id) UNION ALL assignment history
+    LEFT JOIN assets, then BYOD.
+    Returns {user_id: (assets_snapshot, byod_snapshot)}; direct assignments
+    come first and each asset appears once per user.
+    """
+    if not users:
+        return {}
+    user_ids = [u.id for u in users]
+
+    direct = (
+        select(
+            Asset.assigned_user_id.label("user_id"),
+            Asset.id.label("asset_id"),
+            Asset.name.label("asset_name"),
+            Asset.type.label("asset_type"),
+            Asset.location.label("location"),
+            Asset.assignment_date.label("assigned_on"),
+            cast(null(), DateTime(timezone=True)).label("assigned_at"),
+            literal(0).label("source"),
+        )
+        .where(Asset.assigned_user_id.in_(user_ids))
+    )
+    history = (
+        select(
+            AssetAssignment.user_id,
+            AssetAssignment.asset_id,
+            func.coalesce(Asset.name, "Unknown Asset"),
+            func.coalesce(Asset.type, "Unknown"),
+            AssetAssignment.location,
+            cast(null(), Date),
+            AssetAssignment.assigned_at,
+            literal(1),
+        )
+        .outerjoin(Asset, Asset.id == AssetAssignment.asset_id)
+        .where(AssetAssignment.user_id.in_(user_ids))
+    )
+    combined = union_all(direct, history).subquery("exit_assets")
+    rows = (await db.execute(
+        select(combined).order_by(combined.c.user_id, combined.c.source)
+    )).mappings().all()
+
+    snapshots: Dict[UUID, Tuple[List[Dict], List[Dict]]] = {uid: ([], []) for uid in user_ids}
+    seen = set()
+    for row in rows:
+        if (row["user_id"], row["asset_id"]) in seen:
+            continue
+        seen.add((row["user_id"], row["asset_id"]))
+        assigned = row["assigned_on"] or row["assigned_at"]
+        snapshots[row["user_id"]][0].append({
+            "asset_id": str(row["asset_id"]),
+            "asset_name": row["asset_name"],
+            "asset_type": row["asset_type"],
+            "location": row["location"],
+            "assigned_at": assigned.isoformat() if assigned else None,
+        })
+
+    byod_result = await db.execute(select(ByodDevice).filter(ByodDevice.owner_id.in_(user_ids)))
+    for d in byod_result.scalars().all():
+        snapshots[d.owner_id][1].append({
+            "device_id": str(d.id),
+            "device_model": d.device_model,
+            "os_version": d.os_version,
+            "serial_number": d.serial_number,
+            "compliance_status": d.compliance_status,
+        })
+    return snapshots
+
+
+async def initiate_exits(db: AsyncSession, users: Sequence[User]) -> List[Dict[str, Any]]:
+    """
+    Mark users EXITING and open one exit request each, with snapshots built
+    set-based and the requests written in multi-row INSERTs. The caller commits
+    and then invalidates the principals.
+    """
+    if not users:
+        return []
+    snapshots = await build_exit_snapshots(db, users)
+
+    await db.execute(
+        update(User)
+        .where(User.id.in_([u.id for u in users]))
+        .values(status="EXITING")
+        .execution_options(synchronize_session="fetch")
+    )
+
+    rows = []
+    for u in users:
+        assets_snapshot, byod_snapshot = snapshots[u.id]
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "user_id": str(u.id),
+            "status": "OPEN",
+            "assets_snapshot": assets_snapshot,
+            "byod_snapshot": byod_snapshot,
+        })
+    for start in range(0, len(rows), EXIT_INSERT_BATCH_SIZE):
+        await db.execute(insert(ExitRequest).values(rows[start:start + EXIT_INSERT_BATCH_SIZE]))
+
+    return [
+        {
+            "exit_request_id": row["id"],
+            "user_id": row["user_id"],
+            "assets": len(row["assets_snapshot"]),
+            "byod_devices": len(row["byod_snapshot"]),
+        }
+        for row in rows
+    ]
+
+
+# QC outcome -> (asset status, inventory status, available for allocation); anything else counts as PASSED
+QC_TRANSITIONS = {
+    "PASSED": ("In Stock", "Available", True),
+    "FAILED": ("Repair", "Repair", False),
+    "EOL": ("Scrap", "Scrap", False),
+}
+QC_SUMMARY_KEYS = {"PASSED": "returned_to_inventory", "FAILED": "sent_for_repair", "EOL": "scrapped"}
+
+
+def snapshot_ids(snapshot: Optional[List[Dict]], key: str) -> List[UUID]:
+    """UUIDs stored under `key` in an exit request snapshot (malformed entries skipped)"""
+    ids = []
+    for entry in snapshot or []:
+        try:
+            ids.append(UUID(str(entry.get(key))))
+        except (AttributeError, ValueError):
+            continue
+    return ids
+
+
+def any_id(ids: Sequence[UUID]):
+    """One uuid[] bind for `= ANY(...)`, whatever the number of ids"""
+    return any_(literal(list(ids), ARRAY(PG_UUID(as_uuid=True))))
+
+
+def _batches(rows: List, size: Optional[int] = None):
+    size = size or settings.EXIT_BULK_BATCH_SIZE
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def bound_transaction(db: AsyncSession):
+    """
+    Cap lock waits and statement time for the rest of the current transaction,
+    so a large offboarding fails and rolls back instead of holding locks open.
+    """
+    await db.execute(text(f"SET LOCAL lock_timeout = {int(settings.EXIT_LOCK_TIMEOUT_MS)}"))
+    await db.execute(text(f"SET LOCAL statement_timeout = {int(settings.EXIT_STATEMENT_TIMEOUT_MS)}"))
+
+
+async def return_assets(
+    db: AsyncSession,
+    where,
+    actor_id: Optional[UUID] = None,
+    user_id: Optional[UUID] = None,
+    qc_results: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Return every asset matching `where` to inventory according to its QC outcome,
+    set-based: one locking SELECT, one prefetch of inventory rows, then
+    UPDATE ... FROM (VALUES ...) for assets and inventory, multi-row INSERTs for
+    missing inventory rows and for the audit log. The caller commits.
+    """
+    qc_results = qc_results or {}
+    summary = {"returned_to_inventory": 0, "sent_for_repair": 0, "scrapped": 0, "processed_ids": []}
+
+    # Lock in id order so concurrent offboardings cannot deadlock
+    assets = (await db.execute(
+        select(Asset.id, Asset.status, Asset.location)
+        .where(where)
+        .order_by(Asset.id)
+        .with_for_update()
+    )).all()
+    if not assets:
+        return summary
+
+    stocked = set((await db.execute(
+        select(AssetInventory.asset_id).where(AssetInventory.asset_id == any_id([a.id for a in assets]))
+    )).scalars().all())
+
+    now = datetime.now(timezone.utc)
+    transitions, new_inventory, events = [], [], []
+    for asset in assets:
+        qc_outcome = qc_results.get(str(asset.id)) or qc_results.get(asset.id) or "PASSED"
+        if qc_outcome not in QC_TRANSITIONS:
+            qc_outcome = "PASSED"
+        new_status, inventory_status, availability = QC_TRANSITIONS[qc_outcome]
+        summary[QC_SUMMARY_KEYS[qc_outcome]] += 1
+        summary["processed_ids"].append(asset.id)
+
+        transitions.append((asset.id, new_status, inventory_status, availability, asset.location))
+        if asset.id not in stocked:
+            new_inventory.append({
+                "id": uuid.uuid4(),
+                "asset_id": asset.id,
+                "location": asset.location,
+                "status": inventory_status,
+                "availability_flag": availability,
+                "last_checked_at": now,
+            })
+        events.append({
+            "entity_type": "Asset",
+            "entity_id": asset.id,
+            "action": "ASSET_RETURNED_ON_EXIT",
+            "performed_by": actor_id,
+            "details": {
+                "old_status": asset.status,
+                "new_status": new_status,
+                "qc_outcome": qc_outcome,
+                "user_id": str(user_id) if user_id else None,
+                "reason": "User Exit/Resignation",
+            },
+        })
+
+    for chunk in _batches(transitions):
+        moves = values(
+            column("asset_id", PG_UUID(as_uuid=True)),
+            column("status", String),
+            column("inventory_status", String),
+            column("availability", Boolean),
+            column("location", String),
+            name="exit_moves",
+        ).data(chunk)
+        await db.execute(
+            update(Asset)
+            .where(Asset.id == moves.c.asset_id)
+            .values(
+                status=moves.c.status,
+                assigned_to=None,
+                assigned_user_id=None,
+                assigned_by=None,
+                assignment_date=None,
+                disposal_status="WIPE_PENDING",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(AssetInventory)
+            .where(AssetInventory.asset_id == moves.c.asset_id)
+            .values(
+                status=moves.c.inventory_status,
+                availability_flag=moves.c.availability,
+                location=moves.c.location,
+                last_checked_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    for chunk in _batches(new_inventory):
+        await db.execute(insert(AssetInventory).values(chunk))
+
+    await audit_sink.record_many(db, events)
+    return summary
+
+
+async def retire_byod_devices(
+    db: AsyncSession,
+    where,
+    new_status: str = "DECOMMISSIONED",
+    action: str = "BYOD_DECOMMISSIONED_ON_EXIT",
+    actor_id: Optional[UUID] = None,
+    user_id: Optional[UUID] = None,
+) -> List[UUID]:
+    """
+    Set compliance_status on every BYOD device matching `where` in one
+    UPDATE ... FROM (locked previous values) RETURNING, with one audit insert.
+    Returns the device ids. The caller commits.
+    """
+    previous = (
+        select(ByodDevice.id, ByodDevice.compliance_status)
+        .where(where)
+        .order_by(ByodDevice.id)
+        .with_for_update()
+        .cte("previous")
+    )
+    rows = (await db.execute(
+        update(ByodDevice)
+        .where(ByodDevice.id == previous.c.id)
+        .values(compliance_status=new_status)
+        .returning(ByodDevice.id, previous.c.compliance_status)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    await audit_sink.record_many(db, [
+        {
+            "entity_type": "ByodDevice",
+            "entity_id": device_id,
+            "action": action,
+            "performed_by": actor_id,
+            "details": {
+                "old_status": old_status,
+                "new_status": new_status,
+                "user_id": str(user_id) if user_id else None,
+            },
+        }
+        for device_id, old_status in rows
+    ])
+    return [device_id for device_id, _ in rows]
+
+
+async def first_unreturned_asset(db: AsyncSession, user: User, asset_ids: Sequence[UUID]) -> Optional[str]:
+    """Name of one of asset_ids still assigned to user, or None (single query)"""
+    if not asset_ids:
+        return None
+    return (await db.execute(
+        select(Asset.name).where(Asset.id == any_id(asset_ids), assigned_to_user(user)).limit(1)
+    )).scalar()
+
+
+async def has_active_byod(db: AsyncSession, device_ids: Sequence[UUID]) -> bool:
+    """True if any of device_ids is neither de-registered nor decommissioned (single query)"""
+    if not device_ids:
+        return False
+    return (await db.execute(
+        select(ByodDevice.id)
+        .where(
+            ByodDevice.id == any_id(device_ids),
+            ByodDevice.compliance_status.notin_(("DE_REGISTERED", "DECOMMISSIONED")),
+        )
+        .limit(1)
+    )).first() is not None
+
 
 async def handle_user_exit(db: AsyncSession, user_id: UUID, actor_id: Optional[UUID] = None, qc_results: Dict[str, str] = None) -> Dict[str, Any]:
     """
     Handles the atomic exit workflow for a user (Asynchronous).
+    Statement count does not grow with the number of assets, so lab and
+    department accounts with thousands of assets finish in one bounded transaction.
     """
-    qc_results = qc_results or {}
-    
     # 1. Fetch User
     result = await db.execute(select(User).filter(User.id == user_id))
     user = result.scalars().first()
     if not user:
         raise Exception(f"User {user_id} not found")
 
-    # 2. Fetch all currently assigned assets
-    asset_result = await db.execute(select(Asset).filter(Asset.assigned_to == user.full_name))
-    assets = asset_result.scalars().all()
-    
-    byod_result = await db.execute(select(ByodDevice).filter(ByodDevice.owner_id == user_id))
-    byod_devices = byod_result.scalars().all()
-
-    summary = {
-        "total_assets": len(assets) + len(byod_devices),
-        "returned_to_inventory": 0,
-        "sent_for_repair": 0,
-        "scrapped": 0,
-        "byod_decommissioned": 0,
-        "processed_ids": []
-    }
-
     try:
-        # A) Process COMPANY_OWNED assets
-        for asset in assets:
-            old_status = asset.status
-            qc_outcome = qc_results.get(asset.id, 'PASSED')
-            
-            new_status = "In Stock"
-            availability = True
-            
-            if qc_outcome == 'FAILED':
-                new_status = "Repair"
-                availability = False
-                summary["sent_for_repair"] += 1
-            elif qc_outcome == 'EOL':
-                new_status = "Scrap"
-                availability = False
-                summary["scrapped"] += 1
-            else:
-                summary["returned_to_inventory"] += 1
-            
-            # Update Asset record
-            asset.status = new_status
-            asset.assigned_to = None
-            asset.assigned_by = None
-            asset.assignment_date = None
-            asset.disposal_status = "WIPE_PENDING"
-            
-            # Update Inventory Table
-            inv_result = await db.execute(select(AssetInventory).filter(AssetInventory.asset_id == asset.id))
-            inventory_item = inv_result.scalars().first()
-            if not inventory_item:
-                inventory_item = AssetInventory(
-                    id=uuid.uuid4(),
-                    asset_id=asset.id,
-                    location=asset.location,
-                )
-                db.add(inventory_item)
-            
-            inventory_item.status = "Available" if new_status == "In Stock" else new_status
-            inventory_item.availability_flag = availability
-            inventory_item.last_checked_at = datetime.now()
-            inventory_item.location = asset.location
-            
-            # Audit Log
-            audit = AuditLog(
-                id=uuid.uuid4(),
-                entity_type="Asset",
-                entity_id=asset.id,
-                action="ASSET_RETURNED_ON_EXIT",
-                performed_by=actor_id,
-                details={
-                    "old_status": old_status,
-                    "new_status": new_status,
-                    "qc_outcome": qc_outcome,
-                    "user_id": user_id,
-                    "reason": "User Exit/Resignation"
-                }
-            )
-            db.add(audit)
-            summary["processed_ids"].append(asset.id)
-
-        # B) Process BYOD devices
-        for byod in byod_devices:
-            old_compliance = byod.compliance_status
-            byod.compliance_status = "DECOMMISSIONED"
-            
-            # Audit Log
-            audit = AuditLog(
-                id=uuid.uuid4(),
-                entity_type="ByodDevice",
-                entity_id=byod.id,
-                action="BYOD_DECOMMISSIONED_ON_EXIT",
-                performed_by=actor_id,
-                details={
-                    "old_status": old_compliance,
-                    "new_status": "DECOMMISSIONED",
-                    "user_id": user_id
-                }
-            )
-            db.add(audit)
-            summary["byod_decommissioned"] += 1
-            summary["processed_ids"].append(byod.id)
+        await bound_transaction(db)
+
+        # A) Return COMPANY_OWNED assets to inventory
+        summary = await return_assets(db, assigned_to_user(user), actor_id=actor_id, user_id=user_id, qc_results=qc_results)
 
-        # 3. Update User Status
+        # B) Decommission BYOD devices
+        byod_ids = await retire_byod_devices(db, ByodDevice.owner_id == user_id, actor_id=actor_id, user_id=user_id)
+        summary["byod_decommissioned"] = len(byod_ids)
+        summary["processed_ids"].extend(byod_ids)
+        summary["total_assets"] = len(summary["processed_ids"])
+
+        # 2. Update User Status
         user.status = "DISABLED"
-        
+
         await db.commit()
-        
+        invalidate_principal(user_id)
+
     except Exception as e:
         await db.rollback()
         raise e
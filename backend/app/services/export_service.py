@@ -0,0 +1,184 @@
+"""
+Export service - Streams full table dumps as NDJSON, CSV or XLSX from a server-side cursor (Asynchronous)
+"""
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.models import AuditLog, Ticket
+from ..services.asset_service import _inventory_union
+from ..utils.json_response import dumps
+from ..config.settings import settings
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+EXPORT_ENTITIES = ("assets", "tickets", "audit-logs")
+
+# XLSX is assembled in a temp file and then streamed in chunks of this size
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+def _model_columns(model) -> Dict[str, Any]:
+    return {attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs}
+
+
+def available_columns(entity: str) -> List[str]:
+    return list(_source(entity).keys())
+
+
+def _source(entity: str) -> Dict[str, Any]:
+    if entity == "assets":
+        # Same rows as GET /assets: standard assets and BYOD devices
+        inventory = _inventory_union()
+        return {key: inventory.c[key] for key in inventory.c.keys()}
+    if entity == "tickets":
+        return _model_columns(Ticket)
+    if entity == "audit-logs":
+        return _model_columns(AuditLog)
+    raise ValueError(f"Unknown export '{entity}'. Allowed: {', '.join(EXPORT_ENTITIES)}")
+
+
+def build_query(entity: str, columns: Optional[Sequence[str]] = None, filters: Optional[Dict[str, Any]] = None):
+    """
+    SELECT of the requested columns (all by default) in a stable order.
+    Raises ValueError for an unknown entity or column.
+    """
+    source = _source(entity)
+    columns = list(columns) if columns else list(source.keys())
+    unknown = [name for name in columns if name not in source]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {entity}: {', '.join(unknown)}. Allowed: {', '.join(source)}")
+
+    query = select(*[source[name].label(name) for name in columns])
+    filters = {key: value for key, value in (filters or {}).items() if value is not None}
+
+    if entity == "assets":
+        for key in ("status", "type", "segment"):
+            if key in filters:
+                query = query.where(source[key] == filters[key])
+        query = query.order_by(source["created_at"], source["id"])
+    elif entity == "tickets":
+        if "status" in filters:
+            query = query.where(Ticket.status == filters["status"])
+        query = query.order_by(Ticket.created_at, Ticket.id)
+    else:
+        if "entity_type" in filters:
+            query = query.where(AuditLog.entity_type == filters["entity_type"])
+        if "action" in filters:
+            query = query.where(AuditLog.action == filters["action"])
+        # Timestamp bounds prune the monthly partitions
+        if "since" in filters:
+            query = query.where(AuditLog.timestamp >= filters["since"])
+        if "until" in filters:
+            query = query.where(AuditLog.timestamp < filters["until"])
+        query = query.order_by(AuditLog.timestamp, AuditLog.id)
+    return query, columns
+
+
+async def iter_batches(db: AsyncSession, query, batch_size: Optional[int] = None) -> AsyncIterator[Sequence]:
+    """
+    Yield lists of rows from a server-side cursor; at most batch_size rows are
+    held in memory at a time regardless of table size.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions(batch_size):
+        yield partition
+
+
+def _cell(value: Any) -> Any:
+    """Flatten a value for CSV / XLSX cells"""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        # XLSX cannot hold timezone-aware datetimes
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+async def _ndjson(batches: AsyncIterator[Sequence], columns: List[str]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+async def _csv(batches: AsyncIterator[Sequence], columns: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        for row in rows:
+            writer.writerow([_cell(value) for value in row])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def _xlsx(batches: AsyncIterator[Sequence], columns: List[str], sheet_title: str) -> AsyncIterator[bytes]:
+    """
+    openpyxl write-only mode spills rows to disk as they are appended; the
+    finished workbook (a zip) can only be written at the end, so it is saved to
+    a temp file and streamed from there.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    def xlsx_cell(value):
+        # Control characters (possible in client-supplied payloads) make openpyxl
+        # raise mid-stream, after the 200 has been sent; drop them
+        value = _cell(value)
+        return ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title[:31])
+    sheet.append([xlsx_cell(column) for column in columns])
+    async for rows in batches:
+        for row in rows:
+            sheet.append([xlsx_cell(value) for value in row])
+
+    with tempfile.TemporaryFile() as spool:
+        await asyncio.to_thread(workbook.save, spool)
+        spool.seek(0)
+        while True:
+            chunk = await asyncio.to_thread(spool.read, FILE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def encode(batches: AsyncIterator[Sequence], columns: List[str], fmt: str, sheet_title: str = "export") -> AsyncIterator[bytes]:
+    if fmt == "ndjson":
+        return _ndjson(batches, columns)
+    if fmt == "csv":
+        return _csv(batches, columns)
+    if fmt == "xlsx":
+        return _xlsx(batches, columns, sheet_title)
+    raise ValueError(f"Unknown format '{fmt}'. Allowed: {', '.join(FORMATS)}")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally (gzip container, one member)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,311 @@
+"""
+Extraction job service - Runs PO / invoice PDF extraction in a process pool off the event loop (Asynchronous)
+"""
+import asyncio
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update
+from ..database.database import AsyncSessionLocal
+from ..models.models import ExtractionJob, PurchaseOrder, PurchaseInvoice, ProcurementLog
+from ..services import pdf_extraction_service
+from ..services import file_store_service
+from ..config.settings import settings
+from ..utils import job_lease
+
+JOB_KINDS = ("PO", "INVOICE")
+
+# Module-level functions so they can be pickled into the worker processes
+_EXTRACTORS = {
+    "PO": pdf_extraction_service.extract_po_details,
+    "INVOICE": pdf_extraction_service.extract_invoice_details,
+}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+_running_tasks: Set[asyncio.Task] = set()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PDF_EXTRACTION_WORKERS)
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.PDF_EXTRACTION_CONCURRENCY)
+    return _semaphore
+
+
+def job_to_dict(job: ExtractionJob) -> Dict:
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "target_id": str(job.target_id),
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "result": job.result,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def fill_purchase_order(po: PurchaseOrder, extracted: Dict):
+    po.vendor_name = extracted.get("vendor_name")
+    po.total_cost = extracted.get("total_cost")
+    po.quantity = extracted.get("quantity")
+    po.unit_price = extracted.get("unit_price")
+    po.extracted_data = extracted
+
+
+def fill_invoice(invoice: PurchaseInvoice, extracted: Dict):
+    invoice.total_amount = extracted.get("total_cost")
+
+
+def create_job(db: AsyncSession, kind: str, target_id: UUID, file_path: str, cached_result: Optional[Dict] = None) -> ExtractionJob:
+    """
+    Add a QUEUED job to the session. The caller commits and then calls schedule_job().
+    With a cached_result the job is recorded as already SUCCEEDED and needs no scheduling.
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown extraction job kind: {kind}")
+    job = ExtractionJob(
+        id=uuid.uuid4(),
+        kind=kind,
+        target_id=target_id,
+        file_path=file_path,
+        status="QUEUED",
+        attempts=0,
+        max_attempts=settings.PDF_EXTRACTION_MAX_ATTEMPTS,
+    )
+    if cached_result is not None:
+        job.status = "SUCCEEDED"
+        job.result = cached_result
+        job.finished_at = datetime.now(timezone.utc)
+    db.add(job)
+    return job
+
+
+def schedule_job(job_id: UUID, delay: float = 0.0):
+    """Start processing a committed job in the background"""
+    task = asyncio.create_task(_run_job(job_id, delay))
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+
+
+async def get_job(db: AsyncSession, job_id: UUID) -> Optional[ExtractionJob]:
+    result = await db.execute(select(ExtractionJob).filter(ExtractionJob.id == job_id))
+    return result.scalars().first()
+
+
+async def retry_job(db: AsyncSession, job_id: UUID) -> ExtractionJob:
+    """
+    Requeue a FAILED job with a fresh attempt budget.
+    """
+    job = await get_job(db, job_id)
+    if not job:
+        raise ValueError("Extraction job not found")
+    if job.status != "FAILED":
+        raise ValueError(f"Only FAILED jobs can be retried (current status: {job.status})")
+
+    job.status = "QUEUED"
+    job.attempts = 0
+    job.error = None
+    job.finished_at = None
+    await db.commit()
+    await db.refresh(job)
+    schedule_job(job.id)
+    return job
+
+
+async def reclaim_expired_jobs() -> List[UUID]:
+    """
+    Requeue RUNNING jobs whose worker stopped heartbeating (it died mid-extraction)
+    and schedule them here. Jobs a live worker is still running keep their lease.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.status == "RUNNING", job_lease.lease_expired(ExtractionJob))
+            .values(status="QUEUED", lease_owner=None)
+            .returning(ExtractionJob.id)
+        )
+        job_ids = result.scalars().all()
+        await db.commit()
+
+    for job_id in job_ids:
+        schedule_job(job_id)
+    if job_ids:
+        print(f"[EXTRACTION] Reclaimed {len(job_ids)} extraction job(s) with an expired lease")
+    return job_ids
+
+
+async def resume_pending_jobs():
+    """
+    Requeue jobs left QUEUED, or RUNNING under an expired lease, by a previous process (called on startup).
+    """
+    reclaimed = set(await reclaim_expired_jobs())
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(ExtractionJob.id).filter(ExtractionJob.status == "QUEUED"))
+        job_ids = [job_id for job_id in result.scalars().all() if job_id not in reclaimed]
+
+    for job_id in job_ids:
+        schedule_job(job_id)
+    if job_ids:
+        print(f"[EXTRACTION] Resumed {len(job_ids)} pending extraction job(s)")
+
+
+async def _claim_job(db: AsyncSession, job_id: UUID) -> Optional[ExtractionJob]:
+    """
+    Atomically move a job from QUEUED to RUNNING so only one worker processes it.
+    """
+    result = await db.execute(
+        update(ExtractionJob)
+        .where(ExtractionJob.id == job_id, ExtractionJob.status == "QUEUED")
+        .values(
+            status="RUNNING",
+            attempts=ExtractionJob.attempts + 1,
+            started_at=datetime.now(timezone.utc),
+            **job_lease.claim_values(),
+        )
+        .returning(ExtractionJob.id)
+    )
+    claimed = result.scalar_one_or_none()
+    await db.commit()
+    if claimed is None:
+        return None
+    return await get_job(db, job_id)
+
+
+async def _run_job(job_id: UUID, delay: float = 0.0):
+    if delay:
+        await asyncio.sleep(delay)
+
+    async with _get_semaphore():
+        async with AsyncSessionLocal() as db:
+            job = await _claim_job(db, job_id)
+            if job is None:
+                return
+            try:
+                await _process_job(db, job)
+            except job_lease.LeaseLost as e:
+                # Reclaimed while this worker ran it; the new owner records the outcome
+                print(f"[EXTRACTION] Discarding result: {e}")
+
+
+async def _process_job(db: AsyncSession, job: ExtractionJob):
+    """
+    Extract a claimed job's PDF and record the outcome. Every status transition
+    goes through job_lease.commit_owned, so a worker that lost its lease cannot
+    apply a result another worker may also be applying.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        async with job_lease.heartbeat(ExtractionJob, job.id):
+            extracted = await loop.run_in_executor(_get_executor(), _EXTRACTORS[job.kind], job.file_path)
+    except Exception as e:
+        await _record_failure(db, job, str(e) or e.__class__.__name__)
+        return
+
+    if extracted.get("error"):
+        # The extractor reports unreadable PDFs instead of raising; retrying will not help
+        await job_lease.commit_owned(
+            db, ExtractionJob, job.id,
+            status="FAILED", error=extracted["error"], result=extracted, finished_at=datetime.now(timezone.utc),
+        )
+        return
+
+    try:
+        await _apply_result(db, job, extracted)
+        await file_store_service.save_extraction(db, job.file_path, extracted)
+        await job_lease.commit_owned(
+            db, ExtractionJob, job.id,
+            status="SUCCEEDED", result=extracted, error=None, finished_at=datetime.now(timezone.utc),
+        )
+    except job_lease.LeaseLost:
+        raise
+    except Exception as e:
+        await db.rollback()
+        job = await get_job(db, job.id)
+        await _record_failure(db, job, str(e) or e.__class__.__name__)
+
+
+async def _record_failure(db: AsyncSession, job: ExtractionJob, error: str):
+    if job.attempts < job.max_attempts:
+        await job_lease.commit_owned(db, ExtractionJob, job.id, status="QUEUED", error=error, lease_owner=None)
+        # Exponential backoff between automatic attempts
+        schedule_job(job.id, delay=2 ** job.attempts)
+    else:
+        await job_lease.commit_owned(
+            db, ExtractionJob, job.id,
+            status="FAILED", error=error, finished_at=datetime.now(timezone.utc),
+        )
+
+
+async def _apply_result(db: AsyncSession, job: ExtractionJob, extracted: Dict):
+    """
+    Fill the PurchaseOrder / PurchaseInvoice row with the extracted values.
+    """
+    if job.kind == "PO":
+        result = await db.execute(select(PurchaseOrder).filter(PurchaseOrder.id == job.target_id))
+        po = result.scalars().first()
+        if not po:
+            raise ValueError("Purchase Order not found")
+        fill_purchase_order(po, extracted)
+        log = ProcurementLog(
+            id=uuid.uuid4(),
+            reference_id=po.id,
+            action="PO_EXTRACTED",
+            performed_by=po.uploaded_by,
+            role="PROCUREMENT",
+            metadata_={
+                "asset_request_id": str(po.asset_request_id),
+                "job_id": str(job.id),
+                "vendor": po.vendor_name,
+                "total_cost": po.total_cost,
+                "extracted_at": datetime.now().isoformat()
+            }
+        )
+    else:
+        result = await db.execute(select(PurchaseInvoice).filter(PurchaseInvoice.id == job.target_id))
+        invoice = result.scalars().first()
+        if not invoice:
+            raise ValueError("Purchase Invoice not found")
+        fill_invoice(invoice, extracted)
+        log = ProcurementLog(
+            id=uuid.uuid4(),
+            reference_id=invoice.id,
+            action="INVOICE_EXTRACTED",
+            performed_by=invoice.created_by,
+            role="FINANCE",
+            metadata_={
+                "po_id": str(invoice.purchase_order_id),
+                "job_id": str(job.id),
+                "final_cost": invoice.total_amount,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+    db.add(log)
+
+
+async def shutdown():
+    """Cancel in-flight job tasks and stop the worker processes"""
+    global _executor
+    tasks = list(_running_tasks)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
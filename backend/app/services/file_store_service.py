@@ -0,0 +1,208 @@
+"""
+File store service - Content-addressed storage and extraction cache for procurement PDFs (Asynchronous)
+"""
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, func, update, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..models.models import StoredFile, PurchaseOrder, PurchaseInvoice
+from ..config.settings import settings
+
+# Lives under procurement_service.UPLOAD_DIR
+OBJECTS_DIR = os.path.join("uploads", "procurement", "objects")
+TMP_DIR = os.path.join(OBJECTS_DIR, "tmp")
+CHUNK_SIZE = 1024 * 1024
+# Object paths checked against stored_files per query by the GC sweep
+SWEEP_BATCH_SIZE = 1000
+
+
+def object_path(sha256: str, extension: str = ".pdf") -> str:
+    """uploads/procurement/objects/ab/cd/abcd....pdf"""
+    return os.path.join(OBJECTS_DIR, sha256[:2], sha256[2:4], f"{sha256}{extension}")
+
+
+def _write_object(source: BinaryIO, extension: str) -> Tuple[str, str, int]:
+    """
+    Stream the upload to a temp file while hashing it, then move it into place.
+    If the object already exists the temp copy is discarded.
+    """
+    os.makedirs(TMP_DIR, exist_ok=True)
+    tmp_path = os.path.join(TMP_DIR, f"{uuid.uuid4()}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        sha256 = digest.hexdigest()
+        final_path = object_path(sha256, extension)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            # Refresh the mtime so the GC sweep leaves it alone until this upload's row commits
+            os.utime(final_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+        return sha256, final_path, size
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+async def store_upload(db: AsyncSession, source: BinaryIO, extension: str = ".pdf") -> StoredFile:
+    """
+    Store an uploaded file once per content hash and add a reference to it.
+    The caller's commit persists the reference together with the PO / invoice row.
+    """
+    sha256, path, size = await asyncio.to_thread(_write_object, source, extension)
+
+    stmt = pg_insert(StoredFile).values(
+        sha256=sha256,
+        file_path=path,
+        size_bytes=size,
+        ref_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StoredFile.sha256],
+        set_={
+            "ref_count": StoredFile.ref_count + 1,
+            "file_path": stmt.excluded.file_path,
+            "last_referenced_at": func.now(),
+        },
+    ).returning(StoredFile)
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+
+async def get_cached_extraction(db: AsyncSession, file_path: str) -> Optional[Dict[str, Any]]:
+    result = await db.execute(select(StoredFile.extracted_data).filter(StoredFile.file_path == file_path))
+    return result.scalar_one_or_none()
+
+
+async def save_extraction(db: AsyncSession, file_path: str, extracted: Dict[str, Any]):
+    """Cache a successful extraction result against the file's content hash"""
+    if extracted.get("error"):
+        return
+    await db.execute(
+        update(StoredFile)
+        .where(StoredFile.file_path == file_path)
+        .values(extracted_data=extracted, extracted_at=func.now())
+    )
+
+
+def _remove_files(paths):
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def _remove_stale_temp_files(older_than_seconds: int) -> int:
+    if not os.path.isdir(TMP_DIR):
+        return 0
+    cutoff = time.time() - older_than_seconds
+    stale = [
+        os.path.join(TMP_DIR, name)
+        for name in os.listdir(TMP_DIR)
+        if os.path.getmtime(os.path.join(TMP_DIR, name)) < cutoff
+    ]
+    return _remove_files(stale)
+
+
+def _old_object_files(older_than_seconds: int) -> List[str]:
+    """Object files (outside tmp/) last written before the grace period"""
+    if not os.path.isdir(OBJECTS_DIR):
+        return []
+    cutoff = time.time() - older_than_seconds
+    tmp_dir = os.path.abspath(TMP_DIR)
+    paths = []
+    for root, dirs, files in os.walk(OBJECTS_DIR):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != tmp_dir]
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    paths.append(path)
+            except FileNotFoundError:
+                continue
+    return paths
+
+
+async def _sweep_untracked_objects(db: AsyncSession, grace_seconds: int) -> int:
+    """
+    Delete object files with no stored_files row, e.g. written by an upload whose
+    transaction rolled back. Only files older than the grace period are considered,
+    so uploads still in flight are not touched.
+    """
+    candidates = await asyncio.to_thread(_old_object_files, grace_seconds)
+    untracked = []
+    for start in range(0, len(candidates), SWEEP_BATCH_SIZE):
+        batch = candidates[start:start + SWEEP_BATCH_SIZE]
+        result = await db.execute(select(StoredFile.file_path).filter(StoredFile.file_path.in_(batch)))
+        tracked = set(result.scalars().all())
+        untracked.extend(path for path in batch if path not in tracked)
+    return await asyncio.to_thread(_remove_files, untracked)
+
+
+async def collect_garbage(db: AsyncSession, grace_seconds: Optional[int] = None) -> Dict[str, int]:
+    """
+    Recompute reference counts from PO / invoice rows, then delete stored files
+    that have had no references for longer than the grace period, and object
+    files older than the grace period that never got a stored_files row.
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.UPLOAD_GC_GRACE_SECONDS
+
+    references = union_all(
+        select(PurchaseOrder.po_pdf_path.label("path")),
+        select(PurchaseInvoice.invoice_pdf_path.label("path")),
+    ).subquery("refs")
+    ref_counts = (
+        select(func.count())
+        .select_from(references)
+        .where(references.c.path == StoredFile.file_path)
+        .scalar_subquery()
+    )
+    await db.execute(update(StoredFile).values(ref_count=ref_counts))
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    result = await db.execute(
+        delete(StoredFile)
+        .where(StoredFile.ref_count == 0, StoredFile.last_referenced_at < cutoff)
+        .returning(StoredFile.file_path)
+    )
+    orphaned = result.scalars().all()
+    await db.commit()
+
+    # Skip files that were re-uploaded (and so re-registered) since the delete
+    if orphaned:
+        result = await db.execute(select(StoredFile.file_path).filter(StoredFile.file_path.in_(orphaned)))
+        revived = set(result.scalars().all())
+        orphaned = [path for path in orphaned if path not in revived]
+    removed = await asyncio.to_thread(_remove_files, orphaned)
+    temp_removed = await asyncio.to_thread(_remove_stale_temp_files, grace_seconds)
+    untracked_removed = await _sweep_untracked_objects(db, grace_seconds)
+    return {
+        "orphaned": len(orphaned),
+        "files_removed": removed,
+        "temp_files_removed": temp_removed,
+        "untracked_files_removed": untracked_removed,
+    }
@@ -0,0 +1,434 @@
+"""
+Import service - Streaming, chunked bulk import of asset / procurement requests (Asynchronous)
+"""
+import asyncio
+import itertools
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import insert, update
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+from ..database.database import AsyncSessionLocal
+from ..models.models import AssetRequest, ImportJob, ImportJobError
+from ..config.settings import settings
+from ..utils import job_lease
+
+IMPORT_DIR = os.path.join("uploads", "imports")
+SUPPORTED_FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".xls": "xls"}
+UUID_PATTERN = r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"
+
+_running_tasks: Set[asyncio.Task] = set()
+
+
+# ---------------------------------------------------------------------------
+# Reading: fixed-size DataFrame chunks indexed by 0-based data row position
+# ---------------------------------------------------------------------------
+
+def _iter_csv_chunks(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    # dtype=str keeps identifiers and model numbers exactly as written
+    yield from pd.read_csv(file_path, chunksize=chunk_size, dtype=str)
+
+
+def _iter_xlsx_chunks(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c) if c is not None else f"column_{i}" for i, c in enumerate(header)]
+        width = len(columns)
+        position = 0
+        while True:
+            batch = [tuple(row[:width]) + (None,) * (width - len(row)) for row in itertools.islice(rows, chunk_size)]
+            if not batch:
+                return
+            yield pd.DataFrame(batch, columns=columns, index=range(position, position + len(batch)))
+            position += len(batch)
+    finally:
+        workbook.close()
+
+
+def _iter_xls_chunks(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    # Legacy .xls has no streaming reader; load once and slice
+    df = pd.read_excel(file_path, dtype=str)
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+_READERS = {"csv": _iter_csv_chunks, "xlsx": _iter_xlsx_chunks, "xls": _iter_xls_chunks}
+
+
+def iter_chunks(file_path: str, file_format: str, chunk_size: int, skip_rows: int = 0) -> Iterator[pd.DataFrame]:
+    """Yield chunks after the first skip_rows data rows (the resume checkpoint)"""
+    for chunk in _READERS[file_format](file_path, chunk_size):
+        if skip_rows and chunk.index[-1] < skip_rows:
+            continue
+        if skip_rows and chunk.index[0] < skip_rows:
+            chunk = chunk[chunk.index >= skip_rows]
+        yield chunk
+
+
+def estimate_total_rows(file_path: str, file_format: str) -> Optional[int]:
+    """Cheap row estimate for progress reporting (line count / sheet dimensions)"""
+    try:
+        if file_format == "csv":
+            with open(file_path, "rb") as f:
+                lines = sum(block.count(b"\n") for block in iter(lambda: f.read(1024 * 1024), b""))
+            return max(lines - 1, 0)
+        if file_format == "xlsx":
+            from openpyxl import load_workbook
+            workbook = load_workbook(file_path, read_only=True)
+            try:
+                max_row = workbook.active.max_row
+            finally:
+                workbook.close()
+            return max(max_row - 1, 0) if max_row else None
+    except Exception:
+        return None
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Validation: column-wise over a whole chunk
+# ---------------------------------------------------------------------------
+
+def _text(df: pd.DataFrame, name: str) -> pd.Series:
+    """Column as trimmed strings with blanks as missing; all-missing if the column is absent"""
+    if name not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype="string")
+    values = df[name].astype("string").str.strip()
+    return values.mask(values == "", pd.NA)
+
+
+def _column_length(name: str) -> Optional[int]:
+    return getattr(AssetRequest.__table__.c[name].type, "length", None)
+
+
+def validate_chunk(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[int], List[Tuple[int, str]], int, int]:
+    """
+    Map a chunk onto AssetRequest rows.
+    Returns (rows to insert, their row numbers, [(row_number, error)],
+    asset request count, procurement request count).
+    """
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip().str.lower().str.replace(' ', '_')
+    df = df.dropna(how="all")
+    if df.empty:
+        return [], [], [], 0, 0
+
+    errors = pd.Series(pd.NA, index=df.index, dtype="string")
+
+    def flag(condition: pd.Series, message: str):
+        nonlocal errors
+        condition = condition.fillna(False).astype(bool) & errors.isna()
+        errors = errors.mask(condition, message)
+
+    requester = _text(df, "requester_id").fillna(_text(df, "requester"))
+    flag(requester.isna(), "Missing requester_id/requester")
+    flag(~requester.str.fullmatch(UUID_PATTERN).fillna(True), "Invalid requester_id")
+
+    raw_cost = _text(df, "cost_estimate")
+    cost = pd.to_numeric(raw_cost, errors="coerce")
+    flag(raw_cost.notna() & cost.isna(), "Invalid cost_estimate")
+
+    justification = _text(df, "justification")
+    reason = _text(df, "reason")
+    business_justification = (
+        _text(df, "business_justification").fillna(reason).fillna(justification).fillna("Uploaded via bulk import")
+    )
+
+    is_procurement = _text(df, "record_type").str.lower().isin(["procurement", "request"]).fillna(False).astype(bool)
+    is_procurement |= (
+        _text(df, "serial_number").isna() & (_text(df, "estimated_cost").notna() | reason.notna())
+    ).fillna(False).astype(bool)
+
+    mapped = pd.DataFrame({
+        "requester_id": requester,
+        "asset_name": _text(df, "name").fillna(_text(df, "asset_name")).fillna("Unknown Asset"),
+        "asset_type": _text(df, "type").fillna("Laptop"),
+        "asset_ownership_type": _text(df, "asset_ownership_type").fillna("COMPANY_OWNED"),
+        "asset_model": _text(df, "model").fillna(""),
+        "asset_vendor": _text(df, "vendor").fillna(""),
+        "justification": justification.fillna(""),
+        "business_justification": business_justification,
+        "status": is_procurement.map({True: "PROCUREMENT_REQUESTED", False: "SUBMITTED"}),
+    }, index=df.index)
+
+    # Over-long values would make the whole chunk's INSERT fail; report them per row instead
+    for name in mapped.columns:
+        limit = _column_length(name)
+        if limit:
+            flag(mapped[name].str.len() > limit, f"{name} is longer than {limit} characters")
+
+    valid = errors.isna().to_numpy()
+    mapped = mapped[valid].astype(object)
+    costs = cost[valid].astype(object).where(cost[valid].notna(), None)
+    now = datetime.now(timezone.utc)
+
+    rows = []
+    row_numbers = [int(index) + 1 for index in mapped.index]
+    for record, cost_estimate in zip(mapped.to_dict("records"), costs.tolist()):
+        record["id"] = uuid.uuid4()
+        record["requester_id"] = uuid.UUID(record["requester_id"])
+        record["cost_estimate"] = None if pd.isna(cost_estimate) else float(cost_estimate)
+        record["manager_approvals"] = []
+        record["created_at"] = now
+        record["updated_at"] = now
+        rows.append(record)
+
+    invalid = errors.dropna()
+    error_rows = [(int(index) + 1, message) for index, message in invalid.items()]
+    procurement_count = int(is_procurement[valid].sum())
+    return rows, row_numbers, error_rows, len(rows) - procurement_count, procurement_count
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+def job_to_dict(job: ImportJob) -> Dict[str, Any]:
+    progress = None
+    if job.total_rows:
+        progress = round(min(job.rows_processed / job.total_rows, 1.0) * 100, 1)
+    if job.status == "SUCCEEDED":
+        progress = 100.0
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "original_filename": job.original_filename,
+        "total_rows": job.total_rows,
+        "rows_processed": job.rows_processed,
+        "progress_percent": progress,
+        "asset_requests_created": job.asset_requests_created,
+        "procurement_requests_created": job.procurement_requests_created,
+        "error_count": job.error_count,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _save_upload(source: BinaryIO, file_path: str):
+    os.makedirs(IMPORT_DIR, exist_ok=True)
+    with open(file_path, "wb") as out:
+        shutil.copyfileobj(source, out, length=1024 * 1024)
+
+
+async def create_import_job(db: AsyncSession, source: BinaryIO, filename: str, created_by: Optional[str] = None) -> ImportJob:
+    """
+    Persist the uploaded file and queue an import job for it.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    file_format = SUPPORTED_FORMATS.get(extension)
+    if not file_format:
+        raise ValueError("Invalid file format. Please upload CSV or Excel.")
+
+    job_id = uuid.uuid4()
+    file_path = os.path.join(IMPORT_DIR, f"{job_id}{extension}")
+    await asyncio.to_thread(_save_upload, source, file_path)
+    total_rows = await asyncio.to_thread(estimate_total_rows, file_path, file_format)
+
+    job = ImportJob(
+        id=job_id,
+        file_path=file_path,
+        original_filename=filename,
+        file_format=file_format,
+        status="QUEUED",
+        total_rows=total_rows,
+        rows_processed=0,
+        asset_requests_created=0,
+        procurement_requests_created=0,
+        error_count=0,
+        created_by=created_by,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    schedule_job(job.id)
+    return job
+
+
+def schedule_job(job_id: uuid.UUID):
+    task = asyncio.create_task(run_import_job(job_id))
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+
+
+async def get_job(db: AsyncSession, job_id: uuid.UUID) -> Optional[ImportJob]:
+    result = await db.execute(select(ImportJob).filter(ImportJob.id == job_id))
+    return result.scalars().first()
+
+
+async def get_job_errors(db: AsyncSession, job_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(ImportJobError.row_number, ImportJobError.message)
+        .filter(ImportJobError.job_id == job_id)
+        .order_by(ImportJobError.row_number)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [{"row": row_number, "message": message} for row_number, message in result.all()]
+
+
+async def resume_job(db: AsyncSession, job_id: uuid.UUID) -> ImportJob:
+    """
+    Requeue a FAILED job; it continues from its last committed checkpoint.
+    """
+    job = await get_job(db, job_id)
+    if not job:
+        raise ValueError("Import job not found")
+    if job.status != "FAILED":
+        raise ValueError(f"Only FAILED jobs can be resumed (current status: {job.status})")
+    job.status = "QUEUED"
+    job.error = None
+    job.finished_at = None
+    await db.commit()
+    await db.refresh(job)
+    schedule_job(job.id)
+    return job
+
+
+async def reclaim_expired_jobs() -> List[uuid.UUID]:
+    """
+    Requeue RUNNING import jobs whose worker stopped heartbeating and schedule them
+    here; they continue from their checkpoint. Jobs a live worker is running keep their lease.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(ImportJob)
+            .where(ImportJob.status == "RUNNING", job_lease.lease_expired(ImportJob))
+            .values(status="QUEUED", lease_owner=None)
+            .returning(ImportJob.id)
+        )
+        job_ids = result.scalars().all()
+        await db.commit()
+    for job_id in job_ids:
+        schedule_job(job_id)
+    if job_ids:
+        print(f"[IMPORT] Reclaimed {len(job_ids)} import job(s) with an expired lease")
+    return job_ids
+
+
+async def resume_pending_jobs():
+    """Requeue import jobs left QUEUED, or RUNNING under an expired lease, by a previous process (called on startup)"""
+    reclaimed = set(await reclaim_expired_jobs())
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(ImportJob.id).filter(ImportJob.status == "QUEUED"))
+        job_ids = [job_id for job_id in result.scalars().all() if job_id not in reclaimed]
+    for job_id in job_ids:
+        schedule_job(job_id)
+    if job_ids:
+        print(f"[IMPORT] Resumed {len(job_ids)} pending import job(s)")
+
+
+async def _insert_requests(db: AsyncSession, rows: List[Dict[str, Any]], row_numbers: List[int]) -> List[Tuple[int, Dict[str, Any], str]]:
+    """
+    Insert a chunk's rows in one statement. If the database rejects the chunk,
+    insert row by row under savepoints and return the rows that still fail as
+    (row_number, row, error). Connection-level errors are raised.
+    """
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(AssetRequest), rows)
+        return []
+    except (OperationalError, InterfaceError, DisconnectionError):
+        raise
+    except Exception as e:
+        print(f"[IMPORT] Chunk insert rejected, retrying row by row: {e}")
+
+    rejected = []
+    for row, row_number in zip(rows, row_numbers):
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(AssetRequest), [row])
+        except (OperationalError, InterfaceError, DisconnectionError):
+            raise
+        except Exception as e:
+            detail = str(getattr(e, "orig", None) or e).splitlines()[0]
+            rejected.append((row_number, row, f"Could not be saved: {detail}"))
+    return rejected
+
+
+async def run_import_job(job_id: uuid.UUID):
+    """
+    Process an import job chunk by chunk. Each chunk's rows, errors and the
+    checkpoint are committed in one transaction, so a resumed job neither
+    skips nor duplicates rows.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id, ImportJob.status == "QUEUED")
+            .values(status="RUNNING", started_at=datetime.now(timezone.utc), **job_lease.claim_values())
+            .returning(ImportJob.id)
+        )
+        claimed = result.scalar_one_or_none()
+        await db.commit()
+        if claimed is None:
+            return
+        job = await get_job(db, job_id)
+
+        async with job_lease.heartbeat(ImportJob, job.id):
+            try:
+                chunks = iter_chunks(job.file_path, job.file_format, settings.IMPORT_CHUNK_SIZE, job.rows_processed)
+                while True:
+                    # Parsing is blocking; keep it off the event loop
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+
+                    rows, row_numbers, errors, asset_count, procurement_count = await asyncio.to_thread(validate_chunk, chunk)
+                    if rows:
+                        for row_number, row, message in await _insert_requests(db, rows, row_numbers):
+                            errors.append((row_number, message))
+                            if row["status"] == "PROCUREMENT_REQUESTED":
+                                procurement_count -= 1
+                            else:
+                                asset_count -= 1
+                    if errors:
+                        await db.execute(insert(ImportJobError), [
+                            {"id": uuid.uuid4(), "job_id": job.id, "row_number": row_number, "message": message}
+                            for row_number, message in errors
+                        ])
+                    # The chunk's rows only commit if this worker still holds the lease
+                    await job_lease.commit_owned(
+                        db, ImportJob, job.id,
+                        rows_processed=int(chunk.index[-1]) + 1,
+                        asset_requests_created=ImportJob.asset_requests_created + asset_count,
+                        procurement_requests_created=ImportJob.procurement_requests_created + procurement_count,
+                        error_count=ImportJob.error_count + len(errors),
+                    )
+
+                await job_lease.commit_owned(db, ImportJob, job.id, status="SUCCEEDED", finished_at=datetime.now(timezone.utc))
+            except asyncio.CancelledError:
+                # Left RUNNING; reclaimed from its checkpoint once the lease expires
+                raise
+            except job_lease.LeaseLost as e:
+                # Reclaimed while this worker ran it; the new owner resumes from the last committed checkpoint
+                print(f"[IMPORT] Stopping: {e}")
+            except Exception as e:
+                await db.rollback()
+                try:
+                    await job_lease.commit_owned(
+                        db, ImportJob, job_id,
+                        status="FAILED", error=str(e) or e.__class__.__name__, finished_at=datetime.now(timezone.utc),
+                    )
+                except job_lease.LeaseLost as lost:
+                    print(f"[IMPORT] Not recording failure: {lost}")
+
+
+async def shutdown():
+    tasks = list(_running_tasks)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
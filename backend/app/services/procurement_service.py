@@ -2,7 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import desc
 from ..models.models import PurchaseOrder, PurchaseInvoice, ProcurementLog, AssetRequest
-from ..services import pdf_extraction_service
+from ..services import extraction_job_service
 import os
 import uuid
 from uuid import UUID
@@ -14,28 +14,25 @@ def ensure_upload_dir():
     if not os.path.exists(UPLOAD_DIR):
         os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-async def handle_po_upload(db: AsyncSession, asset_request_id: UUID, uploader_id: UUID, file_path: str):
+async def handle_po_upload(db: AsyncSession, asset_request_id: UUID, uploader_id: UUID, file_path: str, cached_extraction: dict = None):
     """
-    Handle PO PDF upload and automated extraction (Asynchronous).
+    Handle PO PDF upload (Asynchronous).
+    The PurchaseOrder is created immediately; extraction runs as a background job
+    that fills in vendor / cost fields when it finishes, unless the same file
+    was already extracted (cached_extraction).
     """
-    # PDF extraction is normally CPU-bound/blocking. 
-    # For a production app, we would use run_in_executor, but we keep it simple here.
-    extracted = pdf_extraction_service.extract_po_details(file_path)
-    
-    # Create PurchaseOrder record
+    # Create PurchaseOrder record (extracted fields are filled in by the job)
     po = PurchaseOrder(
         id=uuid.uuid4(),
         asset_request_id=asset_request_id,
         uploaded_by=uploader_id,
         po_pdf_path=file_path,
-        vendor_name=extracted.get("vendor_name"),
-        total_cost=extracted.get("total_cost"),
-        quantity=extracted.get("quantity"),
-        unit_price=extracted.get("unit_price"),
-        extracted_data=extracted,
         status="UPLOADED"
     )
+    if cached_extraction:
+        extraction_job_service.fill_purchase_order(po, cached_extraction)
     db.add(po)
+    job = extraction_job_service.create_job(db, "PO", po.id, file_path, cached_extraction)
     
     # Comprehensive Audit Log
     log = ProcurementLog(
@@ -46,9 +43,11 @@ async def handle_po_upload(db: AsyncSession, asset_request_id: UUID, uploader_id
         role="PROCUREMENT",
         metadata_={
             "asset_request_id": asset_request_id,
+            "extraction_job_id": str(job.id),
+            "extraction_cached": bool(cached_extraction),
             "vendor": po.vendor_name,
             "total_cost": po.total_cost,
-            "extracted_at": datetime.now().isoformat()
+            "uploaded_at": datetime.now().isoformat()
         }
     )
     db.add(log)
@@ -60,8 +59,16 @@ async def handle_po_upload(db: AsyncSession, asset_request_id: UUID, uploader_id
         request.procurement_finance_status = "PO_UPLOADED"
     
     await db.commit()
-    await db.refresh(po)
-    return po
+    if job.status == "QUEUED":
+        extraction_job_service.schedule_job(job.id)
+    return {
+        "id": po.id,
+        "asset_request_id": po.asset_request_id,
+        "po_pdf_path": po.po_pdf_path,
+        "status": po.status,
+        "job_id": job.id,
+        "job_status": job.status
+    }
 
 async def validate_finance_budget(db: AsyncSession, po_id: UUID, reviewer_id: UUID, role: str, action: str, reason: str = None):
     """
@@ -105,22 +112,24 @@ async def validate_finance_budget(db: AsyncSession, po_id: UUID, reviewer_id: UU
     await db.refresh(po)
     return po
 
-async def handle_invoice_upload(db: AsyncSession, po_id: UUID, uploader_id: UUID, file_path: str):
+async def handle_invoice_upload(db: AsyncSession, po_id: UUID, uploader_id: UUID, file_path: str, cached_extraction: dict = None):
     """
     Handle Finance-uploaded purchase confirmation / invoice PDF (Asynchronous).
+    The invoice total is filled in by a background extraction job, or straight
+    from cached_extraction when the same file was already extracted.
     """
-    extracted = pdf_extraction_service.extract_invoice_details(file_path)
-    
     # Create PurchaseInvoice record
     invoice = PurchaseInvoice(
         id=uuid.uuid4(),
         purchase_order_id=po_id,
         invoice_pdf_path=file_path,
         purchase_date=datetime.now(), 
-        total_amount=extracted.get("total_cost"),
         created_by=uploader_id
     )
+    if cached_extraction:
+        extraction_job_service.fill_invoice(invoice, cached_extraction)
     db.add(invoice)
+    job = extraction_job_service.create_job(db, "INVOICE", invoice.id, file_path, cached_extraction)
     
     # Log action
     log = ProcurementLog(
@@ -131,6 +140,8 @@ async def handle_invoice_upload(db: AsyncSession, po_id: UUID, uploader_id: UUID
         role="FINANCE",
         metadata_={
             "po_id": po_id,
+            "extraction_job_id": str(job.id),
+            "extraction_cached": bool(cached_extraction),
             "final_cost": invoice.total_amount,
             "timestamp": datetime.now().isoformat()
         }
@@ -138,8 +149,16 @@ async def handle_invoice_upload(db: AsyncSession, po_id: UUID, uploader_id: UUID
     db.add(log)
     
     await db.commit()
-    await db.refresh(invoice)
-    return invoice
+    if job.status == "QUEUED":
+        extraction_job_service.schedule_job(job.id)
+    return {
+        "id": invoice.id,
+        "purchase_order_id": invoice.purchase_order_id,
+        "invoice_pdf_path": invoice.invoice_pdf_path,
+        "purchase_date": invoice.purchase_date,
+        "job_id": job.id,
+        "job_status": job.status
+    }
 
 async def get_procurement_logs(db: AsyncSession, reference_id: UUID = None):
     """
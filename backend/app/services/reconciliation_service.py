@@ -0,0 +1,162 @@
+"""
+Reconciliation service - Recreates assets for DATA_COLLECT audit logs with no matching asset (Asynchronous)
+"""
+import uuid
+from datetime import timedelta
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import and_, exists, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+from ..models.models import Asset, AuditLog
+from ..services import checkpoint_service, user_service
+from ..services.collect_service import map_collect_payload
+from ..config.settings import settings
+
+CHECKPOINT_NAME = "audit_orphan_reconciliation"
+
+HARDWARE_FALLBACK_KEYS = ("model", "manufacturer", "cpu", "ram", "storage")
+
+# Literals (not bind parameters) so the planner can match ix_audit_logs_collect_serial
+_LOG_SERIAL = func.btrim(AuditLog.details.op("->>")(literal_column("'serial_number'")))
+_IS_COLLECT = AuditLog.action == literal_column("'DATA_COLLECT'")
+
+
+def map_orphan_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Asset column values for a logged payload. Older agents sent hardware
+    fields flat and only an os_version string.
+    """
+    row = map_collect_payload(data)
+    specifications = row["specifications"]
+    if not specifications["hardware"]:
+        specifications["hardware"] = {k: v for k, v in data.items() if k in HARDWARE_FALLBACK_KEYS}
+    if not specifications["os"] and "os_version" in data:
+        specifications["os"] = {"version": data.get("os_version")}
+    return row
+
+
+def _orphan_query(since, until, after_serial, limit):
+    """
+    Latest DATA_COLLECT payload per serial number with no matching asset:
+    a DISTINCT ON over the logs anti-joined to asset.assets, keyset-paged by serial.
+    """
+    serial = _LOG_SERIAL
+    conditions = [
+        _IS_COLLECT,
+        func.coalesce(serial, "") != "",
+        AuditLog.details["auth_success"].astext.is_distinct_from("false"),
+        ~exists().where(Asset.serial_number == serial),
+    ]
+    if since is not None:
+        conditions.append(AuditLog.timestamp > since)
+    if until is not None:
+        conditions.append(AuditLog.timestamp <= until)
+    if after_serial is not None:
+        conditions.append(serial > after_serial)
+
+    return (
+        select(serial.label("serial_number"), AuditLog.details)
+        .where(and_(*conditions))
+        .distinct(serial)
+        .order_by(serial, AuditLog.timestamp.desc(), AuditLog.id.desc())
+        .limit(limit)
+    )
+
+
+async def _insert_orphans(db: AsyncSession, rows) -> int:
+    stmt = (
+        pg_insert(Asset)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Asset.serial_number])
+        .returning(Asset.id)
+    )
+    return len((await db.execute(stmt)).all())
+
+
+async def reconcile_orphaned_collect_logs(db: AsyncSession, full: bool = False) -> Dict[str, Any]:
+    """
+    Create assets for orphaned DATA_COLLECT logs in batches.
+    Only logs newer than the last run's high-water mark are scanned unless full=True.
+    A batch the database rejects is retried row by row; payloads that still
+    fail are skipped and reported so the high-water mark can advance.
+    """
+    checkpoint = None if full else await checkpoint_service.get_checkpoint(db, CHECKPOINT_NAME)
+    since = None
+    if checkpoint and checkpoint.last_timestamp:
+        # Overlap the previous window so rows committed late with older timestamps are not missed
+        since = checkpoint.last_timestamp - timedelta(seconds=settings.RECONCILE_OVERLAP_SECONDS)
+
+    until = (await db.execute(
+        select(func.max(AuditLog.timestamp)).filter(_IS_COLLECT)
+    )).scalar()
+
+    batch_size = settings.RECONCILE_BATCH_SIZE
+    orphans_found = 0
+    created = 0
+    failed_batches = 0
+    skipped_serials = []
+    after_serial = None
+
+    while until is not None:
+        batch = (await db.execute(_orphan_query(since, until, after_serial, batch_size))).all()
+        if not batch:
+            break
+        orphans_found += len(batch)
+        after_serial = batch[-1].serial_number
+
+        rows = []
+        for serial_number, details in batch:
+            row = map_orphan_payload(details)
+            row["serial_number"] = serial_number
+            row["id"] = uuid.uuid4()
+            rows.append(row)
+
+        # One lookup resolves every assignee in the batch, as in collect_service.ingest_batch
+        resolved = await user_service.resolve_user_ids(db, [row["assigned_to"] for row in rows])
+        for row in rows:
+            row["assigned_user_id"] = resolved.get(str(row["assigned_to"] or "").strip().lower())
+
+        try:
+            created += await _insert_orphans(db, rows)
+            await db.commit()
+        except Exception as e:
+            print(f"[RECONCILE] Failed to insert batch ending at {after_serial}, retrying row by row: {e}")
+            await db.rollback()
+            landed = True
+            for row in rows:
+                try:
+                    async with db.begin_nested():
+                        created += await _insert_orphans(db, [row])
+                except (OperationalError, InterfaceError, DisconnectionError) as e:
+                    # Lost the connection: nothing to blame on the payload, retry next run
+                    print(f"[RECONCILE] Failed to insert batch ending at {after_serial}: {e}")
+                    landed = False
+                    break
+                except Exception as e:
+                    print(f"[RECONCILE] Skipping orphan {row['serial_number']}: {e}")
+                    skipped_serials.append(row["serial_number"])
+            if landed:
+                await db.commit()
+            else:
+                await db.rollback()
+                failed_batches += 1
+
+        if len(batch) < batch_size:
+            break
+
+    # Only advance the high-water mark when every batch landed (skipped payloads do not block it)
+    if until is not None and not failed_batches:
+        await checkpoint_service.save_checkpoint(db, CHECKPOINT_NAME, last_timestamp=until)
+        await db.commit()
+
+    return {
+        "scanned_since": since,
+        "high_water_mark": until,
+        "orphans_found": orphans_found,
+        "synced_count": created,
+        "failed_batches": failed_batches,
+        "skipped_count": len(skipped_serials),
+        "skipped_serials": skipped_serials[:100],
+    }
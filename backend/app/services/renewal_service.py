@@ -0,0 +1,242 @@
+"""
+Renewal service - Incremental expiry scanner and renewal queue (Asynchronous)
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import and_, case, func, literal, or_, text, tuple_, update
+from ..database.database import AsyncSessionLocal, async_engine
+from ..models.models import Asset
+from ..schemas.asset_schema import AssetResponse
+from ..services import checkpoint_service
+from ..utils.audit_sink import audit_sink
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..config.settings import settings
+
+CHECKPOINT_NAME = "renewal_expiry_scanner"
+
+# Arbitrary constant so only one worker scans at a time
+SCAN_LOCK_ID = 7_140_002
+
+EXPIRY_FIELDS = {
+    "warranty_expiry": "Warranty",
+    "contract_expiry": "Contract",
+    "license_expiry": "License",
+}
+# Urgency for the 1st, 2nd and 3rd window (expired assets are the most urgent)
+WINDOW_URGENCY = ("High", "Medium", "Low")
+
+# Statuses that can never need a renewal ("Scrap" is set by /disposal; "Disposed" only
+# ever appears in disposal_status, which excludes an asset on its own)
+INACTIVE_STATUSES = ("Retired", "Scrap")
+
+# Renewal stages of the /workflows/review flow, in order
+QUEUE_STATUSES = ("Requested", "IT_Approved", "Finance_Approved", "Commercial_Approved")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Earliest upcoming expiry of an asset (LEAST skips NULLs)
+NEXT_EXPIRY = func.least(Asset.warranty_expiry, Asset.contract_expiry, Asset.license_expiry)
+
+
+def _windows() -> List[int]:
+    return sorted(settings.RENEWAL_WINDOWS_DAYS)
+
+
+def _urgency(expiry_col, today: date):
+    """CASE mapping an expiry date to the urgency of the window it falls into"""
+    windows = _windows()
+    whens = [
+        (expiry_col <= today + timedelta(days=days), WINDOW_URGENCY[min(i, len(WINDOW_URGENCY) - 1)])
+        for i, days in enumerate(windows)
+    ]
+    return case(*whens, else_=WINDOW_URGENCY[-1])
+
+
+async def _scan_field(db: AsyncSession, field: str, today: date, after: Optional[Tuple[date, UUID]]) -> Tuple[int, Optional[Tuple[date, UUID]]]:
+    """
+    Move eligible assets whose `field` falls inside the largest window into the
+    renewal queue, one batch per statement, walking the (field, id) index from
+    `after`. Commits per batch. Returns (assets requested, new cursor).
+    """
+    expiry = getattr(Asset, field)
+    horizon = today + timedelta(days=_windows()[-1])
+    label = EXPIRY_FIELDS[field]
+    requested = 0
+
+    while True:
+        conditions = [
+            expiry.isnot(None),
+            expiry <= horizon,
+            Asset.renewal_status.is_(None),
+            Asset.status.notin_(INACTIVE_STATUSES),
+            # Anything in the disposal / wipe pipeline is on its way out
+            Asset.disposal_status.is_(None),
+        ]
+        if after is not None:
+            conditions.append(tuple_(expiry, Asset.id) > tuple_(literal(after[0]), literal(after[1])))
+        batch = (
+            select(Asset.id, expiry.label("expiry"))
+            .where(and_(*conditions))
+            .order_by(expiry, Asset.id)
+            .limit(settings.RENEWAL_SCAN_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        stmt = (
+            update(Asset)
+            .where(Asset.id == batch.c.id)
+            .values(
+                renewal_status="Requested",
+                renewal_urgency=_urgency(batch.c.expiry, today),
+                renewal_reason=func.concat(f"{label} expires on ", func.to_char(batch.c.expiry, "YYYY-MM-DD"), " (auto)"),
+            )
+            .returning(Asset.id, batch.c.expiry)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return requested, after
+
+        for asset_id, expiry_date in rows:
+            audit_sink.record(
+                db,
+                entity_type="Asset",
+                entity_id=asset_id,
+                action="RENEWAL_AUTO_REQUESTED",
+                details={"field": field, "expiry": expiry_date.isoformat()},
+            )
+        after = max((expiry_date, asset_id) for asset_id, expiry_date in rows)
+        requested += len(rows)
+        await db.commit()
+        if len(rows) < settings.RENEWAL_SCAN_BATCH_SIZE:
+            return requested, after
+
+
+def _load_cursor(raw: Optional[Dict[str, Any]], field: str) -> Optional[Tuple[date, UUID]]:
+    value = (raw or {}).get(field)
+    if not value:
+        return None
+    return date.fromisoformat(value[0]), UUID(value[1])
+
+
+async def scan_expiring_assets(db: AsyncSession, full: bool = False) -> Dict[str, Any]:
+    """
+    Queue every asset whose warranty, contract or license expires within the
+    largest window (or has already expired) and is not yet in the renewal flow.
+
+    Incremental: the (expiry, id) position per field is checkpointed, so a run
+    only reads assets that entered the window since the previous run. A full
+    rescan (explicit, or every RENEWAL_FULL_SCAN_SECONDS) picks up assets whose
+    dates were moved earlier or whose renewal was reset.
+    """
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    checkpoint = await checkpoint_service.get_checkpoint(db, CHECKPOINT_NAME)
+    cursor = dict(checkpoint.cursor or {}) if checkpoint and not full else {}
+
+    last_full = cursor.get("full_scan_at")
+    if last_full is None or (now - datetime.fromisoformat(last_full)).total_seconds() >= settings.RENEWAL_FULL_SCAN_SECONDS:
+        full = True
+        cursor = {}
+
+    counts = {}
+    for field in EXPIRY_FIELDS:
+        counts[field], after = await _scan_field(db, field, today, _load_cursor(cursor, field))
+        if after is not None:
+            cursor[field] = [after[0].isoformat(), str(after[1])]
+    if full:
+        cursor["full_scan_at"] = now.isoformat()
+
+    await checkpoint_service.save_checkpoint(db, CHECKPOINT_NAME, last_timestamp=now, cursor=cursor)
+    await db.commit()
+    return {"full_scan": full, "requested": counts, "total_requested": sum(counts.values())}
+
+
+async def run_scan_once(full: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Run one scan under a session-level advisory lock held on a dedicated
+    connection (the scan itself commits per batch). Returns None if another
+    worker is already scanning.
+    """
+    async with async_engine.connect() as lock_conn:
+        locked = (await lock_conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": SCAN_LOCK_ID})).scalar()
+        await lock_conn.commit()
+        if not locked:
+            return None
+        try:
+            async with AsyncSessionLocal() as db:
+                return await scan_expiring_assets(db, full=full)
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SCAN_LOCK_ID})
+            await lock_conn.commit()
+
+
+async def run_renewal_scanner():
+    """
+    Background loop: queue expiring assets every RENEWAL_SCAN_INTERVAL_SECONDS.
+    """
+    while True:
+        try:
+            result = await run_scan_once()
+            if result and result["total_requested"]:
+                print(f"[RENEWALS] {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[RENEWALS] Expiry scan failed: {e}")
+        await asyncio.sleep(settings.RENEWAL_SCAN_INTERVAL_SECONDS)
+
+
+async def get_renewal_queue_page(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    renewal_status: str = "Requested",
+    urgency: Optional[str] = None,
+) -> Tuple[List[AssetResponse], Optional[str]]:
+    """
+    Assets at one stage of the renewal flow, soonest expiry first, keyed on
+    (next expiry, id). Returns the page and the cursor for the next one.
+    Raises ValueError for an unknown stage or a malformed cursor.
+    """
+    if renewal_status not in QUEUE_STATUSES:
+        raise ValueError(f"Unknown renewal stage '{renewal_status}'. Allowed: {', '.join(QUEUE_STATUSES)}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    next_expiry = NEXT_EXPIRY.label("next_expiry")
+    query = select(Asset, next_expiry).where(Asset.renewal_status == renewal_status)
+    if urgency:
+        query = query.where(Asset.renewal_urgency == urgency)
+
+    anchor = decode_cursor(cursor, 2)
+    if anchor:
+        try:
+            anchor_date = date.fromisoformat(anchor[0]) if anchor[0] is not None else None
+            anchor_id = UUID(anchor[1])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if anchor_date is None:
+            # Assets without any expiry date sort last
+            query = query.where(and_(NEXT_EXPIRY.is_(None), Asset.id > anchor_id))
+        else:
+            query = query.where(or_(
+                NEXT_EXPIRY.is_(None),
+                tuple_(NEXT_EXPIRY, Asset.id) > tuple_(literal(anchor_date), literal(anchor_id)),
+            ))
+
+    query = query.order_by(NEXT_EXPIRY.asc().nulls_last(), Asset.id).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [AssetResponse.model_validate(asset) for asset, _ in rows]
+    next_cursor = None
+    if has_more and rows:
+        last_asset, last_expiry = rows[-1]
+        next_cursor = encode_cursor([last_expiry, last_asset.id])
+    return items, next_cursor
@@ -0,0 +1,173 @@
+"""
+Search service - Ranked trigram / full-text search over assets, tickets and asset requests (Asynchronous)
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, literal, literal_column, or_
+from ..models.models import Asset, AssetRequest, Ticket, indexed_expression
+from ..schemas.spec_query_schema import SpecPredicate
+from . import spec_query_service
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_QUERY_LENGTH = 200
+# pg_trgm cannot use the index for patterns shorter than one trigram
+MIN_TRIGRAM_LENGTH = 3
+
+
+def _target(model, index_prefix: str, config: str, columns: Sequence) -> Dict[str, Any]:
+    return {
+        "model": model,
+        "config": literal_column(f"'{config}'::regconfig"),
+        "document": indexed_expression(model, f"{index_prefix}_trgm"),
+        "vector": indexed_expression(model, f"{index_prefix}_tsv"),
+        "columns": columns,
+    }
+
+
+TARGETS = {
+    "assets": _target(Asset, "ix_assets_search", "simple", (
+        Asset.id, Asset.name, Asset.type, Asset.serial_number, Asset.model,
+        Asset.vendor, Asset.location, Asset.status, Asset.assigned_to,
+    )),
+    "tickets": _target(Ticket, "ix_tickets_search", "english", (
+        Ticket.id, Ticket.subject, Ticket.status, Ticket.priority, Ticket.category, Ticket.created_at,
+    )),
+    "requests": _target(AssetRequest, "ix_asset_requests_search", "english", (
+        AssetRequest.id, AssetRequest.asset_name, AssetRequest.asset_type, AssetRequest.status,
+        AssetRequest.requester_id, AssetRequest.created_at,
+    )),
+}
+
+
+def parse_types(types: Optional[str]) -> List[str]:
+    """Comma-separated entity names (all when empty). Raises ValueError for unknown names."""
+    if not types:
+        return list(TARGETS)
+    selected = [name.strip() for name in types.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in TARGETS]
+    if unknown:
+        raise ValueError(f"Unknown search type(s) {', '.join(unknown)}. Allowed: {', '.join(TARGETS)}")
+    return selected
+
+
+def spec_filters(specs: Optional[Sequence[str]]) -> List[Any]:
+    """
+    Asset specification filters, translated by spec_query_service:
+    "path=value" is an equality match (@> on ix_asset_specifications_gin, or the
+    expression index for hot paths like os.name), dotted paths for nested keys
+    (hardware.cpu=i7), and a bare "key" / "a.b" requires the key to exist.
+    Values are compared as strings. Raises ValueError for an invalid path.
+    """
+    conditions = []
+    for spec in specs or []:
+        path, has_value, value = spec.partition("=")
+        predicate = SpecPredicate(path=path, op="eq", value=value.strip()) if has_value else SpecPredicate(path=path, op="exists")
+        conditions.append(spec_query_service.asset_spec_condition(predicate))
+    return conditions
+
+
+def _prefix_tsquery(q: str) -> Optional[str]:
+    """to_tsquery input matching every word, the last one as a prefix (typeahead)"""
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return None
+    terms[-1] += ":*"
+    return " & ".join(terms)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_search_query(
+    entity: str,
+    q: Optional[str],
+    limit: int = DEFAULT_LIMIT,
+    typeahead: bool = True,
+    filters: Sequence[Any] = (),
+):
+    """
+    Best matches for q in one entity, highest rank first. A row matches when
+    its tsvector matches the query (the last word as a prefix in typeahead
+    mode, web-search syntax otherwise) or, for 3+ characters, when the text
+    contains q (trigram index). Rank is ts_rank_cd plus trigram word similarity.
+    Without q, the filters alone select the newest rows.
+    Returns None when q cannot match anything.
+    """
+    target = TARGETS[entity]
+    model = target["model"]
+    conditions = list(filters)
+    rank = literal(0.0)
+
+    if q:
+        if typeahead:
+            tsquery_text = _prefix_tsquery(q)
+            tsquery = func.to_tsquery(target["config"], tsquery_text) if tsquery_text else None
+        else:
+            tsquery = func.websearch_to_tsquery(target["config"], q)
+        matches = []
+        if tsquery is not None:
+            matches.append(target["vector"].op("@@")(tsquery))
+            rank = func.ts_rank_cd(target["vector"], tsquery, 32)
+        if len(q) >= MIN_TRIGRAM_LENGTH:
+            matches.append(target["document"].ilike(f"%{_escape_like(q)}%", escape="\\"))
+            rank = rank + func.word_similarity(q, target["document"])
+        if not matches:
+            return None
+        conditions.append(or_(*matches))
+
+    rank = rank.label("rank")
+    query = select(*target["columns"], rank).where(*conditions)
+    if q:
+        query = query.order_by(rank.desc(), model.id)
+    else:
+        query = query.order_by(model.created_at.desc(), model.id)
+    return query.limit(limit)
+
+
+async def search_entity(db: AsyncSession, entity: str, q: Optional[str], **options) -> List[Dict[str, Any]]:
+    """Run build_search_query; options are its limit / typeahead / filters"""
+    query = build_search_query(entity, q, **options)
+    if query is None:
+        return []
+    return [dict(row) for row in (await db.execute(query)).mappings()]
+
+
+async def search(
+    db: AsyncSession,
+    q: Optional[str],
+    types: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    typeahead: bool = True,
+    status: Optional[str] = None,
+    specs: Optional[Sequence[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Ranked results per entity ({"assets": [...], "tickets": [...], "requests": [...]}).
+    Specification filters only apply to assets, so they restrict the search to assets.
+    Raises ValueError for an invalid query, type or specification filter.
+    """
+    q = (q or "").strip()
+    if len(q) > MAX_QUERY_LENGTH:
+        raise ValueError(f"Query exceeds {MAX_QUERY_LENGTH} characters")
+    entities = parse_types(types)
+    asset_filters = spec_filters(specs)
+    if asset_filters:
+        entities = [entity for entity in entities if entity == "assets"]
+        if not entities:
+            raise ValueError("Specification filters only apply to assets")
+    if not q and not asset_filters:
+        raise ValueError("Provide a query or at least one specification filter")
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    results = {}
+    for entity in entities:
+        model = TARGETS[entity]["model"]
+        filters = list(asset_filters) if entity == "assets" else []
+        if status:
+            filters.append(model.status == status)
+        results[entity] = await search_entity(db, entity, q, limit=limit, typeahead=typeahead, filters=filters)
+    return results
@@ -0,0 +1,135 @@
+"""
+Spec query service - Translates structured JSONB predicates into index-backed
+containment / key / jsonpath queries (Asynchronous)
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import and_, bindparam, or_
+from sqlalchemy.dialects.postgresql import JSONPATH
+from ..models.models import Asset, indexed_expression
+from ..schemas.asset_schema import AssetResponse
+from ..schemas.spec_query_schema import SpecPredicate
+from ..utils.pagination import encode_cursor, decode_cursor
+
+MAX_PATH_DEPTH = 8
+MAX_IN_VALUES = 100
+
+# String equality on these paths uses their btree expression index
+# (->> text) instead of the GIN containment match
+HOT_PATHS = {
+    ("os", "name"): "ix_assets_spec_os_name",
+    ("os", "version"): "ix_assets_spec_os_version",
+    ("hardware", "ram"): "ix_assets_spec_hardware_ram",
+}
+_HOT_EXPRESSIONS = {path: indexed_expression(Asset, name) for path, name in HOT_PATHS.items()}
+
+COMPARISONS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def parse_path(path: str) -> Tuple[str, ...]:
+    """Dotted path into keys. Raises ValueError for empty segments or excessive depth."""
+    keys = tuple(key.strip() for key in path.split("."))
+    if not all(keys):
+        raise ValueError(f"Invalid path '{path}'")
+    if len(keys) > MAX_PATH_DEPTH:
+        raise ValueError(f"Path '{path}' is deeper than {MAX_PATH_DEPTH} keys")
+    return keys
+
+
+def _nested(keys: Sequence[str], value: Any) -> Dict[str, Any]:
+    document = value
+    for key in reversed(keys):
+        document = {key: document}
+    return document
+
+
+def _jsonpath(keys: Sequence[str], condition: Optional[str] = None) -> str:
+    """$."k1"."k2" with optional filter; keys are quoted so any key name is safe"""
+    path = "$" + "".join("." + json.dumps(key) for key in keys)
+    return f"{path} ? ({condition})" if condition else path
+
+
+def _equals(column, keys: Tuple[str, ...], value: Any, hot_paths: Dict):
+    if isinstance(value, str) and keys in hot_paths:
+        return hot_paths[keys] == value
+    return column.contains(_nested(keys, value))
+
+
+def predicate_condition(column, predicate: SpecPredicate, hot_paths: Optional[Dict] = None):
+    """
+    One predicate on a JSONB column, in a form its GIN index (jsonb_ops) answers:
+    eq -> @> (or = on a hot-path expression index), in -> OR of eq,
+    exists -> ? for a top-level key, @? jsonpath for nested keys,
+    gt/gte/lt/lte -> @? jsonpath filter (the index narrows by key, the filter rechecks).
+    Raises ValueError for an invalid path or value.
+    """
+    hot_paths = hot_paths or {}
+    keys = parse_path(predicate.path)
+    op, value = predicate.op, predicate.value
+
+    if op == "eq":
+        return _equals(column, keys, value, hot_paths)
+    if op == "in":
+        if not isinstance(value, list) or not value:
+            raise ValueError(f"'in' on '{predicate.path}' needs a non-empty list")
+        if len(value) > MAX_IN_VALUES:
+            raise ValueError(f"'in' on '{predicate.path}' accepts at most {MAX_IN_VALUES} values")
+        return or_(*[_equals(column, keys, item, hot_paths) for item in value])
+    if op == "exists":
+        if len(keys) == 1:
+            return column.has_key(keys[0])
+        return column.op("@?")(bindparam(None, _jsonpath(keys), type_=JSONPATH))
+    # Range comparison
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"'{op}' on '{predicate.path}' needs a number or string")
+    condition = f"@ {COMPARISONS[op]} {json.dumps(value)}"
+    return column.op("@?")(bindparam(None, _jsonpath(keys, condition), type_=JSONPATH))
+
+
+def build_conditions(column, predicates: Sequence[SpecPredicate], match: str = "all", hot_paths: Optional[Dict] = None):
+    """All (AND) or any (OR) of the predicates on column"""
+    conditions = [predicate_condition(column, predicate, hot_paths) for predicate in predicates]
+    return and_(*conditions) if match == "all" else or_(*conditions)
+
+
+def asset_spec_condition(predicate: SpecPredicate):
+    """One predicate on Asset.specifications, using the hot-path expression indexes"""
+    return predicate_condition(Asset.specifications, predicate, _HOT_EXPRESSIONS)
+
+
+def build_assets_query(predicates: Sequence[SpecPredicate], match: str = "all", limit: int = 100, after: Optional[UUID] = None):
+    """Assets matching the predicates on specifications, in id order from after"""
+    query = select(Asset).where(build_conditions(Asset.specifications, predicates, match, _HOT_EXPRESSIONS))
+    if after is not None:
+        query = query.where(Asset.id > after)
+    return query.order_by(Asset.id).limit(limit)
+
+
+async def query_assets(
+    db: AsyncSession,
+    predicates: Sequence[SpecPredicate],
+    match: str = "all",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Tuple[List[AssetResponse], Optional[str]]:
+    """
+    Keyset-paginated assets whose specifications match the predicates.
+    Returns the page and the cursor for the next one.
+    Raises ValueError for an invalid predicate or a malformed cursor.
+    """
+    after = None
+    anchor = decode_cursor(cursor, 1)
+    if anchor:
+        try:
+            after = UUID(anchor[0])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    rows = (await db.execute(build_assets_query(predicates, match, limit + 1, after))).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor([rows[-1].id]) if has_more and rows else None
+    return [AssetResponse.model_validate(asset) for asset in rows], next_cursor
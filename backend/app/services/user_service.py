@@ -1,14 +1,27 @@
+from typing import Dict, Iterable, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, or_
 from ..models.models import User
 from ..schemas.user_schema import UserCreate, UserUpdate
+from ..utils.principal_cache import invalidate_principal
 import uuid
 from uuid import UUID
 
 from passlib.context import CryptContext
+from ..config.settings import settings
+from ..utils.password_hasher import password_hasher
 
 # Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max pinned to the configured cost so hashes made with any other cost
+# report needs_update() and are transparently rehashed on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
@@ -20,6 +33,24 @@ def verify_password(plain_password, hashed_password):
         # Fallback to plain text comparison for dev seeds if they are not hashed
         return plain_password == hashed_password
 
+def _verify_and_check_update(plain_password, hashed_password):
+    """Returns (is_valid, needs_rehash)"""
+    try:
+        valid = pwd_context.verify(plain_password, hashed_password)
+        return valid, valid and pwd_context.needs_update(hashed_password)
+    except Exception:
+        # Plain text dev seed: upgrade it to a real hash once it verifies
+        valid = plain_password == hashed_password
+        return valid, valid
+
+async def get_password_hash_async(password):
+    """Hash on the bounded password worker pool (never blocks the event loop)"""
+    return await password_hasher.run(get_password_hash, password)
+
+async def verify_password_async(plain_password, hashed_password):
+    """Verify on the bounded password worker pool. Returns (is_valid, needs_rehash)"""
+    return await password_hasher.run(_verify_and_check_update, plain_password, hashed_password)
+
 async def get_user_by_email(db: AsyncSession, email: str):
     result = await db.execute(select(User).filter(User.email == email))
     return result.scalars().first()
@@ -29,7 +60,7 @@ async def get_user(db: AsyncSession, user_id: UUID):
     return result.scalars().first()
 
 async def create_user(db: AsyncSession, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         id=uuid.uuid4(),
         email=user.email,
@@ -53,11 +84,17 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    is_valid, needs_rehash = await verify_password_async(password, user.password_hash)
+    if not is_valid:
         return None
     # Check if user is active
     if user.status != "ACTIVE":
         return None
+    if needs_rehash:
+        # Cost factor changed (or legacy plain text): store a fresh hash
+        user.password_hash = await get_password_hash_async(password)
+        await db.commit()
+        await db.refresh(user)
     return user
 
 async def activate_user(db: AsyncSession, user_id: UUID) -> User:
@@ -71,6 +108,7 @@ async def activate_user(db: AsyncSession, user_id: UUID) -> User:
     user.status = "ACTIVE"
     await db.commit()
     await db.refresh(user)
+    invalidate_principal(user.id)
     return user
 
 async def get_users(db: AsyncSession, status: str = None):
@@ -79,3 +117,47 @@ async def get_users(db: AsyncSession, status: str = None):
         query = query.filter(User.status == status)
     result = await db.execute(query)
     return result.scalars().all()
+
+
+def _as_uuid(ref: str) -> Optional[UUID]:
+    try:
+        return UUID(ref)
+    except ValueError:
+        return None
+
+
+async def resolve_user_ids(db: AsyncSession, refs: Iterable[str]) -> Dict[str, UUID]:
+    """
+    Map user references (id, email or full name, any case) to user ids in one
+    query, preferring an id match, then email, then the oldest user with that
+    name. Keys are the lowercased references; unknown references are left out.
+    """
+    keys = {str(ref).strip().lower() for ref in refs if ref and str(ref).strip()}
+    if not keys:
+        return {}
+    id_keys = {uid: key for uid, key in ((_as_uuid(key), key) for key in keys) if uid}
+    conditions = [func.lower(User.email).in_(keys), func.lower(User.full_name).in_(keys)]
+    if id_keys:
+        conditions.append(User.id.in_(list(id_keys)))
+    rows = (await db.execute(
+        select(User.id, User.email, User.full_name).where(or_(*conditions)).order_by(User.created_at, User.id)
+    )).all()
+
+    resolved: Dict[str, UUID] = {}
+    for user_id, _, _ in rows:
+        if user_id in id_keys:
+            resolved[id_keys[user_id]] = user_id
+    for user_id, email, _ in rows:
+        if email and email.lower() in keys:
+            resolved.setdefault(email.lower(), user_id)
+    for user_id, _, full_name in rows:
+        if full_name and full_name.lower() in keys:
+            resolved.setdefault(full_name.lower(), user_id)
+    return resolved
+
+
+async def resolve_user_id(db: AsyncSession, ref: Optional[str]) -> Optional[UUID]:
+    """Single-reference form of resolve_user_ids"""
+    if not ref or not str(ref).strip():
+        return None
+    return (await resolve_user_ids(db, [ref])).get(str(ref).strip().lower())
@@ -1,11 +1,19 @@
 """
 API Token utilities for external system authentication (Asynchronous)
 """
+import asyncio
+import hashlib
+import hmac
 import secrets
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
 from ..database.database import AsyncSessionLocal
 from ..models.models import ApiToken
+from ..config.settings import settings
 from sqlalchemy.future import select
+from sqlalchemy import update
 
 async def generate_api_token(name: str, created_by: str = None, expires_days: int = None):
     """
@@ -39,41 +47,163 @@ async def generate_api_token(name: str, created_by: str = None, expires_days: in
             await db.rollback()
             raise
 
+class _CachedToken:
+    __slots__ = ("token_id", "digest", "is_valid", "expires_at", "cached_at")
+
+    def __init__(self, token_id, digest, is_valid, expires_at, cached_at):
+        self.token_id = token_id
+        self.digest = digest
+        self.is_valid = is_valid
+        self.expires_at = expires_at
+        self.cached_at = cached_at
+
+
+class ApiTokenCache:
+    """
+    TTL + LRU cache of token validity, keyed by the SHA-256 digest of the token.
+    Entries are per process: revoke_api_token invalidates the local copy and
+    other workers converge within the TTL.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, _CachedToken]" = OrderedDict()
+
+    def get(self, digest: bytes) -> Optional[_CachedToken]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.cached_at > self.ttl_seconds or not hmac.compare_digest(entry.digest, digest):
+            self._entries.pop(digest, None)
+            return None
+        self._entries.move_to_end(digest)
+        return entry
+
+    def put(self, entry: _CachedToken):
+        self._entries[entry.digest] = entry
+        self._entries.move_to_end(entry.digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_token_id(self, token_id: str):
+        for digest in [d for d, e in self._entries.items() if e.token_id == token_id]:
+            self._entries.pop(digest, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_token_cache = ApiTokenCache(settings.API_TOKEN_CACHE_TTL_SECONDS, settings.API_TOKEN_CACHE_MAX_ENTRIES)
+
+# token_id -> most recent use, flushed to the database in one batched UPDATE
+_pending_last_used: Dict[str, datetime] = {}
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 async def validate_api_token(token: str) -> bool:
     """
     Validate if token is active and not expired
     
+    Served from the in-memory token cache; the database is only read on a miss.
+    last_used_at is recorded in memory and written by flush_last_used().
+    
     Args:
         token: The API token to validate
     
     Returns:
         bool: True if valid, False otherwise
     """
+    digest = _digest(token)
+    entry = _token_cache.get(digest)
+    
+    if entry is None:
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await db.execute(
+                    select(ApiToken.id, ApiToken.expires_at).filter(
+                        ApiToken.token == token,
+                        ApiToken.is_active == True
+                    )
+                )
+                row = result.first()
+            except Exception as e:
+                print(f"Error validating token: {e}")
+                return False
+        # Unknown/inactive tokens are cached too, so bad tokens don't hammer the DB
+        entry = _CachedToken(
+            token_id=row.id if row else None,
+            digest=digest,
+            is_valid=row is not None,
+            expires_at=_as_utc(row.expires_at) if row else None,
+            cached_at=time.monotonic()
+        )
+        _token_cache.put(entry)
+    
+    if not entry.is_valid:
+        return False
+    
+    # Check expiration
+    now = datetime.now(timezone.utc)
+    if entry.expires_at and entry.expires_at < now:
+        return False
+    
+    _pending_last_used[entry.token_id] = now
+    return True
+
+
+async def flush_last_used() -> int:
+    """
+    Write the coalesced last_used_at timestamps with one batched UPDATE.
+    
+    Returns:
+        int: Number of tokens updated
+    """
+    if not _pending_last_used:
+        return 0
+    pending = dict(_pending_last_used)
+    _pending_last_used.clear()
+    
     async with AsyncSessionLocal() as db:
         try:
-            result = await db.execute(
-                select(ApiToken).filter(
-                    ApiToken.token == token,
-                    ApiToken.is_active == True
-                )
+            await db.execute(
+                update(ApiToken),
+                [{"id": token_id, "last_used_at": used_at} for token_id, used_at in pending.items()]
             )
-            api_token = result.scalars().first()
-            
-            if not api_token:
-                return False
-            
-            # Check expiration
-            if api_token.expires_at and api_token.expires_at < datetime.now():
-                return False
-            
-            # Update last_used_at
-            api_token.last_used_at = datetime.now()
             await db.commit()
-            
-            return True
+            return len(pending)
         except Exception as e:
-            print(f"Error validating token: {e}")
-            return False
+            print(f"Error flushing token last_used_at: {e}")
+            await db.rollback()
+            # Keep the newest timestamps for the next attempt
+            for token_id, used_at in pending.items():
+                if _pending_last_used.get(token_id, used_at) <= used_at:
+                    _pending_last_used[token_id] = used_at
+            return 0
+
+
+async def run_last_used_flusher():
+    """
+    Background task: flush last_used_at every API_TOKEN_LAST_USED_FLUSH_SECONDS.
+    Flushes once more when cancelled (application shutdown).
+    """
+    try:
+        while True:
+            await asyncio.sleep(settings.API_TOKEN_LAST_USED_FLUSH_SECONDS)
+            await flush_last_used()
+    except asyncio.CancelledError:
+        await flush_last_used()
+        raise
+
 
 async def revoke_api_token(token_id: str):
     """
@@ -92,6 +222,7 @@ async def revoke_api_token(token_id: str):
             if api_token:
                 api_token.is_active = False
                 await db.commit()
+                _token_cache.invalidate_token_id(api_token.id)
                 print(f"✓ Revoked token: {api_token.name}")
                 return True
             return False
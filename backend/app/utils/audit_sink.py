@@ -0,0 +1,285 @@
+"""
+Audit sink - batches audit log writes off the request path
+"""
+import asyncio
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from .metrics import Histogram
+from ..config.settings import settings
+
+SYNC = "sync"
+ASYNC = "async"
+
+MAX_INSERT_ROWS = 4000
+# Most recent dead-lettered rows kept for the metrics endpoint
+DEAD_LETTER_KEEP = 100
+
+
+def _is_transient(error: Exception) -> bool:
+    """Connection-level failures say nothing about the rows, so they are retried as a whole"""
+    return isinstance(error, (OperationalError, InterfaceError, DisconnectionError, OSError, asyncio.TimeoutError))
+
+
+class AuditSink:
+    """
+    Bounded in-process queue of audit rows, drained by a background task that
+    writes them with multi-row INSERTs.
+
+    Durability is chosen per action:
+    - sync: the row is added to the caller's session and commits atomically
+      with the change it describes (compliance-critical actions)
+    - async: the row is queued and written within flush_interval seconds;
+      when the queue is full new events are dropped and counted (telemetry)
+
+    A batch the database rejects is split in halves until the offending rows
+    are isolated; those are retried up to max_attempts times and then
+    dead-lettered, so one bad row cannot stall the queue.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float, async_actions: List[str], max_attempts: int = 3):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.async_actions = set(async_actions)
+        self.max_attempts = max(1, max_attempts)
+        # (row, queued_at, failed attempts)
+        self._queue: Deque[tuple] = deque()
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=DEAD_LETTER_KEEP)
+        self._wakeup: Optional[asyncio.Event] = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self.dead_lettered = 0
+        self.sync_writes = 0
+        self.delay_ms = Histogram()
+        self.batch_rows = Histogram(buckets=(1, 10, 50, 100, 250, 500, 1000, 5000))
+        self.write_ms = Histogram()
+
+    def _get_wakeup(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    def durability_for(self, action: str) -> str:
+        return ASYNC if action in self.async_actions else SYNC
+
+    @staticmethod
+    def build_row(entity_type: str, entity_id: Any, action: str, performed_by: Any = None, details: Optional[Dict] = None) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "entity_type": entity_type,
+            "entity_id": str(entity_id),
+            "action": action,
+            "performed_by": str(performed_by) if performed_by is not None else None,
+            "details": details,
+            # Stamped at emit time so delayed writes keep the real event time
+            "timestamp": datetime.now(timezone.utc),
+        }
+
+    def emit(self, entity_type: str, entity_id: Any, action: str, performed_by: Any = None, details: Optional[Dict] = None) -> bool:
+        """Queue an audit row without waiting. Returns False if the queue was full and it was dropped."""
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return False
+        self._queue.append((self.build_row(entity_type, entity_id, action, performed_by, details), time.perf_counter(), 0))
+        self.enqueued += 1
+        if len(self._queue) >= self.batch_size:
+            self._get_wakeup().set()
+        return True
+
+    def record(
+        self,
+        db: AsyncSession,
+        entity_type: str,
+        entity_id: Any,
+        action: str,
+        performed_by: Any = None,
+        details: Optional[Dict] = None,
+        durability: Optional[str] = None,
+    ):
+        """
+        Record an audit event with the configured durability for its action.
+        Sync rows are added to db and persist with the caller's commit.
+        """
+        from ..models.models import AuditLog
+
+        if (durability or self.durability_for(action)) == ASYNC:
+            self.emit(entity_type, entity_id, action, performed_by, details)
+            return
+        db.add(AuditLog(**self.build_row(entity_type, entity_id, action, performed_by, details)))
+        self.sync_writes += 1
+
+    async def record_many(self, db: AsyncSession, events: List[Dict[str, Any]]):
+        """
+        Record many audit events (dicts of record() keyword arguments).
+        Sync rows are written as multi-row INSERTs in the caller's transaction.
+        """
+        from ..models.models import AuditLog
+
+        rows = []
+        for event in events:
+            event = dict(event)
+            durability = event.pop("durability", None)
+            if (durability or self.durability_for(event["action"])) == ASYNC:
+                self.emit(**event)
+            else:
+                rows.append(self.build_row(**event))
+        # 7 columns per row keeps each statement under asyncpg's 32767 bind parameters
+        for start in range(0, len(rows), MAX_INSERT_ROWS):
+            await db.execute(insert(AuditLog).values(rows[start:start + MAX_INSERT_ROWS]))
+        self.sync_writes += len(rows)
+
+    async def _write(self, batch: List[tuple]):
+        from ..database.database import AsyncSessionLocal
+        from ..models.models import AuditLog
+
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(AuditLog).values([item[0] for item in batch]))
+            await db.commit()
+        finished = time.perf_counter()
+        self.write_ms.observe((finished - started) * 1000)
+        self.batch_rows.observe(len(batch))
+        for _, queued_at, _ in batch:
+            self.delay_ms.observe((finished - queued_at) * 1000)
+        self.written += len(batch)
+
+    def _take_batch(self) -> List[tuple]:
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        return batch
+
+    def _requeue(self, items: List[tuple], front: bool = False):
+        """Put rows back unless that would overflow the queue; the overflow is dropped"""
+        room = max(self.max_queue - len(self._queue), 0)
+        if front:
+            # Oldest first
+            self._queue.extendleft(reversed(items[:room]))
+        else:
+            self._queue.extend(items[:room])
+        self.dropped += max(len(items) - room, 0)
+
+    def _dead_letter(self, item: tuple, error: Exception):
+        row = item[0]
+        self.dead_lettered += 1
+        self.dead_letters.append({
+            "id": row["id"],
+            "entity_type": row["entity_type"],
+            "entity_id": row["entity_id"],
+            "action": row["action"],
+            "timestamp": row["timestamp"].isoformat(),
+            "attempts": item[2],
+            "error": str(error)[:500],
+        })
+        print(f"[AUDIT SINK] Dead-lettered audit row {row['id']} ({row['action']} {row['entity_type']} {row['entity_id']}) after {item[2]} attempts: {error}")
+
+    async def _write_isolating(self, batch: List[tuple], written: set) -> List[tuple]:
+        """
+        Write batch, splitting it in halves on a row-level failure until the
+        rejected rows are isolated. Returns the rows to retry; rows out of
+        attempts are dead-lettered. Ids of committed rows are added to written.
+        Connection-level errors are raised.
+        """
+        try:
+            await self._write(batch)
+            written.update(item[0]["id"] for item in batch)
+            return []
+        except Exception as e:
+            if _is_transient(e):
+                raise
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                retry = await self._write_isolating(batch[:middle], written)
+                return retry + await self._write_isolating(batch[middle:], written)
+            row, queued_at, attempts = batch[0]
+            item = (row, queued_at, attempts + 1)
+            if item[2] >= self.max_attempts:
+                self._dead_letter(item, e)
+                return []
+            return [item]
+
+    async def flush(self):
+        """
+        Write everything currently queued. Rejected rows go to the back of the
+        queue for another attempt; a connection-level failure requeues the
+        unwritten rows at the front and is raised so the caller backs off.
+        """
+        while self._queue:
+            batch = self._take_batch()
+            try:
+                await self._write(batch)
+                continue
+            except Exception as e:
+                self.failed_batches += 1
+                print(f"[AUDIT SINK] Failed to write {len(batch)} audit rows: {e}")
+                if _is_transient(e):
+                    self._requeue(batch, front=True)
+                    raise
+            written: set = set()
+            try:
+                retry = await self._write_isolating(batch, written)
+            except Exception:
+                self._requeue([item for item in batch if item[0]["id"] not in written], front=True)
+                raise
+            self._requeue(retry)
+
+    async def run(self):
+        """
+        Background writer: flush every flush_interval seconds, or sooner once a
+        full batch is queued. Flushes whatever is left when cancelled.
+        """
+        wakeup = self._get_wakeup()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+                try:
+                    await self.flush()
+                except Exception:
+                    # Rows were requeued; back off before retrying
+                    await asyncio.sleep(self.flush_interval)
+        except asyncio.CancelledError:
+            try:
+                await self.flush()
+            except Exception:
+                pass
+            raise
+
+    def metrics(self) -> Dict:
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "async_actions": sorted(self.async_actions),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+            "dead_lettered": self.dead_lettered,
+            "recent_dead_letters": list(self.dead_letters),
+            "sync_writes": self.sync_writes,
+            "delay_ms": self.delay_ms.snapshot(),
+            "batch_rows": self.batch_rows.snapshot(),
+            "write_ms": self.write_ms.snapshot(),
+        }
+
+
+audit_sink = AuditSink(
+    settings.AUDIT_SINK_MAX_QUEUE,
+    settings.AUDIT_SINK_BATCH_SIZE,
+    settings.AUDIT_SINK_FLUSH_INTERVAL_SECONDS,
+    settings.AUDIT_ASYNC_ACTIONS,
+    settings.AUDIT_SINK_MAX_ATTEMPTS,
+)
@@ -8,6 +8,8 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..database.database import AsyncSessionLocal
 from ..services import user_service
+from ..config.settings import settings
+from .principal_cache import Principal, principal_cache
 
 # Configuration from environment variables
 SECRET_KEY = os.getenv("SECRET_KEY", "bc7Fz2VSGbGBPKb5lsLooQmSVY0f6rbYrfEtEWzP8L8")
@@ -39,10 +41,14 @@ def verify_token(token: str):
     except JWTError:
         return None
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
     """
-    Dependency to get current user from JWT token (Asynchronous).
+    Dependency to get current principal from JWT token (Asynchronous).
     Raises 401 if token is invalid or user not found.
+    
+    With AUTH_TRUST_TOKEN_CLAIMS the role/status claims signed into the token are
+    used as-is (no DB round-trip); otherwise the principal is loaded from the DB
+    and cached for AUTH_PRINCIPAL_CACHE_TTL_SECONDS.
     """
     
     credentials_exception = HTTPException(
@@ -59,11 +65,29 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     if user_id is None:
         raise credentials_exception
     
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and payload.get("role") and payload.get("status"):
+        try:
+            principal_id = uuid.UUID(user_id)
+        except ValueError:
+            raise credentials_exception
+        return Principal(
+            id=principal_id,
+            email=payload.get("sub"),
+            full_name=payload.get("name"),
+            role=payload["role"],
+            status=payload["status"],
+        )
+    
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
     # Use async session context manager
     async with AsyncSessionLocal() as db:
         user = await user_service.get_user(db, user_id)
         if user is None:
             raise credentials_exception
-        # Ensure user object remains usable after session close if needed, 
-        # but since it's a simple model without lazy relationships being accessed later, it should be fine.
-        return user
+        principal = Principal.from_user(user)
+    
+    principal_cache.put(principal)
+    return principal
@@ -0,0 +1,101 @@
+"""
+Job leases - lets several workers share background job tables without
+reclaiming each other's RUNNING jobs
+"""
+import asyncio
+import os
+import socket
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Awaitable, Callable
+from sqlalchemy import func, or_, update
+from ..config.settings import settings
+
+# Identifies this worker process in lease_owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"[:255]
+
+
+class LeaseLost(Exception):
+    """The job was reclaimed from this worker; another worker may be running it"""
+
+
+def claim_values() -> dict:
+    """Column values that take the lease when a job moves to RUNNING"""
+    return {"lease_owner": WORKER_ID, "heartbeat_at": func.now()}
+
+
+def lease_expired(model):
+    """RUNNING jobs whose owner stopped heartbeating (database clock, so workers need not agree on time)"""
+    return or_(
+        model.heartbeat_at.is_(None),
+        model.heartbeat_at < func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS),
+    )
+
+
+async def commit_owned(db, model, job_id, **values):
+    """
+    Write values onto a claimed job and commit, as one UPDATE guarded by this
+    worker's lease in the caller's transaction, so the job's other writes only
+    commit together with it. If the lease was lost, everything is rolled back
+    and LeaseLost is raised.
+    """
+    result = await db.execute(
+        update(model)
+        .where(model.id == job_id, model.status == "RUNNING", model.lease_owner == WORKER_ID)
+        .values(**values)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        raise LeaseLost(f"{model.__tablename__} {job_id} is no longer leased to {WORKER_ID}")
+    await db.commit()
+
+
+async def _beat(model, job_id):
+    from ..database.database import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(model)
+                    .where(model.id == job_id, model.lease_owner == WORKER_ID)
+                    .values(heartbeat_at=func.now())
+                )
+                await db.commit()
+            if result.rowcount == 0:
+                print(f"[JOBS] Lost the lease on {model.__tablename__} {job_id}")
+                return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[JOBS] Heartbeat for {model.__tablename__} {job_id} failed: {e}")
+
+
+@asynccontextmanager
+async def heartbeat(model, job_id):
+    """Keep this worker's lease on a claimed job fresh while the block runs"""
+    task = asyncio.create_task(_beat(model, job_id))
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def run_reaper(*reclaimers: Callable[[], Awaitable[list]]):
+    """
+    Background loop: every JOB_LEASE_SECONDS, let each service requeue the
+    jobs whose worker died, so they don't wait for the next restart.
+    """
+    while True:
+        await asyncio.sleep(settings.JOB_LEASE_SECONDS)
+        for reclaim in reclaimers:
+            try:
+                await reclaim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[JOBS] Reclaiming expired jobs failed: {e}")
@@ -0,0 +1,69 @@
+"""
+Fast JSON responses for large list endpoints (orjson / pydantic-core serialization)
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+# UTC datetimes as "...Z" and naive ones unchanged, matching pydantic's JSON output
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    """
+    JSONResponse replacement that encodes with orjson. Content that is already
+    JSON bytes (see models_response / rows_response) is sent as-is.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(
+        (name, None if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+
+def models_response(items: Sequence[BaseModel], model: Type[BaseModel], headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """
+    Serialize already-validated response models in one pydantic-core pass,
+    instead of FastAPI re-validating each item against response_model.
+    """
+    return FastJSONResponse(content=_list_adapter(model).dump_json(list(items)), headers=headers)
+
+
+def rows_response(rows: Iterable[Mapping[str, Any]], model: Type[BaseModel], headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """
+    Serialize DB row mappings straight to the response schema's JSON shape
+    (schema fields only, defaults for missing columns) without building models.
+    Only for queries whose columns already have the schema's types.
+    """
+    fields = _schema_fields(model)
+    payload = [{name: row.get(name, default) for name, default in fields} for row in rows]
+    return FastJSONResponse(content=dumps(payload), headers=headers)
@@ -0,0 +1,41 @@
+"""
+Keyset pagination helpers - opaque cursor encoding shared by list endpoints
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the keyset of the last row on a page into an opaque, URL-safe token.
+    Dates/datetimes are stored as ISO strings and UUIDs as strings.
+    """
+    payload = []
+    for value in values:
+        if isinstance(value, (datetime, date)):
+            payload.append(value.isoformat())
+        elif value is None or isinstance(value, (int, float, bool, str)):
+            payload.append(value)
+        else:
+            payload.append(str(value))
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """
+    Decode a token produced by encode_cursor.
+    Raises ValueError if the token is malformed or has the wrong number of keys.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,89 @@
+"""
+Bounded worker pool for bcrypt hashing/verification so it never blocks the event loop
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+from .metrics import Histogram
+from ..config.settings import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; surfaced to clients as 503"""
+
+
+class PasswordHasher:
+    """
+    Runs blocking password functions in a dedicated, size-bounded thread pool.
+    bcrypt releases the GIL, so the pool gives real parallelism while the event
+    loop keeps serving other requests. Submissions beyond workers + max_queue
+    are rejected instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.wait_ms = Histogram()
+        self.run_ms = Histogram()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwd-hash")
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy("Authentication service is busy, please retry")
+
+        self.in_flight += 1
+        submitted_at = time.perf_counter()
+
+        def timed_call():
+            started_at = time.perf_counter()
+            self.wait_ms.observe((started_at - submitted_at) * 1000)
+            self.running += 1
+            try:
+                return func(*args)
+            finally:
+                self.running -= 1
+                self.run_ms.observe((time.perf_counter() - started_at) * 1000)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), timed_call)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def metrics(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "running": self.running,
+            "queued": max(self.in_flight - self.running, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "wait_ms": self.wait_ms.snapshot(),
+            "run_ms": self.run_ms.snapshot(),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
@@ -0,0 +1,68 @@
+"""
+Authenticated principal cache - avoids a users-table lookup on every authenticated request
+"""
+import time
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from ..config.settings import settings
+
+
+class Principal:
+    """
+    The subset of a User that authorization checks need (id, role, status).
+    Returned by auth_utils.get_current_user instead of the ORM row.
+    """
+    __slots__ = ("id", "email", "full_name", "role", "status")
+
+    def __init__(self, id: UUID, email: Optional[str], full_name: Optional[str], role: str, status: Optional[str]):
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.role = role
+        self.status = status
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, email=user.email, full_name=user.full_name, role=user.role, status=user.status)
+
+    def __repr__(self):
+        return f"<Principal(id={self.id}, role={self.role}, status={self.status})>"
+
+
+class PrincipalCache:
+    """
+    Short-TTL cache of principals keyed by user_id.
+    Flows that change a user's role or status call invalidate_principal().
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[Principal, float]] = {}
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        entry = self._entries.get(str(user_id))
+        if entry is None:
+            return None
+        principal, cached_at = entry
+        if time.monotonic() - cached_at > self.ttl_seconds:
+            self._entries.pop(str(user_id), None)
+            return None
+        return principal
+
+    def put(self, principal: Principal):
+        if self.ttl_seconds > 0:
+            self._entries[str(principal.id)] = (principal, time.monotonic())
+
+    def invalidate(self, user_id):
+        self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(user_id):
+    """Drop the cached principal after the user's role or status changed"""
+    principal_cache.invalidate(user_id)
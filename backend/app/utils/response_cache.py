@@ -0,0 +1,395 @@
+"""
+Response cache - ETag / conditional GET and serialized body caching for polled list endpoints
+"""
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from ..config.settings import settings
+from ..database.replicas import replica_router
+
+CHANNEL = "itsm_table_versions"
+NOTIFY_SQL = text("SELECT pg_notify(:channel, :table || ':' || txid_current()::text)")
+
+# Response headers that are replayed from the cache (X-Next-Cursor carries keyset pagination)
+REPLAYED_HEADERS = ("content-type", "x-next-cursor")
+
+
+class CachedRoute:
+    """
+    A cacheable GET path, the tables its response is built from, and an optional
+    vary function returning the part of the key that depends on the caller
+    (e.g. role-based view). vary returning None bypasses the cache for that request.
+    """
+
+    def __init__(self, tables: Iterable[str], vary: Optional[Callable[[Request], Optional[str]]] = None):
+        self.tables = tuple(sorted(tables))
+        self.vary = vary
+
+
+class TableVersions:
+    """
+    Version token per table. Tokens are the committing transaction's txid,
+    broadcast to every worker with NOTIFY, so all workers agree on them and
+    ETags stay valid across workers. Until the listener is connected nothing
+    is cached, since writes from other workers would go unnoticed.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, str] = {}
+        self._bumped_at: Dict[str, float] = {}
+        self.synced = False
+
+    def reset(self, tables: Iterable[str]):
+        """Invalidate everything (after (re)connecting we may have missed notifications)"""
+        boot = uuid.uuid4().hex[:12]
+        for table in tables:
+            self._tokens[table] = f"b{boot}"
+
+    def bump(self, table: str, token: Optional[str] = None):
+        self._tokens[table] = token or f"l{uuid.uuid4().hex[:12]}"
+        self._bumped_at[table] = time.monotonic()
+
+    def seconds_since_write(self, tables: Iterable[str]) -> float:
+        last = max((self._bumped_at.get(table, 0.0) for table in tables), default=0.0)
+        return time.monotonic() - last
+
+    def get(self, tables: Iterable[str]) -> Optional[Tuple[str, ...]]:
+        if not self.synced:
+            return None
+        try:
+            return tuple(self._tokens[table] for table in tables)
+        except KeyError:
+            return None
+
+
+class LRUBodyCache:
+    """Bounded in-process cache of serialized responses (entry count and total bytes)"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old)
+        self._entries[key] = value
+        self.bytes += len(value)
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Optional shared body cache; keys embed the table versions so entries never go stale"""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(f"itsm:resp:{key}")
+
+    async def set(self, key: str, value: bytes):
+        await self.client.set(f"itsm:resp:{key}", value, ex=self.ttl_seconds)
+
+
+def _encode_entry(headers: List[Tuple[str, str]], body: bytes) -> bytes:
+    return json.dumps(headers).encode() + b"\n" + body
+
+
+def _decode_entry(entry: bytes) -> Tuple[List[Tuple[str, str]], bytes]:
+    head, body = entry.split(b"\n", 1)
+    return [tuple(h) for h in json.loads(head)], body
+
+
+class ResponseCache:
+    """
+    Middleware state for cached GET routes. The ETag is derived from the path,
+    query, caller scope and table versions only, so If-None-Match is answered
+    with 304 without touching the database; bodies are kept in a bounded LRU
+    and, optionally, a shared Redis backend.
+    """
+
+    def __init__(self, routes: Dict[str, CachedRoute], max_entries: int, max_bytes: int):
+        self.routes = routes
+        self.tracked_tables = {table for route in routes.values() for table in route.tables}
+        self.versions = TableVersions()
+        self.bodies = LRUBodyCache(max_entries, max_bytes)
+        self.shared: Optional[RedisBackend] = None
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bypassed = 0
+        self.shared_errors = 0
+
+    def configure_shared_backend(self, url: Optional[str]):
+        if not url:
+            return
+        try:
+            self.shared = RedisBackend(url, settings.RESPONSE_CACHE_SHARED_TTL_SECONDS)
+        except ImportError:
+            print("[RESPONSE CACHE] RESPONSE_CACHE_REDIS_URL is set but the 'redis' package is not installed; using the in-process cache only")
+
+    def _route_for(self, path: str) -> Optional[CachedRoute]:
+        if path.startswith("/api/v1/"):
+            path = path[len("/api/v1"):]
+        return self.routes.get(path.rstrip("/") or "/")
+
+    @staticmethod
+    def _etag(request: Request, scope: str, tokens: Tuple[str, ...]) -> str:
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        digest = hashlib.sha256("|".join((request.url.path, query, scope, *tokens)).encode()).hexdigest()
+        return f'"{digest[:40]}"'
+
+    async def _lookup(self, etag: str) -> Optional[bytes]:
+        entry = self.bodies.get(etag)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        if self.shared is not None:
+            try:
+                entry = await self.shared.get(etag)
+            except Exception:
+                self.shared_errors += 1
+                entry = None
+            if entry is not None:
+                self.shared_hits += 1
+                self.bodies.put(etag, entry)
+                return entry
+        return None
+
+    async def _store(self, etag: str, entry: bytes):
+        self.bodies.put(etag, entry)
+        if self.shared is not None:
+            try:
+                await self.shared.set(etag, entry)
+            except Exception:
+                self.shared_errors += 1
+
+    async def handle(self, request: Request, call_next):
+        """HTTP middleware body"""
+        if request.method != "GET" or not settings.RESPONSE_CACHE_ENABLED:
+            return await call_next(request)
+        route = self._route_for(request.url.path)
+        if route is None:
+            return await call_next(request)
+
+        tokens = self.versions.get(route.tables)
+        scope = route.vary(request) if route.vary else ""
+        if tokens is None or scope is None:
+            self.bypassed += 1
+            return await call_next(request)
+
+        etag = self._etag(request, scope, tokens)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization, Origin"}
+
+        if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            self.not_modified += 1
+            return Response(status_code=304, headers=cache_headers)
+
+        entry = await self._lookup(etag)
+        if entry is not None:
+            headers, body = _decode_entry(entry)
+            response = Response(content=body, status_code=200, headers={**dict(headers), **cache_headers})
+            response.headers["X-Cache"] = "HIT"
+            return response
+
+        self.misses += 1
+        response = await call_next(request)
+        if response.status_code != 200 or "set-cookie" in response.headers:
+            return response
+
+        # Right after a write a replica may still serve the old rows; don't pin them to the new version
+        if replica_router.enabled and self.versions.seconds_since_write(route.tables) <= settings.REPLICA_MAX_LAG_SECONDS:
+            self.bypassed += 1
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = [(name, value) for name, value in response.headers.items() if name in REPLAYED_HEADERS]
+        # Only cache under this key if nothing was written while the response was being built
+        if self.versions.get(route.tables) == tokens:
+            await self._store(etag, _encode_entry(headers, body))
+        response_headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+        response_headers.update(cache_headers)
+        response_headers["X-Cache"] = "MISS"
+        return Response(content=body, status_code=200, headers=response_headers)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        table, _, txid = payload.rpartition(":")
+        if table in self.tracked_tables:
+            self.versions.bump(table, f"t{txid}")
+
+    async def run_listener(self):
+        """
+        Background loop: LISTEN for table version notifications on a dedicated
+        connection. While disconnected the cache is bypassed.
+        """
+        import asyncpg
+        from ..database.database import DATABASE_URL
+
+        dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                await conn.add_listener(CHANNEL, self._on_notification)
+                self.versions.reset(self.tracked_tables)
+                self.versions.synced = True
+                while True:
+                    await asyncio.sleep(settings.RESPONSE_CACHE_LISTENER_PING_SECONDS)
+                    await conn.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[RESPONSE CACHE] Version listener disconnected: {e}")
+            finally:
+                self.versions.synced = False
+                if conn is not None and not conn.is_closed():
+                    try:
+                        await conn.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(settings.RESPONSE_CACHE_LISTENER_PING_SECONDS)
+
+    def metrics(self) -> Dict:
+        return {
+            "enabled": settings.RESPONSE_CACHE_ENABLED,
+            "synced": self.versions.synced,
+            "shared_backend": self.shared is not None,
+            "entries": len(self.bodies),
+            "bytes": self.bodies.bytes,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "bypassed": self.bypassed,
+            "shared_errors": self.shared_errors,
+        }
+
+
+# --- Write tracking: every session that writes a tracked table notifies all workers on commit ---
+
+def _notify_table(session: Session, table: str):
+    notified = session.info.setdefault("response_cache_tables", set())
+    if table in notified or table not in response_cache.tracked_tables:
+        return
+    notified.add(table)
+    # NOTIFY is transactional: delivered only if this transaction commits
+    session.connection().execute(NOTIFY_SQL, {"channel": CHANNEL, "table": table})
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            _notify_table(session, table.fullname)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_orm_dml(orm_execute_state):
+    # Bulk insert()/update()/delete() against mapped classes bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _notify_table(orm_execute_state.session, mapper.local_table.fullname)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_local_versions(session):
+    # Invalidate this worker immediately; the NOTIFY then sets the shared token
+    for table in session.info.pop("response_cache_tables", ()):
+        response_cache.versions.bump(table)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_tables(session):
+    session.info.pop("response_cache_tables", None)
+
+
+# --- Cached routes ---
+
+def requester_view_scope(request: Request) -> Optional[str]:
+    """
+    Cache scope for asset request lists: the role-based view that
+    _populate_requester_info builds (full procurement trail, PO summary, or basic).
+    """
+    from .auth_utils import verify_token
+    from .principal_cache import principal_cache
+    from ..services.asset_request_service import PROCUREMENT_VIEW_ROLES
+
+    authorization = request.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return "basic"
+    payload = verify_token(authorization[7:])
+    if payload is None:
+        return "basic"
+    role = payload.get("role")
+    if role is None and payload.get("user_id"):
+        principal = principal_cache.get(payload["user_id"])
+        role = principal.role if principal else None
+    if role is None:
+        # Unknown role: key per user rather than guess the view
+        return f"user:{payload.get('user_id')}"
+    if role in PROCUREMENT_VIEW_ROLES:
+        return "full"
+    if role == "IT_MANAGEMENT":
+        return "po"
+    return "basic"
+
+
+def asset_stats_scope(request: Request) -> Optional[str]:
+    """Stats come from the in-memory snapshot; bypass while it is due for a rebuild"""
+    from ..services.asset_service import _stats_snapshot
+
+    if not _stats_snapshot.is_fresh():
+        return None
+    return str(_stats_snapshot.refreshed_at)
+
+
+response_cache = ResponseCache(
+    {
+        # /assets lists the asset/BYOD union and resolves assignee names through auth.users
+        "/assets": CachedRoute(["asset.assets", "asset.byod_devices", "auth.users"]),
+        "/assets/stats": CachedRoute(["asset.assets"], vary=asset_stats_scope),
+        # requestor_name is joined from auth.users
+        "/tickets": CachedRoute(["support.tickets", "auth.users"]),
+        "/asset-requests": CachedRoute(
+            [
+                "asset.asset_requests",
+                "auth.users",
+                "procurement.purchase_orders",
+                "procurement.purchase_invoices",
+                "audit.procurement_logs",
+            ],
+            vary=requester_view_scope,
+        ),
+    },
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    settings.RESPONSE_CACHE_MAX_BYTES,
+)
+response_cache.configure_shared_backend(settings.RESPONSE_CACHE_REDIS_URL)
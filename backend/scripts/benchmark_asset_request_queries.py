@@ -0,0 +1,45 @@
+"""
+Benchmark: number of SQL statements issued by the asset request listing.
+The batched loader should keep the count constant as the page size grows.
+"""
+import sys
+import os
+import asyncio
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app.database.database import async_engine, AsyncSessionLocal
+from app.services import asset_request_service
+
+PAGE_SIZES = [10, 50, 100, 500]
+ROLES = [None, "IT_MANAGEMENT", "FINANCE"]
+
+
+async def run_benchmark():
+    print("=== ASSET REQUEST LISTING QUERY COUNT ===")
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        print(f"{'role':<15}{'page size':>10}{'rows':>8}{'queries':>10}{'ms':>10}")
+        for role in ROLES:
+            for size in PAGE_SIZES:
+                async with AsyncSessionLocal() as db:
+                    statements.clear()
+                    start = time.perf_counter()
+                    rows = await asset_request_service.get_all_asset_requests(db, limit=size, user_role=role)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"{str(role):<15}{size:>10}{len(rows):>8}{len(statements):>10}{elapsed:>10.1f}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
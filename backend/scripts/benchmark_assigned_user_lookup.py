@@ -0,0 +1,106 @@
+"""
+Benchmark: "assets of one user" lookups at scale.
+Compares the old string-matched predicates on assigned_to (sequential scan)
+with the indexed assigned_user_id lookup, on a temporary copy of the
+asset.assets assignment columns filled with synthetic rows.
+
+Usage: python scripts/benchmark_assigned_user_lookup.py [assets] [users] [iterations]
+"""
+import sys
+import os
+import asyncio
+import json
+import random
+import statistics
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.database.database import async_engine
+
+SETUP_SQL = [
+    """
+    CREATE TEMP TABLE bench_users AS
+    SELECT gen_random_uuid() AS id,
+           'user' || n || '@example.com' AS email,
+           'Bench User ' || n AS full_name
+    FROM generate_series(1, :users) AS n
+    """,
+    # Assignees are stored the way the app writes them: id, email or name, mixed case
+    """
+    CREATE TEMP TABLE bench_assets AS
+    SELECT gen_random_uuid() AS id,
+           CASE n % 3 WHEN 0 THEN u.id::text WHEN 1 THEN upper(u.email) ELSE u.full_name END AS assigned_to,
+           u.id AS assigned_user_id,
+           'Asset ' || n AS name
+    FROM generate_series(1, :assets) AS n
+    JOIN (SELECT id, email, full_name, row_number() OVER () AS rn FROM bench_users) u
+      ON u.rn = 1 + (n % :users)
+    """,
+    "CREATE INDEX ON bench_assets (assigned_user_id)",
+    "ANALYZE bench_users",
+    "ANALYZE bench_assets",
+]
+
+QUERIES = {
+    # asset_service.get_assets_by_assigned_to before the column existed
+    "lower(assigned_to) = name": (
+        "SELECT id, name FROM bench_assets WHERE lower(assigned_to) = lower(:full_name)"
+    ),
+    # exit flows: OR across id, name and email
+    "assigned_to IN (id, name, email)": (
+        "SELECT id, name FROM bench_assets "
+        "WHERE lower(assigned_to) IN (lower(:id_text), lower(:full_name), lower(:email))"
+    ),
+    "assigned_user_id = id": (
+        "SELECT id, name FROM bench_assets WHERE assigned_user_id = :id"
+    ),
+}
+
+
+def plan_nodes(plan):
+    """Scan node types of an EXPLAIN (FORMAT JSON) plan, outermost first"""
+    nodes = [plan["Node Type"]] if "Scan" in plan["Node Type"] else []
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def run_benchmark(assets=500_000, users=5_000, iterations=50):
+    print(f"=== ASSIGNED USER LOOKUP ({assets} assets, {users} users, {iterations} lookups each) ===")
+    async with async_engine.connect() as conn:
+        started = time.perf_counter()
+        for sql in SETUP_SQL:
+            await conn.execute(text(sql), {"assets": assets, "users": users})
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+        sample = (await conn.execute(text(
+            "SELECT id, email, full_name FROM bench_users ORDER BY random() LIMIT :n"
+        ), {"n": iterations})).all()
+
+        print(f"{'predicate':<36}{'plan':<28}{'rows':>7}{'p50 ms':>10}{'p95 ms':>10}")
+        for label, sql in QUERIES.items():
+            first = sample[0]
+            params = {"id": first.id, "id_text": str(first.id), "email": first.email, "full_name": first.full_name}
+            explain = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params)).scalar()
+            explain = json.loads(explain) if isinstance(explain, str) else explain
+            plan = ", ".join(dict.fromkeys(plan_nodes(explain[0]["Plan"])))
+
+            timings, rows = [], 0
+            for user in random.sample(sample, len(sample)):
+                params = {"id": user.id, "id_text": str(user.id), "email": user.email, "full_name": user.full_name}
+                start = time.perf_counter()
+                result = (await conn.execute(text(sql), params)).all()
+                timings.append((time.perf_counter() - start) * 1000)
+                rows = max(rows, len(result))
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) >= 2 else timings[0]
+            print(f"{label:<36}{plan:<28}{rows:>7}{statistics.median(timings):>10.2f}{p95:>10.2f}")
+        await conn.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    asyncio.run(run_benchmark(*args))
@@ -0,0 +1,137 @@
+"""
+Load test for the async engine connection pool.
+Starts one process per API worker, each with its own pool and a fixed number of
+concurrent "requests", and sweeps the pool size to find the smallest pool that
+reaches peak throughput without exceeding the server's max_connections.
+
+Usage: python scripts/benchmark_db_pool.py [workers] [concurrency_per_worker] [seconds] [pool_sizes]
+  e.g. python scripts/benchmark_db_pool.py 4 50 15 2,5,10,20,40
+"""
+import sys
+import os
+import time
+import asyncio
+import statistics
+from multiprocessing import Pool
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database.database import DATABASE_URL, InstrumentedAsyncPool
+from app.config.settings import settings
+
+# A short indexed read plus a little server time, roughly one API request
+REQUEST_SQL = text("SELECT count(*) FROM asset.assets WHERE status = 'Active'")
+SERVER_TIME_SQL = text("SELECT pg_sleep(0.002)")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _worker_load(pool_size, concurrency, seconds):
+    engine = create_async_engine(
+        DATABASE_URL,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(REQUEST_SQL)
+                    await conn.execute(SERVER_TIME_SQL)
+            except exc.TimeoutError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    pool = engine.pool
+    wait = pool.wait_ms
+    await engine.dispose()
+    return {
+        "latencies": latencies,
+        "errors": errors + pool.timeouts,
+        "wait_p99": wait.percentile(99),
+        "wait_mean": wait.total / wait.count if wait.count else 0.0,
+    }
+
+
+def _run_worker(args):
+    return asyncio.run(_worker_load(*args))
+
+
+async def _max_connections():
+    engine = create_async_engine(DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            max_conn = int((await conn.execute(text("SHOW max_connections"))).scalar())
+            reserved = int((await conn.execute(text("SHOW superuser_reserved_connections"))).scalar())
+            in_use = int((await conn.execute(text("SELECT count(*) FROM pg_stat_activity"))).scalar())
+        return max_conn - reserved - in_use
+    finally:
+        await engine.dispose()
+
+
+def run(workers, concurrency, seconds, pool_sizes):
+    available = asyncio.run(_max_connections())
+    print(f"=== DB POOL LOAD TEST ({workers} workers x {concurrency} concurrent requests, {seconds}s per size) ===")
+    print(f"Connections available on server: {available}\n")
+    print(f"{'pool':>5} {'conns':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'wait p99':>9} {'timeouts':>9}")
+
+    results = []
+    for size in pool_sizes:
+        if size * workers > available:
+            print(f"{size:>5} {size * workers:>6}  skipped (exceeds available connections)")
+            continue
+        with Pool(workers) as procs:
+            per_worker = procs.map(_run_worker, [(size, concurrency, seconds)] * workers)
+        latencies = [ms for r in per_worker for ms in r["latencies"]]
+        throughput = len(latencies) / seconds
+        row = {
+            "size": size,
+            "throughput": throughput,
+            "p50": statistics.median(latencies) if latencies else 0.0,
+            "p99": percentile(latencies, 99),
+            "wait_p99": max(r["wait_p99"] for r in per_worker),
+            "timeouts": sum(r["errors"] for r in per_worker),
+        }
+        results.append(row)
+        print(f"{size:>5} {size * workers:>6} {throughput:>9.1f} {row['p50']:>8.2f} {row['p99']:>8.2f} "
+              f"{row['wait_p99']:>9.1f} {row['timeouts']:>9}")
+
+    if not results:
+        print("\nNo pool size fit within the available connections")
+        return
+
+    # Smallest pool within 5% of the best throughput and without timeouts
+    best = max(r["throughput"] for r in results)
+    candidates = [r for r in results if r["throughput"] >= best * 0.95 and r["timeouts"] == 0] or results
+    choice = min(candidates, key=lambda r: r["size"])
+    print(f"\nRecommended: DB_POOL_SIZE={choice['size']} for {workers} workers "
+          f"({choice['size'] * workers} connections, {choice['throughput']:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    seconds = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+    sizes = [int(s) for s in sys.argv[4].split(",")] if len(sys.argv) > 4 else [2, 5, 10, 20, 40]
+    run(workers, concurrency, seconds, sizes)
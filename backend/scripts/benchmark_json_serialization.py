@@ -0,0 +1,125 @@
+"""
+Benchmark for list response serialization (/assets-style pages).
+Compares the old path (model per row, then FastAPI re-validating against
+response_model and encoding with the stdlib) with the fast paths in
+app/utils/json_response.py. Reports latency and peak allocations.
+
+Usage: python scripts/benchmark_json_serialization.py [rows] [iterations]
+"""
+import sys
+import os
+import json
+import time
+import uuid
+import random
+import statistics
+import tracemalloc
+from datetime import datetime, date, timedelta, timezone
+from typing import List
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.schemas.asset_schema import AssetResponse
+from app.utils import json_response
+
+
+def make_rows(count):
+    """Row mappings shaped like asset_service.get_assets_page_rows() output"""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        rows.append({
+            "id": uuid.uuid4(),
+            "name": f"Laptop {i}",
+            "type": random.choice(["Laptop", "Server", "Monitor", "BYOD"]),
+            "model": "ThinkPad T14",
+            "vendor": "Lenovo",
+            "serial_number": f"SN{i:08d}",
+            "purchase_date": date(2023, 1, 1) + timedelta(days=i % 700),
+            "warranty_expiry": date(2026, 1, 1) + timedelta(days=i % 700),
+            "contract_expiry": None,
+            "license_expiry": None,
+            "status": random.choice(["Active", "In Stock", "Repair"]),
+            "location": "Mumbai",
+            "segment": "IT",
+            "assigned_to": f"user{i % 500}@example.com",
+            "assigned_by": "it.admin@example.com",
+            "specifications": {"cpu": "i7-1365U", "ram": "16GB", "storage": "512GB SSD"},
+            "cost": 1299.0,
+            "renewal_status": None,
+            "renewal_cost": None,
+            "renewal_reason": None,
+            "renewal_urgency": None,
+            "procurement_status": None,
+            "disposal_status": None,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+            "assignment_date": None,
+        })
+    return rows
+
+
+LIST_ADAPTER = TypeAdapter(List[AssetResponse])
+
+
+def old_path(rows):
+    # Service: one model per row
+    items = [AssetResponse.model_validate(dict(row)) for row in rows]
+    # FastAPI: response_model re-validation, jsonable_encoder, stdlib json (JSONResponse.render)
+    validated = LIST_ADAPTER.validate_python(items, from_attributes=True)
+    content = jsonable_encoder(LIST_ADAPTER.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def models_path(rows):
+    items = [AssetResponse.model_validate(dict(row)) for row in rows]
+    return json_response.models_response(items, AssetResponse).body
+
+
+def rows_path(rows):
+    return json_response.rows_response(rows, AssetResponse).body
+
+
+def measure(fn, rows, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak
+
+
+def run(count, iterations):
+    rows = make_rows(count)
+    print(f"=== JSON SERIALIZATION BENCHMARK ({count} rows x {iterations} iterations) ===")
+
+    # Same payload from every path
+    reference = json.loads(old_path(rows))
+    for fn in (models_path, rows_path):
+        assert json.loads(fn(rows)) == reference, f"{fn.__name__} output differs from the old path"
+
+    baseline = None
+    for label, fn in (
+        ("model per row + response_model + json", old_path),
+        ("model per row + pydantic-core dump_json", models_path),
+        ("rows straight to orjson", rows_path),
+    ):
+        timings, peak = measure(fn, rows, iterations)
+        p50 = statistics.median(timings)
+        baseline = baseline or p50
+        print(f"\n{label}:")
+        print(f"  p50: {p50:.1f} ms  max: {max(timings):.1f} ms  ({baseline / p50:.1f}x)")
+        print(f"  peak allocations: {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    run(count, iterations)
@@ -0,0 +1,93 @@
+"""
+Load benchmark: latency of an unrelated endpoint (/health) during a login storm.
+Run against a live server; compares a quiet baseline with a burst of bcrypt logins.
+
+Usage: python scripts/benchmark_login_storm.py [email] [password]
+"""
+import sys
+import time
+import threading
+import statistics
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = "http://127.0.0.1:8000"
+LOGIN_THREADS = 32
+LOGINS_PER_THREAD = 10
+PROBE_INTERVAL = 0.02
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def probe_health(stop_event, samples):
+    session = requests.Session()
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        try:
+            session.get(f"{BASE_URL}/health", timeout=10)
+            samples.append((time.perf_counter() - start) * 1000)
+        except Exception as e:
+            print(f"Probe error: {e}")
+        time.sleep(PROBE_INTERVAL)
+
+
+def login_worker(email, password, statuses):
+    session = requests.Session()
+    for _ in range(LOGINS_PER_THREAD):
+        try:
+            r = session.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password}, timeout=60)
+            statuses.append(r.status_code)
+        except Exception as e:
+            statuses.append(str(e))
+
+
+def measure(label, email=None, password=None, duration=5.0):
+    samples, statuses = [], []
+    stop_event = threading.Event()
+    prober = threading.Thread(target=probe_health, args=(stop_event, samples))
+    prober.start()
+
+    start = time.perf_counter()
+    if email:
+        with ThreadPoolExecutor(max_workers=LOGIN_THREADS) as pool:
+            for _ in range(LOGIN_THREADS):
+                pool.submit(login_worker, email, password, statuses)
+    else:
+        time.sleep(duration)
+    elapsed = time.perf_counter() - start
+
+    stop_event.set()
+    prober.join()
+
+    print(f"\n--- {label} ({elapsed:.1f}s) ---")
+    print(f"/health samples: {len(samples)}")
+    if samples:
+        print(f"  p50: {statistics.median(samples):.1f} ms")
+        print(f"  p99: {percentile(samples, 99):.1f} ms")
+        print(f"  max: {max(samples):.1f} ms")
+    if statuses:
+        counts = {}
+        for s in statuses:
+            counts[s] = counts.get(s, 0) + 1
+        print(f"login results: {counts}")
+
+
+if __name__ == "__main__":
+    email = sys.argv[1] if len(sys.argv) > 1 else "admin@itsm.com"
+    password = sys.argv[2] if len(sys.argv) > 2 else "password123"
+
+    print("=== LOGIN STORM BENCHMARK ===")
+    measure("Baseline (no logins)")
+    measure(f"Login storm ({LOGIN_THREADS} x {LOGINS_PER_THREAD} logins)", email, password)
+
+    try:
+        print("\nPassword hasher metrics:")
+        print(requests.get(f"{BASE_URL}/metrics/password-hasher", timeout=10).json())
+    except Exception as e:
+        print(f"Could not fetch metrics: {e}")
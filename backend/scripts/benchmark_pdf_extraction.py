@@ -0,0 +1,65 @@
+"""
+Micro-benchmark for the PDF field extractor over a corpus of sample POs.
+Times extract_po_details end to end and the pypdf text extraction it starts
+with, and reports how much of each call is left for the regex field rules.
+
+Usage: python scripts/benchmark_pdf_extraction.py [corpus_dir] [iterations]
+"""
+import sys
+import os
+import glob
+import time
+import statistics
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pypdf
+from app.services import pdf_extraction_service
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def read_text(file_path):
+    reader = pypdf.PdfReader(file_path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def run(corpus_dir, iterations):
+    files = sorted(glob.glob(os.path.join(corpus_dir, "*.pdf")))
+    if not files:
+        print(f"No PDF files found in {corpus_dir}")
+        return
+
+    print(f"=== PDF EXTRACTION BENCHMARK ({len(files)} files x {iterations} iterations) ===")
+    total_ms, text_ms = [], []
+    pages = 0
+
+    for file_path in files:
+        pages += len(pypdf.PdfReader(file_path).pages)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            read_text(file_path)
+            text_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            pdf_extraction_service.extract_po_details(file_path)
+            total_ms.append((time.perf_counter() - start) * 1000)
+
+    total_p50, text_p50 = statistics.median(total_ms), statistics.median(text_ms)
+    print(f"Pages: {pages}")
+    print(f"extract_po_details  p50: {total_p50:.2f} ms  p99: {percentile(total_ms, 99):.2f} ms")
+    print(f"pypdf text only     p50: {text_p50:.2f} ms  p99: {percentile(text_ms, 99):.2f} ms")
+    print(f"Field rules share (p50): {max(total_p50 - text_p50, 0.0) / total_p50:.1%}")
+
+
+if __name__ == "__main__":
+    corpus = sys.argv[1] if len(sys.argv) > 1 else os.path.join("uploads", "procurement")
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(corpus, iterations)
@@ -0,0 +1,188 @@
+"""
+Benchmark for /search on synthetic data.
+Creates scratch copies of asset.assets, support.tickets and asset.asset_requests
+in a "search_bench" schema, fills them with 1M rows in total, builds the model
+indexes (search + specifications GIN) and runs search_service against them
+through a schema_translate_map. Reports p50/p95 per query and the scan nodes
+of each plan. The scratch schema is dropped at the end unless --keep is given.
+
+Usage: python scripts/benchmark_search.py [total_rows] [iterations] [--keep]
+"""
+import sys
+import os
+import asyncio
+import json
+import statistics
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.database.database import async_engine
+from app.models.models import Asset, AssetRequest, Ticket
+from app.services import search_service
+
+SCHEMA = "search_bench"
+TRANSLATE = {"asset": SCHEMA, "support": SCHEMA}
+TABLES = (Asset.__table__, Ticket.__table__, AssetRequest.__table__)
+# Share of the total rows per table
+SHARES = {"assets": 0.5, "tickets": 0.3, "asset_requests": 0.2}
+
+SEED_SQL = {
+    "assets": f"""
+    INSERT INTO {SCHEMA}.assets (id, name, type, model, vendor, serial_number, segment, status, location, specifications)
+    SELECT gen_random_uuid(),
+           (ARRAY['Laptop','Desktop','Monitor','Server','Router','Printer'])[1 + n % 6] || '-' || lpad(n::text, 7, '0'),
+           (ARRAY['Laptop','Desktop','Monitor','Server','Network','Printer'])[1 + n % 6],
+           (ARRAY['Latitude 7440','ThinkPad T14','EliteBook 840','MacBook Pro','PowerEdge R650','Catalyst 9300'])[1 + (n / 7) % 6],
+           (ARRAY['Dell','Lenovo','HP','Apple','Dell','Cisco'])[1 + (n / 7) % 6],
+           'SN-' || lpad(n::text, 8, '0'),
+           'IT',
+           (ARRAY['Active','In Stock','Repair','Retired'])[1 + n % 4],
+           (ARRAY['Mumbai','Pune','Bengaluru','London','Austin','Remote'])[1 + (n / 3) % 6],
+           jsonb_build_object(
+               'cpu', (ARRAY['i5','i7','i9','M2','Xeon'])[1 + n % 5],
+               'ram', (ARRAY['8GB','16GB','32GB','64GB'])[1 + (n / 5) % 4],
+               'hardware', jsonb_build_object('gpu', (ARRAY['integrated','RTX 3050','RTX 4070'])[1 + n % 3])
+           )
+    FROM generate_series(1, :rows) AS n
+    """,
+    "tickets": f"""
+    INSERT INTO {SCHEMA}.tickets (id, subject, description, status, priority, category)
+    SELECT gen_random_uuid(),
+           (ARRAY['Printer jam on floor','VPN access denied','Laptop battery draining','Monitor flickering',
+                  'Password reset request','Outlook not syncing','Wi-Fi drops in meeting room'])[1 + n % 7] || ' #' || n,
+           'User reports ' || (ARRAY['intermittent','persistent','sudden','recurring'])[1 + n % 4] || ' issue with '
+               || (ARRAY['printer','VPN client','battery','display','account','mailbox','wireless'])[1 + (n / 7) % 7]
+               || ' after ' || (ARRAY['update','reboot','office move','password change'])[1 + n % 4] || '.',
+           (ARRAY['Open','Pending','Closed'])[1 + n % 3],
+           (ARRAY['Low','Medium','High'])[1 + n % 3],
+           (ARRAY['Hardware','Software','Network'])[1 + n % 3]
+    FROM generate_series(1, :rows) AS n
+    """,
+    "asset_requests": f"""
+    INSERT INTO {SCHEMA}.asset_requests (id, requester_id, asset_name, asset_type, status, justification, business_justification)
+    SELECT gen_random_uuid(),
+           gen_random_uuid(),
+           (ARRAY['Developer laptop','Second monitor','Docking station','GPU workstation','Headset','Mobile phone'])[1 + n % 6],
+           (ARRAY['Laptop','Monitor','Accessory','Desktop','Accessory','Phone'])[1 + n % 6],
+           (ARRAY['SUBMITTED','MANAGER_APPROVED','IT_APPROVED','FULFILLED'])[1 + n % 4],
+           'Needed for ' || (ARRAY['onboarding','project delivery','remote work','machine learning training'])[1 + n % 4],
+           'Supports the ' || (ARRAY['analytics','platform','security','customer success'])[1 + (n / 4) % 4] || ' team roadmap'
+    FROM generate_series(1, :rows) AS n
+    """,
+}
+
+# (label, types, q, typeahead, spec filters)
+QUERIES = [
+    ("typeahead 'lap'", "assets", "lap", True, None),
+    ("typeahead 'dell lat'", "assets", "dell lat", True, None),
+    ("typeahead 'SN-0004'", "assets", "SN-0004", True, None),
+    ("typeahead 'vpn acc'", "tickets", "vpn acc", True, None),
+    ("typeahead 'gpu work'", "requests", "gpu work", True, None),
+    ("typeahead 'mon' (all types)", None, "mon", True, None),
+    ("full text 'printer jam'", "tickets", "printer jam", False, None),
+    ("'thinkpad' + cpu=i7", "assets", "thinkpad", True, ["cpu=i7"]),
+    ("spec hardware.gpu only", "assets", None, True, ["hardware.gpu=RTX 4070"]),
+]
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) for a statement, keeping its bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def plan_nodes(plan):
+    """Scan node types (with index names) of an EXPLAIN (FORMAT JSON) plan"""
+    nodes = []
+    if "Scan" in plan["Node Type"]:
+        nodes.append(f"{plan['Node Type']}({plan['Index Name']})" if "Index Name" in plan else plan["Node Type"])
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def seed(conn, total_rows):
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table in TABLES:
+        await conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+    for table in TABLES:
+        rows = int(total_rows * SHARES[table.name])
+        started = time.perf_counter()
+        await conn.execute(text(SEED_SQL[table.name]), {"rows": rows})
+        print(f"  {table.name}: {rows} rows in {time.perf_counter() - started:.1f}s")
+    # Indexes after the load, as a bulk build
+    for table in TABLES:
+        started = time.perf_counter()
+        for index in table.indexes:
+            await conn.execute(CreateIndex(index))
+        print(f"  {table.name}: {len(table.indexes)} indexes in {time.perf_counter() - started:.1f}s")
+    await conn.commit()
+    autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+    for table in TABLES:
+        await autocommit.execute(text(f"VACUUM ANALYZE {SCHEMA}.{table.name}"))
+    await autocommit.commit()
+    await conn.execution_options(isolation_level="READ COMMITTED")
+
+
+async def run_benchmark(total_rows=1_000_000, iterations=30, keep=False):
+    print(f"=== SEARCH BENCHMARK ({total_rows} rows, {iterations} runs per query) ===")
+    async with async_engine.connect() as raw_conn:
+        conn = await raw_conn.execution_options(schema_translate_map=TRANSLATE)
+        try:
+            await seed(conn, total_rows)
+            async with AsyncSession(bind=conn) as db:
+                print(f"{'query':<32}{'hits':>6}{'p50 ms':>9}{'p95 ms':>9}  plan")
+                for label, types, q, typeahead, specs in QUERIES:
+                    # Warm-up also validates the request like the endpoint would
+                    results = await search_service.search(db, q, types=types, typeahead=typeahead, specs=specs)
+                    timings = []
+                    for _ in range(iterations):
+                        started = time.perf_counter()
+                        results = await search_service.search(db, q, types=types, typeahead=typeahead, specs=specs)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    hits = sum(len(rows) for rows in results.values())
+
+                    plans = []
+                    filters = search_service.spec_filters(specs)
+                    for entity in search_service.parse_types(types):
+                        if filters and entity != "assets":
+                            continue
+                        query = search_service.build_search_query(
+                            entity, q, typeahead=typeahead, filters=filters if entity == "assets" else ()
+                        )
+                        if query is None:
+                            continue
+                        explain = (await conn.execute(Explain(query))).scalar()
+                        explain = json.loads(explain) if isinstance(explain, str) else explain
+                        plans.extend(dict.fromkeys(plan_nodes(explain[0]["Plan"])))
+                    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) >= 2 else timings[0]
+                    print(f"{label:<32}{hits:>6}{statistics.median(timings):>9.2f}{p95:>9.2f}  {', '.join(plans)}")
+                await db.rollback()
+        finally:
+            await raw_conn.rollback()
+            if not keep:
+                await raw_conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                await raw_conn.commit()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    keep = "--keep" in sys.argv
+    args = [int(arg) for arg in sys.argv[1:] if arg != "--keep"]
+    asyncio.run(run_benchmark(*args[:2], keep=keep))
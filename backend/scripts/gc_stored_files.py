@@ -0,0 +1,35 @@
+"""
+Garbage-collect content-addressed procurement uploads.
+Recomputes reference counts from purchase orders / invoices and deletes files
+that have been unreferenced for longer than the grace period, plus object
+files that never got a stored_files row (uploads whose transaction rolled back).
+
+Usage: python scripts/gc_stored_files.py [grace_seconds]
+"""
+import sys
+import os
+import asyncio
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import AsyncSessionLocal
+from app.services import file_store_service
+
+
+async def main(grace_seconds=None):
+    print("=== STORED FILE GC ===")
+    async with AsyncSessionLocal() as db:
+        try:
+            stats = await file_store_service.collect_garbage(db, grace_seconds)
+            print(f"✓ Orphaned entries removed: {stats['orphaned']}")
+            print(f"✓ Files deleted: {stats['files_removed']}")
+            print(f"✓ Stale temp files deleted: {stats['temp_files_removed']}")
+            print(f"✓ Untracked object files deleted: {stats['untracked_files_removed']}")
+        except Exception as e:
+            print(f"✗ GC failed: {e}")
+
+
+if __name__ == "__main__":
+    grace = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    asyncio.run(main(grace))
@@ -0,0 +1,103 @@
+"""
+Migration script for normalized asset assignments:
+adds asset.assets.assigned_user_id, backfills it from assigned_to (user id,
+email or full name, any case) and indexes it, plus the lowercased user
+email / name indexes used to resolve new assignments.
+
+Safe to re-run: the backfill only visits assets whose assigned_user_id is
+still NULL and walks them in id order, committing per batch.
+
+Usage: python scripts/migrate_assigned_user_id.py [batch_size]
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+UUID_PATTERN = "^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+
+# Same precedence as user_service.resolve_user_ids: id, then email, then the oldest user with that name
+BACKFILL_SQL = f"""
+WITH batch AS (
+    SELECT id, lower(trim(assigned_to)) AS ref
+    FROM asset.assets
+    WHERE assigned_to IS NOT NULL
+      AND assigned_user_id IS NULL
+      AND id > :after
+    ORDER BY id
+    LIMIT :batch_size
+)
+UPDATE asset.assets a
+SET assigned_user_id = COALESCE(
+    (SELECT u.id FROM auth.users u
+     WHERE u.id = CASE WHEN b.ref ~ '{UUID_PATTERN}' THEN b.ref::uuid END),
+    (SELECT u.id FROM auth.users u
+     WHERE lower(u.email) = b.ref
+     ORDER BY u.created_at, u.id LIMIT 1),
+    (SELECT u.id FROM auth.users u
+     WHERE lower(u.full_name) = b.ref
+     ORDER BY u.created_at, u.id LIMIT 1)
+)
+FROM batch b
+WHERE a.id = b.id
+RETURNING a.id, a.assigned_user_id
+"""
+
+INDEXES = [
+    ("ix_users_email_lower", "auth.users (lower(email))"),
+    ("ix_users_full_name_lower", "auth.users (lower(full_name))"),
+    ("ix_asset_assets_assigned_user_id", "asset.assets (assigned_user_id)"),
+]
+
+
+def migrate(batch_size=5000):
+    print("=== ASSIGNED USER MIGRATION ===")
+
+    with engine.begin() as connection:
+        try:
+            connection.execute(text("ALTER TABLE asset.assets ADD COLUMN IF NOT EXISTS assigned_user_id UUID"))
+            print("✓ Column 'assigned_user_id' ready.")
+        except Exception as e:
+            print(f"✗ Error adding column: {e}")
+            return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    # The user indexes go first so the backfill lookups can use them.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name, target in INDEXES[:2]:
+            try:
+                connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}"))
+                print(f"✓ Created index '{name}'.")
+            except Exception as e:
+                print(f"✗ Error creating index '{name}': {e}")
+        connection.execute(text("ANALYZE auth.users"))
+
+    after = "00000000-0000-0000-0000-000000000000"
+    linked = unresolved = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(text(BACKFILL_SQL), {"after": after, "batch_size": batch_size}).all()
+        if not rows:
+            break
+        linked += sum(1 for _, user_id in rows if user_id)
+        unresolved += sum(1 for _, user_id in rows if not user_id)
+        after = str(max(asset_id for asset_id, _ in rows))
+        print(f"  ... {linked + unresolved} assets visited")
+    print(f"✓ Backfilled {linked} assets; {unresolved} assignees match no user and stay NULL.")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        name, target = INDEXES[2]
+        try:
+            connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}"))
+            connection.execute(text("ANALYZE asset.assets"))
+            print(f"✓ Created index '{name}'.")
+        except Exception as e:
+            print(f"✗ Error creating index '{name}': {e}")
+
+
+if __name__ == "__main__":
+    migrate(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,111 @@
+"""
+Migration script to convert system.audit_logs into a table range-partitioned by month.
+The existing table is renamed to system.audit_logs_legacy and its rows copied over.
+
+Usage: python scripts/migrate_audit_partitioning.py [--drop-legacy]
+"""
+import sys
+import os
+import asyncio
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine, AsyncSessionLocal
+from app.services.audit_partition_service import COLUMNS, DEFAULT_PARTITION, add_months, ensure_partitions, month_start, partition_name
+from app.config.settings import settings
+from sqlalchemy import text
+
+CREATE_PARENT_SQL = """
+CREATE TABLE system.audit_logs (
+    id VARCHAR(36) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL,
+    entity_id VARCHAR(255) NOT NULL,
+    action VARCHAR(50) NOT NULL,
+    performed_by VARCHAR(255),
+    details JSONB,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE INDEX ix_system_audit_logs_id ON system.audit_logs (id);
+CREATE INDEX ix_system_audit_logs_entity_type ON system.audit_logs (entity_type);
+CREATE INDEX ix_system_audit_logs_entity_id ON system.audit_logs (entity_id);
+CREATE INDEX ix_system_audit_logs_action ON system.audit_logs (action);
+CREATE INDEX ix_system_audit_logs_performed_by ON system.audit_logs (performed_by);
+CREATE INDEX ix_system_audit_logs_timestamp ON system.audit_logs (timestamp);
+CREATE INDEX ix_audit_logs_details_gin ON system.audit_logs USING gin (details);
+CREATE INDEX ix_audit_logs_collect_serial ON system.audit_logs (btrim(details ->> 'serial_number'), timestamp DESC)
+    WHERE action = 'DATA_COLLECT';
+"""
+
+async def create_audit_partitions():
+    async with AsyncSessionLocal() as db:
+        created = await ensure_partitions(db)
+        await db.commit()
+    print(f"✓ Audit log partitions created/verified ({len(created)} new).")
+
+
+def migrate(drop_legacy=False):
+    print("=== PARTITIONING SYSTEM.AUDIT_LOGS BY MONTH ===")
+    
+    with engine.connect() as connection:
+        try:
+            partitioned = connection.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('system.audit_logs'))"
+            )).scalar()
+            if partitioned:
+                print("✓ system.audit_logs is already partitioned.")
+                connection.rollback()
+                asyncio.run(create_audit_partitions())
+                return
+            
+            # Free the index / constraint names for the new parent table
+            index_names = connection.execute(text(
+                "SELECT indexname FROM pg_indexes WHERE schemaname = 'system' AND tablename = 'audit_logs'"
+            )).scalars().all()
+            connection.execute(text("ALTER TABLE system.audit_logs RENAME TO audit_logs_legacy"))
+            for index_name in index_names:
+                connection.execute(text(f'ALTER INDEX system."{index_name}" RENAME TO "{index_name[:55]}_legacy"'))
+            
+            connection.execute(text(CREATE_PARENT_SQL))
+            
+            oldest = connection.execute(text("SELECT min(timestamp) FROM system.audit_logs_legacy")).scalar()
+            current = month_start(datetime.now(timezone.utc).date())
+            month = month_start(oldest.date()) if oldest else current
+            last = add_months(current, settings.AUDIT_PARTITION_MONTHS_AHEAD)
+            created = 0
+            while month <= last:
+                connection.execute(text(
+                    f"CREATE TABLE system.{partition_name(month)} PARTITION OF system.audit_logs "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created += 1
+                month = add_months(month, 1)
+            print(f"✓ Created {created} monthly partitions.")
+            connection.execute(text(f"CREATE TABLE system.{DEFAULT_PARTITION} PARTITION OF system.audit_logs DEFAULT"))
+            print(f"✓ Created the DEFAULT partition system.{DEFAULT_PARTITION}.")
+            
+            copied = connection.execute(text(
+                f"INSERT INTO system.audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM system.audit_logs_legacy"
+            )).rowcount
+            print(f"✓ Copied {copied} audit log rows.")
+            
+            if drop_legacy:
+                connection.execute(text("DROP TABLE system.audit_logs_legacy"))
+                print("✓ Dropped system.audit_logs_legacy.")
+            
+            connection.commit()
+            print("✓ Successfully partitioned 'system.audit_logs'.")
+        except Exception as e:
+            connection.rollback()
+            print(f"✗ Error partitioning table: {e}")
+            return
+    
+    # Moves any rows that landed in the DEFAULT partition into monthly partitions
+    asyncio.run(create_audit_partitions())
+
+
+if __name__ == "__main__":
+    migrate(drop_legacy="--drop-legacy" in sys.argv)
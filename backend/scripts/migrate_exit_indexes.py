@@ -0,0 +1,32 @@
+"""
+Migration script for exit workflow lookups:
+expression index on lower(asset.assets.assigned_to)
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+def migrate():
+    print("=== EXIT INDEX MIGRATION ===")
+    
+    create_index_sql = """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assets_assigned_to_lower
+        ON asset.assets (lower(assigned_to));
+    """
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        try:
+            connection.execute(text(create_index_sql))
+            connection.execute(text("ANALYZE asset.assets"))
+            print("✓ Created index 'ix_assets_assigned_to_lower'.")
+        except Exception as e:
+            print(f"✗ Error creating index: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,53 @@
+"""
+Migration script to create procurement.extraction_jobs table
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+def migrate():
+    print("=== CREATING EXTRACTION_JOBS TABLE ===")
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS procurement.extraction_jobs (
+        id UUID PRIMARY KEY,
+        kind VARCHAR(20) NOT NULL,
+        target_id UUID NOT NULL,
+        file_path VARCHAR(500) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'QUEUED',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 3,
+        error TEXT,
+        result JSONB,
+        lease_owner VARCHAR(255),
+        heartbeat_at TIMESTAMP WITH TIME ZONE,
+        started_at TIMESTAMP WITH TIME ZONE,
+        finished_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+    );
+    
+    CREATE INDEX IF NOT EXISTS ix_procurement_extraction_jobs_id ON procurement.extraction_jobs (id);
+    CREATE INDEX IF NOT EXISTS ix_procurement_extraction_jobs_target_id ON procurement.extraction_jobs (target_id);
+    CREATE INDEX IF NOT EXISTS ix_procurement_extraction_jobs_status ON procurement.extraction_jobs (status);
+    
+    -- Worker leases (tables created before leases were added)
+    ALTER TABLE procurement.extraction_jobs ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255);
+    ALTER TABLE procurement.extraction_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE;
+    """
+    
+    with engine.connect() as connection:
+        try:
+            connection.execute(text(create_table_sql))
+            connection.commit()
+            print("✓ Successfully created 'procurement.extraction_jobs' table.")
+        except Exception as e:
+            print(f"✗ Error creating table: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,64 @@
+"""
+Migration script to create system.import_jobs and system.import_job_errors tables
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+def migrate():
+    print("=== CREATING IMPORT_JOBS TABLES ===")
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS system.import_jobs (
+        id UUID PRIMARY KEY,
+        file_path VARCHAR(500) NOT NULL,
+        original_filename VARCHAR(255),
+        file_format VARCHAR(10) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'QUEUED',
+        total_rows INTEGER,
+        rows_processed INTEGER NOT NULL DEFAULT 0,
+        asset_requests_created INTEGER NOT NULL DEFAULT 0,
+        procurement_requests_created INTEGER NOT NULL DEFAULT 0,
+        error_count INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        created_by VARCHAR(36),
+        lease_owner VARCHAR(255),
+        heartbeat_at TIMESTAMP WITH TIME ZONE,
+        started_at TIMESTAMP WITH TIME ZONE,
+        finished_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+    );
+    
+    CREATE INDEX IF NOT EXISTS ix_system_import_jobs_id ON system.import_jobs (id);
+    CREATE INDEX IF NOT EXISTS ix_system_import_jobs_status ON system.import_jobs (status);
+    
+    CREATE TABLE IF NOT EXISTS system.import_job_errors (
+        id UUID PRIMARY KEY,
+        job_id UUID NOT NULL REFERENCES system.import_jobs (id) ON DELETE CASCADE,
+        row_number INTEGER NOT NULL,
+        message TEXT NOT NULL
+    );
+    
+    CREATE INDEX IF NOT EXISTS ix_system_import_job_errors_job_id ON system.import_job_errors (job_id, row_number);
+    
+    -- Worker leases (tables created before leases were added)
+    ALTER TABLE system.import_jobs ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255);
+    ALTER TABLE system.import_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE;
+    """
+    
+    with engine.connect() as connection:
+        try:
+            connection.execute(text(create_table_sql))
+            connection.commit()
+            print("✓ Successfully created 'system.import_jobs' and 'system.import_job_errors' tables.")
+        except Exception as e:
+            print(f"✗ Error creating tables: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,49 @@
+"""
+Migration script for orphan reconciliation:
+system.sync_checkpoints table and the partial collect-serial index on system.audit_logs
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+def migrate():
+    print("=== RECONCILIATION MIGRATION ===")
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS system.sync_checkpoints (
+        name VARCHAR(100) PRIMARY KEY,
+        last_timestamp TIMESTAMP WITH TIME ZONE,
+        cursor JSONB,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+    );
+    """
+    create_index_sql = """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_logs_collect_serial
+        ON system.audit_logs (btrim(details ->> 'serial_number'), timestamp DESC)
+        WHERE action = 'DATA_COLLECT';
+    """
+    
+    with engine.connect() as connection:
+        try:
+            connection.execute(text(create_table_sql))
+            connection.commit()
+            print("✓ Created 'system.sync_checkpoints' table.")
+        except Exception as e:
+            print(f"✗ Error creating table: {e}")
+            connection.rollback()
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        try:
+            connection.execute(text(create_index_sql))
+            print("✓ Created index 'ix_audit_logs_collect_serial'.")
+        except Exception as e:
+            print(f"✗ Error creating index: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,37 @@
+"""
+Migration script for the renewal expiry scanner:
+partial (expiry, id) indexes on asset.assets and the renewal queue index
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+INDEXES = {
+    "ix_assets_warranty_expiry_unqueued": "ON asset.assets (warranty_expiry, id) WHERE renewal_status IS NULL",
+    "ix_assets_contract_expiry_unqueued": "ON asset.assets (contract_expiry, id) WHERE renewal_status IS NULL",
+    "ix_assets_license_expiry_unqueued": "ON asset.assets (license_expiry, id) WHERE renewal_status IS NULL",
+    "ix_assets_renewal_queue": (
+        "ON asset.assets (renewal_status, LEAST(warranty_expiry, contract_expiry, license_expiry), id) "
+        "WHERE renewal_status IS NOT NULL"
+    ),
+}
+
+def migrate():
+    print("=== RENEWAL INDEX MIGRATION ===")
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name, definition in INDEXES.items():
+            try:
+                connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+                print(f"✓ Created index '{name}'.")
+            except Exception as e:
+                print(f"✗ Error creating index '{name}': {e}")
+
+if __name__ == "__main__":
+    migrate()
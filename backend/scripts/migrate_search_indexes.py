@@ -0,0 +1,55 @@
+"""
+Migration script for /search:
+enables pg_trgm and creates the trigram and tsvector GIN indexes on
+asset.assets, support.tickets and asset.asset_requests.
+
+The DDL is compiled from the model indexes (models.search_indexes), so the
+indexed expressions are exactly the ones search_service queries with.
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from app.models.models import Asset, Ticket, AssetRequest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+
+def search_index_ddl():
+    for model in (Asset, Ticket, AssetRequest):
+        for index in sorted(model.__table__.indexes, key=lambda i: i.name):
+            if "_search_" in index.name:
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect()))
+                yield model.__table__.fullname, index.name, ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+
+
+def migrate():
+    print("=== SEARCH INDEX MIGRATION ===")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        try:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            print("✓ Extension 'pg_trgm' ready.")
+        except Exception as e:
+            print(f"✗ Error enabling pg_trgm: {e}")
+            return
+
+        tables = set()
+        for table, name, ddl in search_index_ddl():
+            try:
+                connection.execute(text(ddl))
+                tables.add(table)
+                print(f"✓ Created index '{name}' on {table}.")
+            except Exception as e:
+                print(f"✗ Error creating index '{name}': {e}")
+        for table in sorted(tables):
+            connection.execute(text(f"ANALYZE {table}"))
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,50 @@
+"""
+Migration script for the specification query API:
+creates the btree expression indexes on hot asset.assets.specifications paths
+(os.name, os.version, hardware.ram). Every other predicate is served by the
+existing ix_asset_specifications_gin / ix_audit_logs_details_gin indexes.
+
+The DDL is compiled from the model indexes (models.json_path_text), so the
+indexed expressions are exactly the ones spec_query_service queries with.
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from app.models.models import Asset
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+
+def spec_index_ddl():
+    for index in sorted(Asset.__table__.indexes, key=lambda i: i.name):
+        if index.name.startswith("ix_assets_spec_"):
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect()))
+            yield index.name, ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+
+
+def migrate():
+    print("=== SPECIFICATION INDEX MIGRATION ===")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        created = False
+        for name, ddl in spec_index_ddl():
+            try:
+                connection.execute(text(ddl))
+                created = True
+                print(f"✓ Created index '{name}' on asset.assets.")
+            except Exception as e:
+                print(f"✗ Error creating index '{name}': {e}")
+        if created:
+            # Expression indexes get their own statistics only after ANALYZE
+            connection.execute(text("ANALYZE asset.assets"))
+            print("✓ Analyzed asset.assets.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,42 @@
+"""
+Migration script to create procurement.stored_files table (content-addressed uploads)
+"""
+import sys
+import os
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine
+from sqlalchemy import text
+
+def migrate():
+    print("=== CREATING STORED_FILES TABLE ===")
+    
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS procurement.stored_files (
+        sha256 VARCHAR(64) PRIMARY KEY,
+        file_path VARCHAR(500) NOT NULL UNIQUE,
+        size_bytes INTEGER NOT NULL,
+        ref_count INTEGER NOT NULL DEFAULT 0,
+        extracted_data JSONB,
+        extracted_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+        last_referenced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+    );
+    
+    CREATE INDEX IF NOT EXISTS ix_procurement_stored_files_orphans
+        ON procurement.stored_files (last_referenced_at) WHERE ref_count = 0;
+    """
+    
+    with engine.connect() as connection:
+        try:
+            connection.execute(text(create_table_sql))
+            connection.commit()
+            print("✓ Successfully created 'procurement.stored_files' table.")
+            print("  Existing uploads keep their current paths; only new uploads are content-addressed.")
+        except Exception as e:
+            print(f"✗ Error creating table: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -1,6 +1,21 @@
-from database import engine
+import sys
+import os
+import asyncio
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.database import engine, AsyncSessionLocal
+from app.models import models
+from app.services.audit_partition_service import ensure_partitions
 from sqlalchemy import text
-import models
+
+
+async def create_audit_partitions():
+    async with AsyncSessionLocal() as db:
+        created = await ensure_partitions(db)
+        await db.commit()
+    return created
 
 def setup_database():
     """Create all necessary schemas and tables"""
@@ -18,11 +33,23 @@ def setup_database():
                 except Exception as e:
                     print(f"[WARNING] Schema '{schema}': {e}")
             
+            # Trigram search indexes (see scripts/migrate_search_indexes.py) need pg_trgm
+            try:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                connection.commit()
+                print("[OK] Extension 'pg_trgm' created/verified")
+            except Exception as e:
+                print(f"[WARNING] Extension 'pg_trgm': {e}")
+            
             print("\n=== CREATING TABLES ===\n")
             # Create all tables defined in models
             models.Base.metadata.create_all(bind=engine)
             print("[OK] All tables created successfully!")
             
+            # Monthly system.audit_logs partitions (create_all only adds the DEFAULT one)
+            created = asyncio.run(create_audit_partitions())
+            print(f"[OK] Audit log partitions created/verified ({len(created)} new)")
+            
             print("\n=== VERIFICATION ===\n")
             # Verify tables were created
             from sqlalchemy import inspect
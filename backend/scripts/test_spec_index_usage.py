@@ -0,0 +1,196 @@
+"""
+Checks that specification / audit details queries are served by their indexes.
+Creates scratch copies of asset.assets and system.audit_logs in a "spec_index_check"
+schema, seeds them with selective specifications / details, builds the model
+indexes and EXPLAINs the statements spec_query_service generates through a
+schema_translate_map. Each case asserts which index the plan uses.
+The scratch schema is dropped at the end unless --keep is given.
+
+Usage: python scripts/test_spec_index_usage.py [rows] [--keep]
+"""
+import sys
+import os
+import asyncio
+import json
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.database.database import async_engine
+from app.models.models import Asset, AuditLog
+from app.schemas.spec_query_schema import SpecPredicate
+from app.services import spec_query_service
+
+SCHEMA = "spec_index_check"
+TRANSLATE = {"asset": SCHEMA, "system": SCHEMA}
+TABLES = (Asset.__table__, AuditLog.__table__)
+
+# Rare values (about 1 row in 1000) are the ones the cases look up
+SEED_SQL = {
+    "assets": f"""
+    INSERT INTO {SCHEMA}.assets (id, name, type, model, vendor, serial_number, segment, status, specifications)
+    SELECT gen_random_uuid(),
+           'Asset-' || lpad(n::text, 7, '0'),
+           (ARRAY['Laptop','Desktop','Server'])[1 + n % 3],
+           (ARRAY['Latitude 7440','ThinkPad T14','PowerEdge R650'])[1 + n % 3],
+           (ARRAY['Dell','Lenovo','Dell'])[1 + n % 3],
+           'SN-' || lpad(n::text, 8, '0'),
+           'IT',
+           (ARRAY['Active','In Stock','Repair'])[1 + n % 3],
+           jsonb_build_object(
+               'cpu', CASE WHEN n % 1000 = 2 THEN 'POWER10' ELSE (ARRAY['i5','i7','i9','M2'])[1 + n % 4] END,
+               'os', jsonb_build_object(
+                   'name', CASE WHEN n % 1000 = 0 THEN 'FreeBSD' ELSE (ARRAY['Windows','Ubuntu','macOS'])[1 + n % 3] END,
+                   'version', (ARRAY['11','22.04','14.4'])[1 + n % 3]
+               ),
+               'hardware', jsonb_build_object(
+                   'ram', CASE WHEN n % 1000 = 1 THEN '128GB' ELSE (ARRAY['8GB','16GB','32GB'])[1 + n % 3] END,
+                   'gpu', CASE WHEN n % 1000 = 6 THEN 'H100' ELSE 'integrated' END
+               ) || CASE WHEN n % 1000 = 4 THEN '{{"fpga": "Alveo U50"}}'::jsonb ELSE '{{}}'::jsonb END
+           )
+           || CASE WHEN n % 1000 = 3 THEN '{{"tpm": "2.0"}}'::jsonb ELSE '{{}}'::jsonb END
+           || CASE WHEN n % 100 = 5
+                   THEN jsonb_build_object('disk', jsonb_build_object('size_gb', CASE WHEN n % 1000 = 5 THEN 8192 ELSE 512 END))
+                   ELSE '{{}}'::jsonb END
+    FROM generate_series(1, :rows) AS n
+    """,
+    "audit_logs": f"""
+    INSERT INTO {SCHEMA}.audit_logs (id, entity_type, entity_id, action, performed_by, details, timestamp)
+    SELECT gen_random_uuid()::text,
+           (ARRAY['Asset','Ticket','User'])[1 + n % 3],
+           n::text,
+           (ARRAY['Created','Updated','Deleted'])[1 + n % 3],
+           'user-' || (n % 50),
+           jsonb_build_object(
+               'source', CASE WHEN n % 1000 = 0 THEN 'agent-x' ELSE (ARRAY['ui','api','collector'])[1 + n % 3] END,
+               'changes', jsonb_build_object('status', CASE WHEN n % 1000 = 7 THEN 'Retired' ELSE 'Active' END)
+           )
+           || CASE WHEN n % 1000 = 3 THEN jsonb_build_object('ticket_id', n) ELSE '{{}}'::jsonb END,
+           now() - n * interval '1 second'
+    FROM generate_series(1, :rows) AS n
+    """,
+}
+
+
+def asset_query(*predicates, match="all"):
+    return spec_query_service.build_assets_query(predicates, match=match, limit=101)
+
+
+def audit_query(*predicates, match="all"):
+    # Same shape as audit_service.get_audit_logs_page
+    condition = spec_query_service.build_conditions(AuditLog.details, predicates, match)
+    return select(AuditLog).filter(condition).order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(101)
+
+
+P = SpecPredicate
+SPEC_GIN = "ix_asset_specifications_gin"
+DETAILS_GIN = "ix_audit_logs_details_gin"
+
+# (label, statement, indexes any of which the plan must use)
+CASES = [
+    ("hot path os.name eq", asset_query(P(path="os.name", value="FreeBSD")), {"ix_assets_spec_os_name"}),
+    ("hot path hardware.ram in", asset_query(P(path="hardware.ram", op="in", value=["128GB", "256GB"])),
+     {"ix_assets_spec_hardware_ram"}),
+    ("containment cpu eq", asset_query(P(path="cpu", value="POWER10")), {SPEC_GIN}),
+    ("nested containment hardware.gpu eq", asset_query(P(path="hardware.gpu", value="H100")), {SPEC_GIN}),
+    ("top-level exists tpm", asset_query(P(path="tpm", op="exists")), {SPEC_GIN}),
+    ("nested exists hardware.fpga", asset_query(P(path="hardware.fpga", op="exists")), {SPEC_GIN}),
+    ("jsonpath disk.size_gb gte", asset_query(P(path="disk.size_gb", op="gte", value=8000)), {SPEC_GIN}),
+    ("hot path and containment", asset_query(P(path="os.name", value="FreeBSD"), P(path="cpu", value="POWER10")),
+     {"ix_assets_spec_os_name", SPEC_GIN}),
+    ("audit details eq", audit_query(P(path="source", value="agent-x")), {DETAILS_GIN}),
+    ("audit nested details eq", audit_query(P(path="changes.status", value="Retired")), {DETAILS_GIN}),
+    ("audit details exists", audit_query(P(path="ticket_id", op="exists")), {DETAILS_GIN}),
+]
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) for a statement, keeping its bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def plan_indexes(plan):
+    """Index names used anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    indexes = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        indexes |= plan_indexes(child)
+    return indexes
+
+
+async def seed(conn, rows):
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for table in TABLES:
+        await conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+    await conn.execute(text(f"CREATE TABLE {SCHEMA}.audit_logs_default PARTITION OF {SCHEMA}.audit_logs DEFAULT"))
+    for table in TABLES:
+        await conn.execute(text(SEED_SQL[table.name]), {"rows": rows})
+        # /search indexes are irrelevant here and need pg_trgm
+        for index in table.indexes:
+            if "_search_" not in index.name:
+                await conn.execute(CreateIndex(index))
+    await conn.commit()
+    autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+    for table in TABLES:
+        await autocommit.execute(text(f"VACUUM ANALYZE {SCHEMA}.{table.name}"))
+    await autocommit.execute(text(f"VACUUM ANALYZE {SCHEMA}.audit_logs_default"))
+    await autocommit.commit()
+    await conn.execution_options(isolation_level="READ COMMITTED")
+
+
+async def partition_index_parents(conn):
+    """Partition index name -> the partitioned (model) index it belongs to"""
+    result = await conn.execute(text("""
+        SELECT child.relname, parent.relname
+        FROM pg_inherits i
+        JOIN pg_class child ON child.oid = i.inhrelid
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+        WHERE child.relkind = 'i' AND ns.nspname = :schema
+    """), {"schema": SCHEMA})
+    return dict(result.all())
+
+
+async def run_checks(rows=200_000, keep=False):
+    print(f"=== SPECIFICATION INDEX USAGE ({rows} rows per table) ===")
+    failures = 0
+    async with async_engine.connect() as raw_conn:
+        conn = await raw_conn.execution_options(schema_translate_map=TRANSLATE)
+        try:
+            await seed(conn, rows)
+            parents = await partition_index_parents(conn)
+            for label, statement, expected in CASES:
+                explain = (await conn.execute(Explain(statement))).scalar()
+                explain = json.loads(explain) if isinstance(explain, str) else explain
+                used = {parents.get(name, name) for name in plan_indexes(explain[0]["Plan"])}
+                if used & expected:
+                    print(f"PASS  {label}: {', '.join(sorted(used & expected))}")
+                else:
+                    failures += 1
+                    print(f"FAIL  {label}: expected {' or '.join(sorted(expected))}, plan used {sorted(used) or 'no index'}")
+        finally:
+            await raw_conn.rollback()
+            if not keep:
+                await raw_conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                await raw_conn.commit()
+    await async_engine.dispose()
+    print(f"{len(CASES) - failures}/{len(CASES)} passed")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    keep = "--keep" in sys.argv
+    args = [int(arg) for arg in sys.argv[1:] if arg != "--keep"]
+    sys.exit(0 if asyncio.run(run_checks(*args[:1], keep=keep)) else 1)
@@ -1,5 +1,8 @@
 import { API_URL, API_BASE_URL } from './apiConfig';
 
+// Largest page GET /assets serves (asset_service.MAX_PAGE_SIZE)
+const ASSET_PAGE_SIZE = 1000;
+
 class ApiClient {
     constructor() {
         this.baseURL = API_URL;
@@ -27,6 +30,12 @@ class ApiClient {
     }
 
     async request(endpoint, options = {}) {
+        const { data } = await this.requestWithResponse(endpoint, options);
+        return data;
+    }
+
+    // Like request(), but also returns the fetch Response (for headers such as X-Next-Cursor)
+    async requestWithResponse(endpoint, options = {}) {
         const url = `${this.baseURL}${endpoint}`;
         const headers = {
             'Content-Type': 'application/json',
@@ -68,7 +77,7 @@ class ApiClient {
                 throw new Error(data.detail || data.message || `API request failed: ${response.status}`);
             }
 
-            return data;
+            return { data, response };
         } catch (error) {
             console.error('API Error:', error);
             throw error;
@@ -120,9 +129,26 @@ class ApiClient {
     }
 
     // Assets
-    async getAssets(params = {}) {
+    // One keyset page: { items, nextCursor } (nextCursor is null on the last page)
+    async getAssetsPage(params = {}) {
         const queryString = new URLSearchParams(params).toString();
-        return this.request(`/assets/?${queryString}`);
+        const { data, response } = await this.requestWithResponse(`/assets?${queryString}`);
+        return { items: data, nextCursor: response.headers.get('X-Next-Cursor') };
+    }
+
+    // GET /assets is paginated; without an explicit limit, follow X-Next-Cursor and return every asset
+    async getAssets(params = {}) {
+        if (params.limit) {
+            return (await this.getAssetsPage(params)).items;
+        }
+        const assets = [];
+        let cursor = null;
+        do {
+            const page = await this.getAssetsPage({ ...params, limit: ASSET_PAGE_SIZE, ...(cursor ? { cursor } : {}) });
+            assets.push(...page.items);
+            cursor = page.nextCursor;
+        } while (cursor);
+        return assets;
     }
 
     async getAsset(id) {